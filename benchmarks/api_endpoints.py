@@ -0,0 +1,508 @@
+"""
+Latency, throughput and query counts of every API endpoint.
+
+Fills a temporary database with generate_dataset() (N business users, M
+offers with three details each, orders and reviews), then runs a scripted
+workload of R requests against each URL of coderr_core/urls.py, one
+client after the other through the WSGIHandler (the numbers exclude the
+HTTP server). Reads vary their page, filters and target objects; writes
+get fresh objects created before the timing starts. Every URL name must
+have at least one workload, so new endpoints cannot be forgotten.
+
+Prints one JSON line describing the run (commit, dataset) and one per
+workload with p50/p95/p99 latency, requests per second and SQL queries
+per request. Save the output of one commit and pass it to --compare on
+another to get the changes per workload:
+
+    python benchmarks/api_endpoints.py --businesses 50 --offers 2000 > before.jsonl
+    python benchmarks/api_endpoints.py --businesses 50 --offers 2000 --compare before.jsonl
+
+Response caching stays on as in production; --no-cache measures the
+uncached path. Registration and login are dominated by password hashing.
+The script exits with 1 if any request got an unexpected status.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from common import BENCH_PASSWORD, ROOT, generate_dataset, setup_django, wsgi_request
+
+WORKLOADS = []
+
+
+def workload(name, url_name, method, expected):
+    """
+    Register ``build(fixture, count)``, which returns the requests of the
+    workload as (path, token, body) tuples.
+    """
+    def register(build):
+        WORKLOADS.append({'workload': name, 'url_name': url_name, 'method': method,
+                          'expected': expected, 'build': build})
+        return build
+    return register
+
+
+class Fixture:
+    """
+    Users, tokens and object IDs of the generated dataset.
+    """
+    def __init__(self):
+        from django.contrib.auth.models import User
+        from offers_app.models import Offer, OfferDetail
+        from orders_app.models import Order
+        from reviews_app.models import Review
+
+        self.business = User.objects.get(username='bench-business-0')
+        self.customer = (User.objects.filter(profile__type='customer', customer_orders__isnull=False)
+                         .order_by('pk').first())
+        self.business_ids = list(User.objects.filter(profile__type='business').values_list('pk', flat=True))
+        self.customer_ids = list(User.objects.filter(profile__type='customer').values_list('pk', flat=True))
+        self.offer_ids = list(Offer.objects.values_list('pk', flat=True))
+        self.detail_ids = list(OfferDetail.objects.values_list('pk', flat=True))
+        self.order_ids = list(Order.objects.filter(customer_user=self.customer).values_list('pk', flat=True))
+        self.business_order_ids = list(Order.objects.filter(business_user=self.business)
+                                       .values_list('pk', flat=True))
+        self.review_ids = list(Review.objects.values_list('pk', flat=True))
+        self.created = 0
+
+    def token(self, user):
+        from rest_framework.authtoken.models import Token
+        return Token.objects.get_or_create(user=user)[0].key
+
+    def new_users(self, count, type='customer'):
+        """
+        Create ``count`` users with a profile and return them.
+        """
+        from django.contrib.auth.models import User
+        from profiles_app.models import Profile
+
+        users = []
+        for _ in range(count):
+            self.created += 1
+            user = User.objects.create(username=f'bench-new-{self.created}')
+            Profile.objects.create(user=user, type=type, username=user.username)
+            users.append(user)
+        return users
+
+    def new_offers(self, count):
+        from offers_app.models import Offer
+        offers = []
+        for i in range(count):
+            offer = Offer.objects.create(user=self.business, title=f'Disposable offer {i}')
+            offer.details.create(title='Basic', revisions=1, delivery_time_in_days=3, price=50,
+                                 features=['Logo'], offer_type='basic')
+            offers.append(offer)
+        return offers
+
+
+def offer_payload(i, details=('basic', 'standard', 'premium')):
+    return {
+        'title': f'Load test offer {i}',
+        'description': 'Logo design',
+        'details': [{'title': offer_type.title(), 'revisions': k + 1, 'delivery_time_in_days': 3 + k,
+                     'price': 100 * (k + 1), 'features': ['Logo'], 'offer_type': offer_type}
+                    for k, offer_type in enumerate(details)],
+    }
+
+
+def pick(values, i):
+    return values[(i * 7919) % len(values)]
+
+
+def pages_of(count, page_size):
+    return max(1, -(-count // page_size))
+
+
+# Authentication
+
+@workload('registration', 'registration', 'POST', 201)
+def registration(fixture, count):
+    return [('/api/registration/', None, {'username': f'bench-registered-{i}', 'email': f'r{i}@example.com',
+                                          'password': BENCH_PASSWORD, 'repeated_password': BENCH_PASSWORD,
+                                          'type': 'customer'})
+            for i in range(count)]
+
+
+@workload('login', 'login', 'POST', 200)
+def login(fixture, count):
+    return [('/api/login/', None, {'username': f'bench-customer-{i}', 'password': BENCH_PASSWORD})
+            for i in range(count)]
+
+
+@workload('login-failed', 'login', 'POST', 400)
+def login_failed(fixture, count):
+    return [('/api/login/', None, {'username': f'bench-customer-{i}', 'password': 'wrong'}) for i in range(count)]
+
+
+@workload('logout', 'logout', 'POST', 204)
+def logout(fixture, count):
+    return [('/api/logout/', fixture.token(user), None) for user in fixture.new_users(count)]
+
+
+# Profiles
+
+@workload('profile-get', 'profile-detail', 'GET', 200)
+def profile_get(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [(f'/api/profile/{pick(fixture.business_ids, i)}/', token, None) for i in range(count)]
+
+
+@workload('profile-patch', 'profile-detail', 'PATCH', 200)
+def profile_patch(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [(f'/api/profile/{fixture.customer.pk}/', token, {'location': f'City {i}'}) for i in range(count)]
+
+
+@workload('business-profiles', 'business-profiles', 'GET', 200)
+def business_profiles(fixture, count):
+    token = fixture.token(fixture.customer)
+    pages = pages_of(len(fixture.business_ids), 20)
+    return [(f'/api/profiles/business/?page={i % pages + 1}&page_size=20', token, None) for i in range(count)]
+
+
+@workload('customer-profiles', 'customer-profiles', 'GET', 200)
+def customer_profiles(fixture, count):
+    token = fixture.token(fixture.business)
+    pages = pages_of(len(fixture.customer_ids), 20)
+    return [(f'/api/profiles/customer/?page={i % pages + 1}&page_size=20', token, None) for i in range(count)]
+
+
+# Offers
+
+@workload('offers-list', 'offer-list-create', 'GET', 200)
+def offers_list(fixture, count):
+    queries = ['page={page}&page_size=6', 'search=logo', 'ordering=min_price&page={page}&page_size=6',
+               'creator_id={business}', 'min_price=100&max_delivery_time=5', 'pagination=cursor&page_size=6']
+    pages = min(pages_of(len(fixture.offer_ids), 6), 10)
+    token = fixture.token(fixture.customer)
+    return [('/api/offers/?' + queries[i % len(queries)].format(page=i // len(queries) % pages + 1,
+                                                                 business=pick(fixture.business_ids, i)),
+             token, None)
+            for i in range(count)]
+
+
+@workload('offers-create', 'offer-list-create', 'POST', 201)
+def offers_create(fixture, count):
+    token = fixture.token(fixture.business)
+    return [('/api/offers/', token, offer_payload(i)) for i in range(count)]
+
+
+@workload('offer-get', 'offer-detail', 'GET', 200)
+def offer_get(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [(f'/api/offers/{pick(fixture.offer_ids, i)}/', token, None) for i in range(count)]
+
+
+@workload('offer-patch', 'offer-detail', 'PATCH', 200)
+def offer_patch(fixture, count):
+    from offers_app.models import Offer
+    offers = Offer.objects.filter(user=fixture.business).prefetch_related('details')[:50]
+    details = {offer.pk: [{'id': detail.pk, 'offer_type': detail.offer_type, 'price': detail.price}
+                          for detail in offer.details.all()]
+               for offer in offers}
+    offer_ids = list(details)
+    token = fixture.token(fixture.business)
+    # Every other request also changes the prices of all three details.
+    requests = []
+    for i in range(count):
+        offer_id = pick(offer_ids, i)
+        body = {'title': f'Updated offer {i}', 'description': 'New description'}
+        if i % 2:
+            body['details'] = [{**detail, 'price': detail['price'] + i % 10} for detail in details[offer_id]]
+        requests.append((f'/api/offers/{offer_id}/', token, body))
+    return requests
+
+
+@workload('offer-delete', 'offer-detail', 'DELETE', 204)
+def offer_delete(fixture, count):
+    token = fixture.token(fixture.business)
+    return [(f'/api/offers/{offer.pk}/', token, None) for offer in fixture.new_offers(count)]
+
+
+@workload('offerdetail-get', 'offerdetail-detail', 'GET', 200)
+def offerdetail_get(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [(f'/api/offerdetails/{pick(fixture.detail_ids, i)}/', token, None) for i in range(count)]
+
+
+@workload('offers-export', 'offer-bulk', 'GET', 200)
+def offers_export(fixture, count):
+    token = fixture.token(fixture.business)
+    return [(f'/api/offers/bulk/?creator_id={pick(fixture.business_ids, i)}', token, None) for i in range(count)]
+
+
+@workload('offers-import', 'offer-bulk', 'POST', 200)
+def offers_import(fixture, count):
+    token = fixture.token(fixture.business)
+    return [('/api/offers/bulk/', token, [offer_payload(i * 10 + k) for k in range(10)]) for i in range(count)]
+
+
+# Orders
+
+@workload('orders-list', 'order-list', 'GET', 200)
+def orders_list(fixture, count):
+    customer, business = fixture.token(fixture.customer), fixture.token(fixture.business)
+    return [('/api/orders/?page=1&page_size=20', customer if i % 2 else business, None) for i in range(count)]
+
+
+@workload('orders-create', 'order-list', 'POST', 201)
+def orders_create(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [('/api/orders/', token, {'offer_detail_id': pick(fixture.detail_ids, i)}) for i in range(count)]
+
+
+@workload('order-get', 'order-detail', 'GET', 200)
+def order_get(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [(f'/api/orders/{pick(fixture.order_ids, i)}/', token, None) for i in range(count)]
+
+
+@workload('order-patch', 'order-detail', 'PATCH', 200)
+def order_patch(fixture, count):
+    token = fixture.token(fixture.business)
+    statuses = ('in_progress', 'completed', 'cancelled')
+    return [(f'/api/orders/{pick(fixture.business_order_ids, i)}/', token, {'status': statuses[i % 3]})
+            for i in range(count)]
+
+
+@workload('order-delete', 'order-detail', 'DELETE', 204)
+def order_delete(fixture, count):
+    from offers_app.models import OfferDetail
+    from orders_app.models import Order
+    detail = OfferDetail.objects.filter(offer__user=fixture.business).first()
+    orders = [Order.objects.create(customer_user=fixture.customer, business_user=fixture.business,
+                                   offer_detail=detail) for _ in range(count)]
+    token = fixture.token(fixture.business)  # staff
+    return [(f'/api/orders/{order.pk}/', token, None) for order in orders]
+
+
+@workload('order-count', 'order-count', 'GET', 200)
+def order_count(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [(f'/api/order-count/{pick(fixture.business_ids, i)}/', token, None) for i in range(count)]
+
+
+@workload('completed-order-count', 'completed-order-count', 'GET', 200)
+def completed_order_count(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [(f'/api/completed-order-count/{pick(fixture.business_ids, i)}/', token, None) for i in range(count)]
+
+
+@workload('order-counts', 'order-counts', 'GET', 200)
+def order_counts(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [('/api/order-counts/?business_user_id=' + ','.join(str(pick(fixture.business_ids, i + k))
+                                                              for k in range(10)), token, None)
+            for i in range(count)]
+
+
+# Reviews
+
+@workload('reviews-list', 'review-list', 'GET', 200)
+def reviews_list(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [(f'/api/reviews/?business_user_id={pick(fixture.business_ids, i)}&ordering=rating', token, None)
+            if i % 2 else ('/api/reviews/?page=1&page_size=20', token, None)
+            for i in range(count)]
+
+
+@workload('reviews-create', 'review-list', 'POST', 201)
+def reviews_create(fixture, count):
+    return [('/api/reviews/', fixture.token(user),
+             {'business_user': pick(fixture.business_ids, i), 'rating': i % 5 + 1, 'description': 'Great'})
+            for i, user in enumerate(fixture.new_users(count))]
+
+
+@workload('review-get', 'review-detail', 'GET', 200)
+def review_get(fixture, count):
+    token = fixture.token(fixture.customer)
+    return [(f'/api/reviews/{pick(fixture.review_ids, i)}/', token, None) for i in range(count)]
+
+
+@workload('review-patch', 'review-detail', 'PATCH', 200)
+def review_patch(fixture, count):
+    from reviews_app.models import Review
+    review = Review.objects.select_related('reviewer').first()
+    token = fixture.token(review.reviewer)
+    return [(f'/api/reviews/{review.pk}/', token, {'rating': i % 5 + 1, 'description': f'Edit {i}'})
+            for i in range(count)]
+
+
+@workload('review-delete', 'review-detail', 'DELETE', 204)
+def review_delete(fixture, count):
+    from reviews_app.models import Review
+    requests = []
+    for i, user in enumerate(fixture.new_users(count)):
+        review = Review.objects.create(business_user_id=pick(fixture.business_ids, i), reviewer=user,
+                                       rating=4, description='Soon deleted')
+        requests.append((f'/api/reviews/{review.pk}/', fixture.token(user), None))
+    return requests
+
+
+# Platform and operations
+
+@workload('base-info', 'base-info', 'GET', 200)
+def base_info(fixture, count):
+    return [('/api/base-info/', None, None)] * count
+
+
+@workload('cache-stats', 'cache-stats', 'GET', 200)
+def cache_stats(fixture, count):
+    return [('/api/cache-stats/', fixture.token(fixture.business), None)] * count
+
+
+@workload('profiling-stats', 'profiling-stats', 'GET', 200)
+def profiling_stats(fixture, count):
+    return [('/api/profiling-stats/', fixture.token(fixture.business), None)] * count
+
+
+@workload('metrics', 'metrics', 'GET', 200)
+def metrics(fixture, count):
+    return [('/api/metrics/', fixture.token(fixture.business), None)] * count
+
+
+def check_coverage():
+    """
+    Fail if a named URL of coderr_core/urls.py has no workload.
+    """
+    from coderr_core.urls import urlpatterns
+    names = {pattern.name for pattern in urlpatterns if getattr(pattern, 'name', None)}
+    missing = names - {spec['url_name'] for spec in WORKLOADS}
+    if missing:
+        raise SystemExit(f"No workload for the URL names: {', '.join(sorted(missing))}")
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def run(handler, spec, requests):
+    from django.db import connections
+
+    latencies, queries, statuses = [], [], Counter()
+    started = time.perf_counter()
+    for path, token, body in requests:
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            request_started = time.perf_counter()
+            status, _ = wsgi_request(handler, spec['method'], path, token, body)
+            latencies.append(time.perf_counter() - request_started)
+        queries.append(counter.count)
+        statuses[status] += 1
+    seconds = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'workload': spec['workload'],
+        'url_name': spec['url_name'],
+        'method': spec['method'],
+        'requests': len(requests),
+        'errors': len(requests) - statuses[spec['expected']],
+        'statuses': {str(code): n for code, n in sorted(statuses.items())},
+        'requests_per_s': round(len(requests) / seconds, 1),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2),
+        'queries_per_request': round(statistics.mean(queries), 2),
+        'queries_max': max(queries),
+    }
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('-dirty' if dirty else '')
+
+
+def compare(baseline_path, results):
+    """
+    Yield the change of every workload against a previous run's output.
+    """
+    with open(baseline_path) as file:
+        lines = [json.loads(line) for line in file if line.strip()]
+    baseline = {line['workload']: line for line in lines if 'workload' in line}
+    for result in results:
+        before = baseline.get(result['workload'])
+        if before is None:
+            continue
+        change = {'compare': result['workload']}
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'requests_per_s', 'queries_per_request'):
+            change[metric] = [before[metric], result[metric]]
+        if before['p50_ms']:
+            change['p50_change_pct'] = round((result['p50_ms'] / before['p50_ms'] - 1) * 100, 1)
+        yield change
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--businesses', type=int, default=20, help='business users')
+    parser.add_argument('--offers', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=200, help='requests per workload')
+    parser.add_argument('--only', action='append', help='run only workloads whose name contains this')
+    parser.add_argument('--no-cache', action='store_true', help='disable the response cache')
+    parser.add_argument('--compare', metavar='FILE', help='output of a previous run to compare with')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    import django
+
+    check_coverage()
+    # Caches are created lazily, so this still takes effect.
+    if args.no_cache:
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    settings.METRICS = {**settings.METRICS, 'DIR': db_path + '-metrics'}
+    dataset = generate_dataset(args.businesses, args.offers, seed=args.seed)
+    fixture = Fixture()
+    handler = WSGIHandler()
+
+    specs = [spec for spec in WORKLOADS
+             if not args.only or any(part in spec['workload'] for part in args.only)]
+    print(json.dumps({
+        'benchmark': 'api_endpoints',
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'cache': not args.no_cache,
+        'requests_per_workload': args.requests,
+        'dataset': dataset,
+    }), flush=True)
+    results = []
+    for spec in specs:
+        result = run(handler, spec, spec['build'](fixture, args.requests))
+        results.append(result)
+        print(json.dumps(result), flush=True)
+    if args.compare:
+        for change in compare(args.compare, results):
+            print(json.dumps(change))
+    if any(result['errors'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Throughput of the sync (WSGI) and async (ASGI) read endpoints on the same cores.
+
+Fills a temporary database, then runs the same request mix in each mode
+with P worker processes pinned to the same CPU set, like gunicorn workers:
+
+    wsgi   WSGIHandler, C threads per process (gthread workers, sync views)
+    asgi   ASGIHandler, C concurrent tasks per process (uvicorn workers,
+           ASYNC_VIEWS=true)
+
+The mix covers the endpoints that have async views: base info, offer
+details, order counts and the business profile list. Response caching is
+disabled (dummy cache) so every request reaches the database. Requests
+are fed to the handlers directly, so the numbers exclude the HTTP server
+itself. Prints one JSON line per mode.
+
+    python benchmarks/asgi_vs_wsgi.py --processes 2 --concurrency 16 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import asgi_request, create_offers, create_reviews, setup_django, wsgi_request
+
+PATHS = ['/api/base-info/', '/api/offerdetails/{detail}/', '/api/order-count/{business}/',
+         '/api/completed-order-count/{business}/', '/api/order-counts/?business_user_id={business}',
+         '/api/profiles/business/?page_size=20', '/api/profiles/customer/?page_size=20&page={page}']
+
+
+def prepare_worker(db_path, mode):
+    os.environ['ASYNC_VIEWS'] = 'true' if mode == 'asgi' else 'false'
+    setup_django(db_path, migrate=False)
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from offers_app.models import OfferDetail
+    from rest_framework.authtoken.models import Token
+
+    # Caches are created lazily, so this still takes effect.
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    customer = User.objects.get(username='bench-customer-0')
+    business = User.objects.get(username='bench-business')
+    token, _ = Token.objects.get_or_create(user=customer)
+    details = list(OfferDetail.objects.values_list('id', flat=True)[:50])
+    paths = [path.format(detail=details[i % len(details)], business=business.pk, page=i % 10 + 1)
+             for i, path in enumerate(PATHS * 7)]
+    return token.key, paths
+
+
+def run_wsgi(token, paths, requests, concurrency):
+    from django.core.handlers.wsgi import WSGIHandler
+    handler = WSGIHandler()
+
+    def one(i):
+        started = time.perf_counter()
+        status, _ = wsgi_request(handler, 'GET', paths[i % len(paths)], token)
+        assert status == 200, status
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        return list(pool.map(one, range(requests)))
+
+
+def run_asgi(token, paths, requests, concurrency):
+    from django.core.handlers.asgi import ASGIHandler
+    handler = ASGIHandler()
+    counter = iter(range(requests))
+    latencies = []
+
+    async def client():
+        for i in counter:
+            started = time.perf_counter()
+            status, _ = await asgi_request(handler, 'GET', paths[i % len(paths)], token)
+            assert status == 200, status
+            latencies.append(time.perf_counter() - started)
+
+    async def main():
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+
+    asyncio.run(main())
+    return latencies
+
+
+def work(db_path, mode, requests, concurrency):
+    token, paths = prepare_worker(db_path, mode)
+    run = run_wsgi if mode == 'wsgi' else run_asgi
+    run(token, paths, min(requests, 100), concurrency)  # warm-up
+    started = time.perf_counter()
+    latencies = run(token, paths, requests, concurrency)
+    return {'seconds': time.perf_counter() - started, 'latencies': latencies}
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--processes', type=int, default=min(os.cpu_count() or 1, 4))
+    parser.add_argument('--concurrency', type=int, default=16, help='threads or tasks per process')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per process')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--work', choices=('wsgi', 'asgi'), help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.work:
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, range(min(args.processes, os.cpu_count() or 1)))
+        print(json.dumps(work(args.db, args.work, args.requests, args.concurrency)))
+        return
+
+    db_path = setup_django()
+    create_reviews(args.rows)
+    create_offers(args.rows)
+    from django.db import connection
+    connection.close()
+
+    for mode in ('wsgi', 'asgi'):
+        command = [sys.executable, __file__, '--work', mode, '--db', db_path, '--processes', str(args.processes),
+                   '--requests', str(args.requests), '--concurrency', str(args.concurrency)]
+        workers = [subprocess.Popen(command, stdout=subprocess.PIPE, text=True) for _ in range(args.processes)]
+        results = []
+        for process in workers:
+            output, _ = process.communicate()
+            if process.returncode:
+                raise SystemExit(f'{mode} worker exited with {process.returncode}')
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        latencies = sorted(latency for result in results for latency in result['latencies'])
+        seconds = max(result['seconds'] for result in results)
+        print(json.dumps({
+            'mode': mode,
+            'processes': args.processes,
+            'concurrency': args.concurrency,
+            'requests': len(latencies),
+            'requests_per_s': round(len(latencies) / seconds, 1),
+            'p50_ms': round(statistics.median(latencies) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        }))
+
+
+if __name__ == '__main__':
+    main()
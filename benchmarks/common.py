@@ -0,0 +1,290 @@
+"""
+Helpers shared by the benchmark scripts in this directory.
+
+Benchmarks run against a throwaway SQLite database so they never touch
+db.sqlite3. Run them from the repository root, e.g.::
+
+    python benchmarks/streaming_renderer.py --rows 20000
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django(db_path=None, migrate=True):
+    """
+    Configure Django with the project settings, pointed at ``db_path``
+    (a new temporary file by default), and run the migrations unless
+    ``migrate`` is False (e.g. in worker processes).
+
+    Returns:
+        str: Path of the SQLite database in use.
+    """
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr_core.settings')
+
+    from django.conf import settings
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='coderr-bench-'), 'bench.sqlite3')
+    settings.DATABASES['default']['NAME'] = db_path
+    settings.ALLOWED_HOSTS = ['*']
+    settings.DEBUG = False
+
+    import django
+    django.setup()
+
+    if migrate:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+    return db_path
+
+
+def create_reviews(count, batch_size=2000):
+    """
+    Create one business user and ``count`` customers with one review each,
+    using bulk inserts (no password hashing).
+
+    Returns:
+        User: A customer that can be used to authenticate requests.
+    """
+    from django.contrib.auth.models import User
+    from profiles_app.models import Profile
+    from reviews_app.models import Review
+    from stats_app.models import PlatformStats
+
+    business = User.objects.create(username='bench-business')
+    Profile.objects.create(user=business, type='business', username=business.username)
+    customers = User.objects.bulk_create(
+        [User(username=f'bench-customer-{i}') for i in range(count)], batch_size=batch_size
+    )
+    Profile.objects.bulk_create(
+        [Profile(user=u, type='customer', username=u.username) for u in customers], batch_size=batch_size
+    )
+    Review.objects.bulk_create(
+        [Review(business_user=business, reviewer=u, rating=i % 5 + 1,
+                description=f'Benchmark review number {i} – works as expected.')
+         for i, u in enumerate(customers)],
+        batch_size=batch_size,
+    )
+    PlatformStats.reconcile()
+    return customers[0]
+
+
+def create_offers(count, batch_size=2000):
+    """
+    Create ``count`` offers with three details each for the benchmark
+    business user, plus one order per offer placed by the first customer.
+    Needs create_reviews() to have run first.
+    """
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from offers_app.models import Offer, OfferDetail
+    from orders_app.models import Order
+    from stats_app.models import PlatformStats
+
+    business = User.objects.get(username='bench-business')
+    customer = User.objects.get(username='bench-customer-0')
+    offers = Offer.objects.bulk_create(
+        [Offer(user=business, title=f'Benchmark offer {i}', description='Logo design – fast delivery',
+               min_price=50 + i % 100, min_delivery_time=3) for i in range(count)],
+        batch_size=batch_size,
+    )
+    details = OfferDetail.objects.bulk_create(
+        [OfferDetail(offer=offer, title=offer_type.title(), revisions=2, delivery_time_in_days=3 + k,
+                     price=50 + i % 100 + 25.5 * k, features=['Logo', 'Visitenkarte'], offer_type=offer_type)
+         for i, offer in enumerate(offers)
+         for k, offer_type in enumerate(('basic', 'standard', 'premium'))],
+        batch_size=batch_size,
+    )
+    Order.objects.bulk_create(
+        [Order(customer_user=customer, business_user=business, offer_detail=detail)
+         for detail in details[::3]],
+        batch_size=batch_size,
+    )
+    PlatformStats.reconcile()
+    call_command('reconcile_order_counts', verbosity=0, stdout=StringIO())
+
+
+BENCH_PASSWORD = 'bench-pass'
+
+
+def generate_dataset(businesses, offers, customers_per_business=5, orders_per_offer=2.0,
+                     review_share=0.4, seed=0, batch_size=2000):
+    """
+    Fill the database with a marketplace of realistic proportions, using
+    bulk inserts and a seeded random generator (same data for the same
+    arguments):
+
+        businesses * customers_per_business customers
+        ``offers`` offers, spread over the businesses, with a basic,
+            standard and premium detail each
+        about orders_per_offer orders per offer, by random customers for
+            random details: 70 % completed, 20 % in progress, 10 % cancelled
+        a review of ``review_share`` of the (customer, business) pairs
+            with a completed order
+
+    All users get the password BENCH_PASSWORD (hashed once). The first
+    business user is staff, so it can read the stats endpoints.
+
+    Returns:
+        dict: Number of rows created per model.
+    """
+    import random
+
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from offers_app.models import Offer, OfferDetail
+    from orders_app.models import Order
+    from profiles_app.models import Profile
+    from reviews_app.models import Review
+    from stats_app.models import PlatformStats
+
+    rng = random.Random(seed)
+    password = make_password(BENCH_PASSWORD)
+    business_users = User.objects.bulk_create(
+        [User(username=f'bench-business-{i}', email=f'business{i}@example.com', password=password,
+              first_name=f'Business {i}', is_staff=i == 0)
+         for i in range(businesses)],
+        batch_size=batch_size,
+    )
+    customer_users = User.objects.bulk_create(
+        [User(username=f'bench-customer-{i}', email=f'customer{i}@example.com', password=password)
+         for i in range(businesses * customers_per_business)],
+        batch_size=batch_size,
+    )
+    Profile.objects.bulk_create(
+        [Profile(user=u, type='business', username=u.username, email=u.email, first_name=u.first_name,
+                 location=rng.choice(('Berlin', 'Köln', 'München', 'Hamburg')), tel='0123456789',
+                 description='Design studio', working_hours='9-17')
+         for u in business_users]
+        + [Profile(user=u, type='customer', username=u.username, email=u.email) for u in customer_users],
+        batch_size=batch_size,
+    )
+
+    offer_rows = Offer.objects.bulk_create(
+        [Offer(user=business_users[i % businesses], title=f'Benchmark offer {i}',
+               description=rng.choice(('Logo design', 'Website redesign', 'Flyer and business cards')))
+         for i in range(offers)],
+        batch_size=batch_size,
+    )
+    details = OfferDetail.objects.bulk_create(
+        [OfferDetail(offer=offer, title=offer_type.title(), revisions=k + 1,
+                     delivery_time_in_days=rng.randint(2, 7) + 2 * k, price=rng.randint(50, 150) * (k + 1),
+                     features=['Logo', 'Visitenkarte'][:k + 1], offer_type=offer_type)
+         for offer in offer_rows
+         for k, offer_type in enumerate(('basic', 'standard', 'premium'))],
+        batch_size=batch_size,
+    )
+    Offer.objects.refresh_price_aggregates()
+
+    business_of = {offer.pk: offer.user_id for offer in offer_rows}
+    orders = [
+        Order(customer_user=rng.choice(customer_users), business_user_id=business_of[detail.offer_id],
+              offer_detail=detail,
+              status=rng.choices(('completed', 'in_progress', 'cancelled'), (70, 20, 10))[0])
+        for detail in rng.choices(details, k=round(offers * orders_per_offer))
+    ]
+    Order.objects.bulk_create(orders, batch_size=batch_size)
+
+    pairs = sorted({(order.customer_user.pk, order.business_user_id)
+                    for order in orders if order.status == 'completed'})
+    reviewed = rng.sample(pairs, round(len(pairs) * review_share))
+    Review.objects.bulk_create(
+        [Review(reviewer_id=customer, business_user_id=business, rating=rng.choices((1, 2, 3, 4, 5), (1, 1, 2, 5, 8))[0],
+                description='Benchmark review – works as expected.')
+         for customer, business in reviewed],
+        batch_size=batch_size,
+    )
+    PlatformStats.reconcile()
+    call_command('reconcile_order_counts', verbosity=0, stdout=StringIO())
+    return {
+        'business_users': len(business_users),
+        'customer_users': len(customer_users),
+        'offers': len(offer_rows),
+        'offer_details': len(details),
+        'orders': len(orders),
+        'reviews': len(reviewed),
+    }
+
+
+def wsgi_request(handler, method, path, token=None, data=None):
+    """
+    Send one request through a WSGIHandler like a WSGI server would, so
+    request_started/request_finished (and connection handling) behave as
+    in production.
+
+    Returns:
+        tuple: (status code, response body bytes)
+    """
+    import json as _json
+    from django.test import RequestFactory
+
+    extra = {'HTTP_AUTHORIZATION': f'Token {token}'} if token else {}
+    path, _, query = path.partition('?')
+    body = _json.dumps(data) if data is not None else ''
+    request = RequestFactory().generic(method, path, body, content_type='application/json',
+                                       QUERY_STRING=query, **extra)
+    result = {}
+
+    def start_response(status, headers):
+        result['status'] = int(status.split()[0])
+
+    response = handler(request.environ, start_response)
+    try:
+        content = b''.join(response)
+    finally:
+        response.close()
+    return result['status'], content
+
+
+async def asgi_request(handler, method, path, token=None):
+    """
+    Send one body-less request through an ASGIHandler like an ASGI server
+    would.
+
+    Returns:
+        tuple: (status code, response body bytes)
+    """
+    path, _, query = path.partition('?')
+    headers = [(b'host', b'testserver')]
+    if token:
+        headers.append((b'authorization', f'Token {token}'.encode('ascii')))
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'scheme': 'http',
+        'method': method, 'path': path, 'raw_path': path.encode('utf-8'),
+        'query_string': query.encode('utf-8'), 'headers': headers,
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    result = {'body': []}
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # The client never disconnects; Django cancels this wait when done.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            result['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            result['body'].append(message.get('body', b''))
+
+    await handler(scope, receive, send)
+    return result['status'], b''.join(result['body'])
+
+
+def peak_rss_kb():
+    """
+    Peak resident set size of this process in KiB (Linux/macOS).
+    """
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
@@ -0,0 +1,97 @@
+"""
+Requests per second with and without persistent database connections.
+
+Fills a temporary database, then replays the same read requests in a
+fresh subprocess per configuration, so the settings are read from the
+environment exactly as in production:
+
+    per-request   DB_CONN_MAX_AGE=0: connect (and run the pragmas) per request
+    persistent    DB_CONN_MAX_AGE=60 with health checks
+
+Requests go through Django's WSGIHandler directly (the test client keeps
+connections open on purpose), so connections are closed or reused exactly
+as under gunicorn. The endpoints are uncached reads.
+
+    python benchmarks/db_connections.py --requests 2000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from common import create_offers, create_reviews, setup_django, wsgi_request
+
+CONFIGURATIONS = {
+    'per-request': {'DB_CONN_MAX_AGE': '0', 'DB_CONN_HEALTH_CHECKS': 'false'},
+    'persistent': {'DB_CONN_MAX_AGE': '60', 'DB_CONN_HEALTH_CHECKS': 'true'},
+}
+
+PATHS = ['/api/reviews/?page_size=20', '/api/orders/?page_size=20',
+         '/api/order-count/{business}/', '/api/profile/{customer}/']
+
+
+def measure(db_path, requests):
+    setup_django(db_path)
+    from django.contrib.auth.models import User
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from rest_framework.authtoken.models import Token
+
+    customer = User.objects.get(username='bench-customer-0')
+    business = User.objects.get(username='bench-business')
+    token, _ = Token.objects.get_or_create(user=customer)
+    paths = [path.format(customer=customer.pk, business=business.pk) for path in PATHS]
+    connection.close()
+
+    connects = 0
+
+    def count_connect(sender, **kwargs):
+        nonlocal connects
+        connects += 1
+
+    connection_created.connect(count_connect)
+    handler = WSGIHandler()
+
+    started = time.perf_counter()
+    for i in range(requests):
+        status, _ = wsgi_request(handler, 'GET', paths[i % len(paths)], token.key)
+        assert status == 200, status
+    elapsed = time.perf_counter() - started
+    return {'requests': requests, 'seconds': round(elapsed, 3),
+            'requests_per_s': round(requests / elapsed, 1), 'connects': connects}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--measure', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.db, args.requests)))
+        return
+
+    db_path = setup_django()
+    create_reviews(args.rows)
+    create_offers(args.rows)
+    results = {}
+    for name, env in CONFIGURATIONS.items():
+        output = subprocess.run(
+            [sys.executable, __file__, '--measure', '--db', db_path, '--requests', str(args.requests)],
+            check=True, capture_output=True, text=True, env={**os.environ, **env},
+        ).stdout
+        results[name] = json.loads(output.strip().splitlines()[-1])
+        print(json.dumps({'configuration': name, **env, **results[name]}))
+
+    print(json.dumps({
+        'speedup': round(results['persistent']['requests_per_s'] / results['per-request']['requests_per_s'], 2),
+    }))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""
+Concurrency stress test for SQLite under several worker processes.
+
+Fills a temporary database, then starts P processes (like gunicorn
+workers) that each send a mix of requests through Django's WSGIHandler:
+
+    order    POST /api/orders/            (customer places an order)
+    review   POST /api/reviews/ once per business, PATCH /api/reviews/<id>/ after
+    read     GET /api/offers/?page=N
+
+Every request must succeed: a 5xx or an exception ("database is locked")
+counts as an error. Afterwards the materialized counters are checked
+against the rows actually written. Prints one JSON line per process and a
+summary; exits with status 1 if anything failed.
+
+    python benchmarks/sqlite_write_contention.py --processes 4 --iterations 200
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from common import create_offers, create_reviews, setup_django, wsgi_request
+
+
+def prepare(processes, businesses):
+    """
+    Create one customer per process (with a token) and ``businesses``
+    business users to be reviewed.
+    """
+    from django.contrib.auth.models import User
+    from profiles_app.models import Profile
+    from rest_framework.authtoken.models import Token
+
+    create_reviews(processes)
+    create_offers(50)
+    for i in range(businesses):
+        user = User.objects.create(username=f'bench-review-target-{i}')
+        Profile.objects.create(user=user, type='business', username=user.username)
+    for i in range(processes):
+        Token.objects.create(user=User.objects.get(username=f'bench-customer-{i}'))
+
+
+def work(db_path, worker, iterations):
+    setup_django(db_path, migrate=False)
+    from django.contrib.auth.models import User
+    from django.core.handlers.wsgi import WSGIHandler
+    from offers_app.models import OfferDetail
+
+    user = User.objects.get(username=f'bench-customer-{worker}')
+    token = user.auth_token.key
+    detail_ids = list(OfferDetail.objects.values_list('id', flat=True))
+    targets = list(User.objects.filter(username__startswith='bench-review-target-').values_list('id', flat=True))
+    handler = WSGIHandler()
+    reviews, counts, errors, latencies = {}, {}, [], []
+
+    for i in range(iterations):
+        kind = ('order', 'review', 'read', 'read')[i % 4]
+        if kind == 'order':
+            method, path, data = 'POST', '/api/orders/', {'offer_detail_id': detail_ids[i % len(detail_ids)]}
+        elif kind == 'review':
+            target = targets[(i // 4) % len(targets)]
+            if target in reviews:
+                method, path, data = 'PATCH', f'/api/reviews/{reviews[target]}/', {'rating': i % 5 + 1}
+            else:
+                method, path, data = 'POST', '/api/reviews/', {
+                    'business_user': target, 'rating': 5, 'description': f'Worker {worker} review'}
+        else:
+            method, path, data = 'GET', f'/api/offers/?page={i % 8 + 1}', None
+
+        started = time.perf_counter()
+        try:
+            status, content = wsgi_request(handler, method, path, token, data)
+        except Exception as exc:
+            errors.append(f'{method} {path}: {exc!r}')
+            continue
+        latencies.append(time.perf_counter() - started)
+        if status >= 500 or (method != 'GET' and status >= 400):
+            errors.append(f'{method} {path}: {status} {content[:200]!r}')
+            continue
+        if method == 'POST' and kind == 'review':
+            reviews[data['business_user']] = json.loads(content)['id']
+        counts[f'{method} {kind}'] = counts.get(f'{method} {kind}', 0) + 1
+
+    latencies.sort()
+    return {
+        'worker': worker,
+        'requests': counts,
+        'errors': errors,
+        'max_latency_ms': round(latencies[-1] * 1000, 1) if latencies else None,
+    }
+
+
+def check_counters():
+    """
+    Compare the materialized counters with the rows in the database.
+    """
+    from django.db.models import Count
+    from orders_app.models import Order, OrderStatusCount
+    from reviews_app.models import Review
+    from stats_app.models import PlatformStats
+
+    problems = []
+    actual = {(row['business_user_id'], row['status']): row['n']
+              for row in Order.objects.values('business_user_id', 'status').annotate(n=Count('id'))}
+    stored = {(c.business_user_id, c.status): c.count for c in OrderStatusCount.objects.exclude(count=0)}
+    if actual != stored:
+        problems.append(f'order counters {stored} != {actual}')
+    stats = PlatformStats.load()
+    if stats.review_count != Review.objects.count():
+        problems.append(f'review_count {stats.review_count} != {Review.objects.count()}')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--work', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.work is not None:
+        print(json.dumps(work(args.db, args.work, args.iterations)))
+        return
+
+    db_path = setup_django()
+    prepare(args.processes, businesses=max(args.iterations // 8, 1))
+    from django.db import connection
+    connection.close()
+
+    started = time.perf_counter()
+    workers = [
+        subprocess.Popen(
+            [sys.executable, __file__, '--work', str(i), '--db', db_path, '--iterations', str(args.iterations)],
+            stdout=subprocess.PIPE, text=True, env=os.environ.copy(),
+        )
+        for i in range(args.processes)
+    ]
+    results = []
+    for process in workers:
+        output, _ = process.communicate()
+        if process.returncode:
+            results.append({'errors': [f'worker exited with {process.returncode}']})
+            continue
+        results.append(json.loads(output.strip().splitlines()[-1]))
+        print(json.dumps(results[-1]))
+    elapsed = time.perf_counter() - started
+
+    errors = sum(len(result['errors']) for result in results)
+    problems = check_counters()
+    print(json.dumps({
+        'processes': args.processes,
+        'requests': args.processes * args.iterations,
+        'seconds': round(elapsed, 2),
+        'errors': errors,
+        'counter_problems': problems,
+    }))
+    if errors or problems:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
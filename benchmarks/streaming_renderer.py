@@ -0,0 +1,94 @@
+"""
+Peak memory of buffered vs. streamed unpaginated list responses.
+
+Fills a temporary database with N reviews, then requests /api/reviews/
+once per mode, each in a fresh subprocess so peak RSS is comparable:
+
+    buffered   stream_list = False: full serializer.data + JSONRenderer.render
+    streaming  StreamingListMixin: iterator(chunk_size) + render_stream
+
+The response body is consumed chunk by chunk and discarded, as a WSGI
+server would. Prints one JSON line per mode and checks both bodies hash
+to the same value.
+
+    python benchmarks/streaming_renderer.py --rows 20000
+"""
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from common import create_reviews, peak_rss_kb, setup_django
+
+
+def measure(db_path, mode):
+    setup_django(db_path)
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+    from reviews_app.api.views import ReviewListCreateView
+
+    ReviewListCreateView.stream_list = mode == 'streaming'
+    client = APIClient()
+    client.force_authenticate(User.objects.get(username='bench-customer-0'))
+
+    baseline_rss = peak_rss_kb()
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get('/api/reviews/')
+    digest, size = hashlib.sha256(), 0
+    chunks = response.streaming_content if response.streaming else [response.content]
+    for chunk in chunks:
+        digest.update(chunk)
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'mode': mode,
+        'seconds': round(elapsed, 3),
+        'bytes': size,
+        'sha256': digest.hexdigest(),
+        'python_peak_kb': traced_peak // 1024,
+        'peak_rss_kb': peak_rss_kb(),
+        'peak_rss_growth_kb': peak_rss_kb() - baseline_rss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--measure', choices=['buffered', 'streaming'], help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.db, args.measure)))
+        return
+
+    db_path = setup_django()
+    create_reviews(args.rows)
+    results = []
+    for mode in ('buffered', 'streaming'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--measure', mode, '--db', db_path],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+        print(json.dumps(results[-1]))
+
+    if results[0]['sha256'] != results[1]['sha256']:
+        sys.exit('Response bodies differ between buffered and streaming mode!')
+    print(json.dumps({
+        'rows': args.rows,
+        'identical_body': True,
+        'python_peak_ratio': round(results[0]['python_peak_kb'] / max(results[1]['python_peak_kb'], 1), 1),
+        'rss_growth_saved_kb': results[0]['peak_rss_growth_kb'] - results[1]['peak_rss_growth_kb'],
+    }))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Rows per second of the model serializers vs. the values serializers.
+
+Fills a temporary database with N reviews, profiles, offers and orders,
+then serializes the rows of each hot list endpoint both ways:
+
+    model    ModelSerializer(queryset, many=True).data (the previous path)
+    values   ValuesSerializer(prepare(queryset), many=True).data
+
+Timings include the database queries. Every run checks that both outputs
+are identical and prints one JSON line per endpoint.
+
+    python benchmarks/values_serializers.py --rows 5000 --repeat 3
+"""
+import argparse
+import json
+import time
+
+from common import create_offers, create_reviews, setup_django
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def get_cases():
+    from django.contrib.auth.models import User
+    from django.db.models import Prefetch, Q
+    from offers_app.api.serializers import OfferListSerializer, OfferListValuesSerializer
+    from offers_app.models import Offer, OfferDetail
+    from orders_app.api.serializers import OrderSerializer, OrderValuesSerializer
+    from orders_app.models import Order
+    from profiles_app.api.serializers import BusinessProfileListSerializer, BusinessProfileListValuesSerializer
+    from profiles_app.models import Profile
+    from reviews_app.api.serializers import ReviewSerializer, ReviewValuesSerializer
+    from reviews_app.models import Review
+
+    # Same querysets as the list views.
+    customer = User.objects.get(username='bench-customer-0')
+    offers = (Offer.objects.select_related('user')
+              .prefetch_related(Prefetch('details', queryset=OfferDetail.objects.only('id', 'offer_id'))))
+    orders = (Order.objects.filter(Q(customer_user=customer) | Q(business_user=customer))
+              .select_related('offer_detail'))
+    return [
+        ('offers', OfferListSerializer, OfferListValuesSerializer, offers.order_by('pk')),
+        ('orders', OrderSerializer, OrderValuesSerializer, orders.order_by('pk')),
+        ('reviews', ReviewSerializer, ReviewValuesSerializer, Review.objects.order_by('pk')),
+        # The benchmark data has one business profile, so all profiles are used.
+        ('business-profiles', BusinessProfileListSerializer, BusinessProfileListValuesSerializer,
+         Profile.objects.order_by('pk')),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    create_reviews(args.rows)
+    create_offers(args.rows)
+
+    from rest_framework.test import APIRequestFactory
+    context = {'request': APIRequestFactory().get('/')}
+
+    for name, serializer_class, values_class, queryset in get_cases():
+        model_seconds, expected = best_of(
+            args.repeat, lambda: serializer_class(queryset.all(), many=True, context=context).data)
+        values_seconds, data = best_of(
+            args.repeat, lambda: values_class(values_class.prepare(queryset.all()), many=True, context=context).data)
+        if data != expected:
+            raise SystemExit(f'{name}: values serializer output differs!')
+        print(json.dumps({
+            'endpoint': name,
+            'rows': len(data),
+            'model_rows_per_s': round(len(data) / model_seconds),
+            'values_rows_per_s': round(len(data) / values_seconds),
+            'speedup': round(model_seconds / values_seconds, 2),
+        }))
+
+
+if __name__ == '__main__':
+    main()
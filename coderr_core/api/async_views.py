@@ -0,0 +1,91 @@
+"""
+Async variants of DRF views for the ASGI deployment mode.
+
+DRF's ``APIView.dispatch`` is synchronous. AsyncViewMixin replaces it with
+a coroutine: authentication, permission and throttle checks (which may
+read the token from the database) run through ``sync_to_async``, the
+handler itself is awaited and uses Django's async ORM. Handlers that are
+still synchronous (e.g. ``options``) are called as they are.
+
+The async views are subclasses of the regular ones, so querysets,
+serializers, permissions and caching stay defined in one place; they are
+routed by coderr_core.asgi_urls when ``settings.ASYNC_VIEWS`` is enabled.
+"""
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
+from rest_framework.response import Response
+
+
+class AsyncViewMixin:
+    """
+    Make an APIView subclass asynchronous; put it first in the bases.
+    """
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncRetrieveMixin(AsyncViewMixin):
+    """
+    Async ``get`` for RetrieveAPIView subclasses using CachedResponseMixin.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.acached_response(request, self.aretrieve, *args, **kwargs)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = await aget_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
+
+
+class AsyncListMixin(AsyncViewMixin):
+    """
+    Async ``get`` for list views using CachedResponseMixin, ValuesListMixin
+    and a paginator with ``apaginate_queryset()``.
+
+    Unpaginated lists are returned as one buffered response; streaming
+    (StreamingListMixin) is only available in the sync views.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.acached_response(request, self.alist, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+        page = None if paginator is None else await paginator.apaginate_queryset(queryset, request, view=self)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(await serializer.adata())
+        rows = [row async for row in queryset]
+        serializer = self.get_serializer(rows, many=True)
+        return Response(await serializer.adata())
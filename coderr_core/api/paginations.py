@@ -0,0 +1,336 @@
+"""
+Shared pagination layer for the list endpoints of all apps.
+
+Provides page-number and keyset (cursor) variants whose default and
+maximum page sizes come from ``settings.LIST_PAGINATION``, plus
+PaginationModeMixin to let clients opt into the cursor variant per request.
+Both variants also provide ``apaginate_queryset()`` for the async views
+(coderr_core.api.async_views), which reads the page with the async ORM.
+"""
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def get_list_pagination_setting(name):
+    """
+    Return a value from ``settings.LIST_PAGINATION``, falling back to
+    the defaults below for keys that are not configured.
+    """
+    defaults = {
+        'PAGE_SIZE': 20,
+        'MAX_PAGE_SIZE': 100,
+        'UNPAGINATED_COMPAT': True,
+    }
+    return getattr(settings, 'LIST_PAGINATION', {}).get(name, defaults[name])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over one ordering field plus ``id`` as tie-breaker.
+
+    Instead of OFFSET and a COUNT(*) over the whole queryset, each page is
+    fetched with a WHERE condition on the position of the last row seen,
+    so the cost stays proportional to the page size at any depth. NULL
+    values of the ordering field are always placed last.
+
+    The ordering comes from the ``ordering`` query parameter if it names one
+    of ``ordering_fields`` (optionally prefixed with ``-``), otherwise
+    ``default_ordering`` is used. Responses contain ``next``, ``previous``
+    and ``results`` but no ``count``.
+
+    Attributes:
+        cursor_query_param (str): Query parameter carrying the opaque cursor.
+        page_size_query_param (str): Query parameter for the page size.
+        page_size (int): Default number of items per page.
+        max_page_size (int): Hard upper bound for client-requested page sizes.
+        ordering_fields (tuple): Fields the list may be ordered by.
+        default_ordering (str): Ordering used when none is requested.
+        tie_breaker (str): Unique field that makes positions unambiguous.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 6
+    max_page_size = 100
+    ordering_query_param = 'ordering'
+    ordering_fields = ()
+    default_ordering = '-id'
+    tie_breaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page([row async for row in queryset[:self.page_size + 1]])
+
+    def get_page_queryset(self, queryset, request):
+        """
+        Order and filter the queryset so the requested page starts at its
+        first row.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        self.field = self.ordering.lstrip('-')
+        self.descending = self.ordering.startswith('-')
+        self.model = queryset.model
+
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor['r'])
+
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_seek_condition(self.cursor['v'], self.cursor['i'], reverse))
+        return queryset
+
+    def set_page(self, rows):
+        """
+        Store the fetched rows (up to one more than the page size) as the
+        current page and work out the neighbouring pages.
+        """
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.cursor and self.cursor['r']:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request):
+        """
+        Return the first requested ordering term that is supported,
+        falling back to ``default_ordering``.
+        """
+        params = request.query_params.get(self.ordering_query_param, '')
+        for term in (t.strip() for t in params.split(',')):
+            if term.lstrip('-') in self.ordering_fields:
+                return term
+        return self.default_ordering
+
+    def get_order_by(self, reverse):
+        """
+        Build the ORDER BY clause. Reversed pages walk the list backwards
+        and are flipped again after fetching.
+        """
+        descending = self.descending != reverse
+        tie = '-' + self.tie_breaker if descending else self.tie_breaker
+        if self.field == self.tie_breaker:
+            return [tie]
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        field = F(self.field).desc(**nulls) if descending else F(self.field).asc(**nulls)
+        return [field, tie]
+
+    def get_seek_condition(self, value, pk, reverse):
+        """
+        Return the condition selecting rows after (or, reversed, before)
+        the position ``(value, pk)`` in the list ordering.
+        """
+        tie = self.tie_breaker
+        after = 'lt' if self.descending != reverse else 'gt'
+        if self.field == tie:
+            return Q(**{f'{tie}__{after}': pk})
+        field = self.field
+        if not reverse:
+            if value is None:
+                return Q(**{f'{field}__isnull': True, f'{tie}__{after}': pk})
+            return (Q(**{f'{field}__{after}': value})
+                    | Q(**{field: value, f'{tie}__{after}': pk})
+                    | Q(**{f'{field}__isnull': True}))
+        if value is None:
+            return (Q(**{f'{field}__isnull': False})
+                    | Q(**{f'{field}__isnull': True, f'{tie}__{after}': pk}))
+        return (Q(**{f'{field}__{after}': value})
+                | Q(**{field: value, f'{tie}__{after}': pk}))
+
+    def get_position(self, item):
+        """
+        Return the (value, pk) position of a row, JSON-encodable.
+        Rows may be model instances or ``.values()`` dicts.
+        """
+        if isinstance(item, dict):
+            item = self.model(**{name: item[name] for name in {self.field, self.tie_breaker}})
+        value = getattr(item, self.field)
+        if value is not None and self.field != self.tie_breaker:
+            value = self.model._meta.get_field(self.field).value_to_string(item)
+        return value, getattr(item, self.tie_breaker)
+
+    def encode_cursor(self, item, reverse):
+        value, pk = self.get_position(item)
+        payload = json.dumps({'o': self.ordering, 'v': value, 'i': pk, 'r': int(reverse)},
+                             separators=(',', ':'))
+        encoded = b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        """
+        Decode the cursor from the request, or return None for the first page.
+
+        Raises NotFound for malformed cursors or cursors created for a
+        different ordering.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if cursor['o'] != self.ordering:
+                raise ValueError
+            value = cursor['v']
+            if value is not None and self.field != self.tie_breaker:
+                value = self.model._meta.get_field(self.field).to_python(value)
+            return {'v': value, 'i': int(cursor['i']), 'r': bool(cursor['r'])}
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class StandardPagination(PageNumberPagination):
+    """
+    Page-number pagination for the order, review and profile lists.
+
+    Clients page with ``?page=`` and ``?page_size=`` (capped at
+    ``MAX_PAGE_SIZE``). While ``UNPAGINATED_COMPAT`` is enabled, requests
+    that send neither parameter still get the plain JSON array the
+    frontend expects.
+    """
+    page_size_query_param = 'page_size'
+
+    def __init__(self):
+        self.page_size = get_list_pagination_setting('PAGE_SIZE')
+        self.max_page_size = get_list_pagination_setting('MAX_PAGE_SIZE')
+
+    def is_unpaginated(self, request):
+        params = request.query_params
+        return (get_list_pagination_setting('UNPAGINATED_COMPAT')
+                and self.page_query_param not in params
+                and self.page_size_query_param not in params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_unpaginated(request):
+            return None
+        if not queryset.ordered:
+            queryset = queryset.order_by('pk')
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Same as ``paginate_queryset()``, counting with ``acount()`` and
+        fetching the page rows asynchronously.
+        """
+        if self.is_unpaginated(request):
+            return None
+        if not queryset.ordered:
+            queryset = queryset.order_by('pk')
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page.object_list = [row async for row in self.page.object_list]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+
+class StandardCursorPagination(KeysetPagination):
+    """
+    Keyset pagination using the configured default and maximum page sizes.
+
+    Subclasses set ``ordering_fields`` and ``default_ordering``.
+    """
+
+    def __init__(self):
+        self.page_size = get_list_pagination_setting('PAGE_SIZE')
+        self.max_page_size = get_list_pagination_setting('MAX_PAGE_SIZE')
+
+
+class PaginationModeMixin:
+    """
+    View mixin choosing between page-number and cursor pagination per request.
+
+    Cursor pagination is used when the client sends ``?pagination=cursor``
+    or already carries a ``cursor`` parameter from a previous page.
+    """
+    cursor_pagination_class = None
+    pagination_mode_query_param = 'pagination'
+
+    def use_cursor_pagination(self):
+        if self.cursor_pagination_class is None:
+            return False
+        params = self.request.query_params
+        return (params.get(self.pagination_mode_query_param) == 'cursor'
+                or self.cursor_pagination_class.cursor_query_param in params)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
@@ -0,0 +1,35 @@
+"""
+Request parsers shared by the API views.
+
+ORJSONParser parses JSON bodies with orjson when it is installed and falls
+back to DRF's JSONParser otherwise, or for bodies orjson cannot handle
+(non-UTF-8 charsets, integers beyond 64 bits, invalid JSON). Invalid JSON
+therefore still produces DRF's usual ParseError message.
+"""
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser using orjson.loads for UTF-8 request bodies.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read() if stream is not None else b''
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(content), media_type, parser_context)
@@ -0,0 +1,121 @@
+"""
+Renderers shared by the API views.
+
+StreamingJSONRenderer renders exactly like DRF's JSONRenderer, and can
+additionally encode a list incrementally (render_stream) for views using
+coderr_core.api.streaming.StreamingListMixin.
+
+ORJSONRenderer produces the same bytes with orjson when it is installed
+and falls back to the stdlib path otherwise.
+"""
+import json
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class StreamingJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that can also render a list as a stream of byte chunks.
+
+    The streamed output is byte-for-byte identical to ``render()`` of the
+    same list: a compact JSON array is just the compactly encoded items
+    joined by the item separator.
+
+    Attributes:
+        chunk_size (int): Approximate number of bytes buffered per chunk.
+    """
+    chunk_size = 64 * 1024
+
+    def encode_item(self, item, separators):
+        ret = json.dumps(
+            item, cls=self.encoder_class,
+            ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict, separators=separators
+        )
+        return ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+    def render_stream(self, items, accepted_media_type=None, renderer_context=None):
+        """
+        Yield the JSON array of ``items`` (an iterable of primitive data)
+        in chunks of roughly ``chunk_size`` bytes.
+
+        Indented output (``Accept: application/json; indent=4``) is rendered
+        in one piece by ``render()``.
+        """
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            yield self.render(list(items), accepted_media_type, renderer_context)
+            return
+
+        separators = (',', ':') if self.compact else (', ', ': ')
+        item_separator = separators[0].encode()
+        buffer, size = [b'['], 1
+        for index, item in enumerate(items):
+            encoded = self.encode_item(item, separators)
+            if index:
+                buffer.append(item_separator)
+            buffer.append(encoded)
+            size += len(encoded) + 1
+            if size >= self.chunk_size:
+                yield b''.join(buffer)
+                buffer, size = [], 0
+        buffer.append(b']')
+        yield b''.join(buffer)
+
+
+def escape_line_separators(content):
+    """
+    Escape U+2028/U+2029 in encoded JSON like JSONRenderer does.
+    """
+    if b'\xe2\x80' not in content:
+        return content
+    return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONRenderer(StreamingJSONRenderer):
+    """
+    StreamingJSONRenderer encoding with orjson when it is available.
+
+    Types orjson does not serialize like DRF (datetimes, dates, times,
+    Decimals, lazy strings, ...) are passed through to DRF's JSONEncoder,
+    so the output is identical to JSONRenderer. The stdlib path is used
+    when orjson is not installed, for indented output, for non-compact or
+    ASCII-only settings, and for values orjson rejects (e.g. integers
+    beyond 64 bits).
+
+    Known difference: floats whose shortest repr uses an exponent
+    (``abs(x) >= 1e16`` or ``< 1e-4``) are written as ``1e16`` instead of
+    ``1e+16``, and NaN/Infinity become ``null`` instead of raising.
+    """
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def __init__(self):
+        self.default = self.encoder_class().default
+
+    def use_orjson(self, accepted_media_type, renderer_context):
+        return (orjson is not None and self.compact and not self.ensure_ascii
+                and self.get_indent(accepted_media_type, renderer_context or {}) is None)
+
+    def dumps(self, data):
+        return escape_line_separators(orjson.dumps(data, default=self.default, option=self.options))
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.use_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return self.dumps(data)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+    def encode_item(self, item, separators):
+        if orjson is None or separators != (',', ':') or self.ensure_ascii:
+            return super().encode_item(item, separators)
+        try:
+            return self.dumps(item)
+        except orjson.JSONEncodeError:
+            return super().encode_item(item, separators)
@@ -0,0 +1,70 @@
+"""
+Streaming list responses for large unpaginated list endpoints.
+
+StreamingListMixin replaces ListModelMixin.list() for requests that are
+not paginated: rows are read with ``queryset.iterator(chunk_size=...)``,
+serialized one chunk at a time and encoded in chunks by a renderer providing
+``render_stream()`` (see coderr_core.api.renderers). Peak memory therefore
+no longer grows with the number of rows, and the body is identical to the
+buffered response.
+
+Lists that fit into the first chunk are returned as a regular Response, so
+small results keep ``response.data`` and stay cacheable.
+
+The first chunk is read inside the view, which fixes the database alias of
+the iterator: all further chunks come from the same database (a read
+replica, if the view reads from one), even though they are fetched while
+the body is sent. Only queries started anew at that time, e.g. lazy
+related lookups of model serializers, use the primary.
+"""
+from itertools import chain, islice
+
+from django.http import StreamingHttpResponse
+from rest_framework.response import Response
+
+
+def chunked(iterator, size):
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class StreamingListMixin:
+    """
+    Opt-in mixin for list views; put it before the generic view class.
+
+    Paginated requests, results shorter than one chunk, renderers without
+    ``render_stream()`` and ``stream_list = False`` use the regular
+    buffered response.
+
+    Attributes:
+        stream_list (bool): Whether unpaginated lists are streamed.
+        stream_chunk_size (int): Rows fetched from the database per chunk.
+    """
+    stream_list = True
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        renderer = getattr(request, 'accepted_renderer', None)
+        if not self.stream_list or not hasattr(renderer, 'render_stream'):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        objects = queryset.iterator(chunk_size=self.stream_chunk_size)
+        first_chunk = list(islice(objects, self.stream_chunk_size))
+        if len(first_chunk) < self.stream_chunk_size:
+            serializer = self.get_serializer(first_chunk, many=True)
+            return Response(serializer.data)
+
+        chunks = chain([first_chunk], chunked(objects, self.stream_chunk_size))
+        rows = chain.from_iterable(self.get_serializer(chunk, many=True).data for chunk in chunks)
+        renderer_context = self.get_renderer_context()
+        content = renderer.render_stream(rows, request.accepted_media_type, renderer_context)
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        return StreamingHttpResponse(content, content_type=content_type)
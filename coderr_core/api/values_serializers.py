@@ -0,0 +1,212 @@
+"""
+Read-only fast path for list endpoints, serializing ``.values()`` rows.
+
+A ValuesSerializer reproduces the output of an existing ModelSerializer
+(its ``serializer_class``) without building model instances: the list
+queryset is narrowed to the column paths that serializer reads, and every
+row dict is converted by per-field converters compiled once per request.
+
+The converters are the bound fields of the original serializer, so
+datetimes, decimals, lists and file URLs are rendered by exactly the same
+``to_representation`` code. Only fields whose ``to_representation`` returns
+values of the database type unchanged (plain char, integer, boolean and
+choice fields, primary keys, ``ReadOnlyField``) are copied as they are.
+
+Fields that cannot be read from a single column (method fields, nested
+serializers) are provided by the subclass as ``represent_<name>(row)``;
+the columns they need are listed in ``extra_values``, and data that has to
+be fetched per page can be loaded in ``prefetch(rows)``.
+Async views read ``await serializer.adata()`` instead of ``data``.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import FileField as ModelFileField
+from rest_framework import serializers
+
+from ..profiling import timing_serialization
+
+COPIED_FIELD_TYPES = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.ReadOnlyField,
+)
+
+
+def lookup_path(model, field):
+    """
+    Return the ``values()`` lookup and the model field read by a
+    serializer field, following non-null relations only (a null relation
+    would make the original serializer skip the field instead).
+    """
+    attrs = field.source_attrs
+    for attr in attrs[:-1]:
+        try:
+            relation = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            relation = None
+        if relation is None or not relation.is_relation or relation.null:
+            raise ImproperlyConfigured(
+                f"Cannot read '{field.field_name}' from values(); add represent_{field.field_name}()."
+            )
+        model = relation.related_model
+    try:
+        model_field = model._meta.get_field(attrs[-1])
+    except FieldDoesNotExist:
+        raise ImproperlyConfigured(
+            f"Cannot read '{field.field_name}' from values(); add represent_{field.field_name}()."
+        )
+    return '__'.join(attrs), model_field
+
+
+def build_converter(field, model_field):
+    """
+    Return the function converting a non-null column value to the output
+    of ``field``, or None if the value is copied unchanged.
+    """
+    if type(field) in COPIED_FIELD_TYPES:
+        return None
+    if type(field) is serializers.PrimaryKeyRelatedField and field.pk_field is None:
+        return None
+    if isinstance(model_field, ModelFileField):
+        attr_class = model_field.attr_class
+        return lambda name: field.to_representation(attr_class(None, model_field, name))
+    return field.to_representation
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer producing the output of ``serializer_class`` from
+    ``.values()`` rows.
+
+    It is constructed like a serializer (``(rows, many=True, context=...)``)
+    and exposes ``data``, so generic list views can use it in place of the
+    model serializer (see ValuesListMixin).
+
+    Attributes:
+        serializer_class (type): The ModelSerializer whose output is reproduced.
+        extra_values (tuple): Additional lookups read by ``represent_*`` methods.
+    """
+    serializer_class = None
+    extra_values = ()
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+        self.fields = self.compile_fields()
+
+    @classmethod
+    def get_value_paths(cls):
+        """
+        Return the ``values()`` lookups needed for the output, computed once
+        per class.
+        """
+        if '_value_paths' not in cls.__dict__:
+            model = cls.serializer_class.Meta.model
+            paths = []
+            for field in cls.serializer_class()._readable_fields:
+                if not hasattr(cls, f'represent_{field.field_name}'):
+                    paths.append(lookup_path(model, field)[0])
+            paths.extend(cls.extra_values)
+            cls._value_paths = tuple(dict.fromkeys(paths))
+        return cls._value_paths
+
+    @classmethod
+    def prepare(cls, queryset, extra=()):
+        """
+        Narrow ``queryset`` to the lookups this serializer reads, plus
+        ``extra`` (e.g. the columns a keyset paginator positions on).
+        """
+        paths = dict.fromkeys(cls.get_value_paths() + tuple(extra))
+        return queryset.prefetch_related(None).values(*paths)
+
+    def compile_fields(self):
+        """
+        Bind the fields of ``serializer_class`` to this serializer's context
+        and return ``(name, lookup, converter)`` triples; ``lookup`` is None
+        for fields rendered by a ``represent_*`` method.
+        """
+        template = self.serializer_class(context=self.context)
+        model = self.serializer_class.Meta.model
+        fields = []
+        for field in template._readable_fields:
+            method = getattr(self, f'represent_{field.field_name}', None)
+            if method is not None:
+                fields.append((field.field_name, None, method))
+                continue
+            path, model_field = lookup_path(model, field)
+            fields.append((field.field_name, path, build_converter(field, model_field)))
+        return fields
+
+    def prefetch(self, rows):
+        """
+        Hook for loading related data for the rows of ``data`` before they
+        are converted.
+        """
+
+    def to_representation(self, row):
+        ret = {}
+        for name, path, convert in self.fields:
+            if path is None:
+                ret[name] = convert(row)
+                continue
+            value = row[path]
+            ret[name] = value if value is None or convert is None else convert(value)
+        return ret
+
+    @property
+    def data(self):
+        with timing_serialization():
+            rows = list(self.instance) if self.many else [self.instance]
+            self.prefetch(rows)
+            data = [self.to_representation(row) for row in rows]
+        return data if self.many else data[0]
+
+    async def adata(self):
+        """
+        ``data`` for already fetched rows in async views; ``prefetch()``
+        runs through ``sync_to_async`` if the subclass implements it.
+        """
+        with timing_serialization():
+            rows = list(self.instance) if self.many else [self.instance]
+            if type(self).prefetch is not ValuesSerializer.prefetch:
+                await sync_to_async(self.prefetch)(rows)
+            data = [self.to_representation(row) for row in rows]
+        return data if self.many else data[0]
+
+
+class ValuesListMixin:
+    """
+    List view mixin serving GET requests through ``values_serializer_class``.
+
+    The filtered queryset is narrowed with ``ValuesSerializer.prepare()``,
+    so pagination, streaming and caching work on row dicts, and
+    ``get_serializer()`` returns the values serializer. Other methods and
+    the browsable API forms keep using the regular serializer.
+
+    Attributes:
+        values_serializer_class (type): ValuesSerializer subclass, or None
+            to disable the fast path.
+    """
+    values_serializer_class = None
+
+    def use_values_serializer(self):
+        return self.values_serializer_class is not None and self.request.method == 'GET'
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.use_values_serializer():
+            return queryset
+        paginator = self.paginator
+        extra = ()
+        if hasattr(paginator, 'tie_breaker'):
+            extra = tuple(paginator.ordering_fields) + (paginator.tie_breaker,)
+        return self.values_serializer_class.prepare(queryset, extra)
+
+    def get_serializer(self, *args, **kwargs):
+        if not self.use_values_serializer():
+            return super().get_serializer(*args, **kwargs)
+        kwargs.setdefault('context', self.get_serializer_context())
+        return self.values_serializer_class(*args, **kwargs)
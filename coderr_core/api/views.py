@@ -1,23 +1,42 @@
-from django.db.models import Avg, Count
+import hashlib
+import json
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework.permissions import IsAdminUser
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from reviews_app.models import Review
-from profiles_app.models import Profile
-from offers_app.models import Offer
+from stats_app.models import PlatformStats
+from .. import metrics
+from ..cache import CachedResponseMixin, get_cache_stats
+from ..profiling import get_profiling_stats
+from .async_views import AsyncViewMixin
 
-class BaseInfoView(APIView):
+class BaseInfoView(CachedResponseMixin, APIView):
     """
     API view to retrieve core statistics about the platform.
 
     Provides the total number of reviews, the average rating across all reviews,
     the count of business profiles, and the total count of offers.
+
+    The numbers come from the incrementally maintained PlatformStats row,
+    so a request costs a single primary-key read. Responses carry an ETag
+    and a public Cache-Control max-age (settings.BASE_INFO_CACHE_MAX_AGE),
+    and are cached server-side until offers, profiles or reviews change.
+    Reads go to a read replica when one is configured.
     """
     permission_classes = []
+    read_from_replica = True
+    cache_namespaces = ('offers', 'profiles', 'reviews')
 
     def get(self, request):
+        return self.cached_response(request, self.build_response)
+
+    def build_response(self, request):
         """
-        Handle GET requests and return aggregated base information.
+        Build the base information response (uncached).
 
         Returns a JSON response containing:
             - review_count: Total number of reviews in the system.
@@ -26,16 +45,72 @@ class BaseInfoView(APIView):
             - offer_count: Total number of offers created.
 
         If no reviews exist, the average rating defaults to 0.0.
+        Returns 304 Not Modified if the client's If-None-Match still matches.
         """
-        review_count = Review.objects.count()
-        average_rating = Review.objects.aggregate(avg=Avg('rating'))['avg'] or 0
-        
-        average_rating = round(average_rating, 1)
-        business_profile_count = Profile.objects.filter(type='business').count()
-        offer_count = Offer.objects.count()
-        return Response({
-            'review_count': review_count,
-            'average_rating': average_rating,
-            'business_profile_count': business_profile_count,
-            'offer_count': offer_count,
-        })
\ No newline at end of file
+        return self.stats_response(request, PlatformStats.load())
+
+    def stats_response(self, request, stats):
+        data = {
+            'review_count': stats.review_count,
+            'average_rating': stats.average_rating,
+            'business_profile_count': stats.business_profile_count,
+            'offer_count': stats.offer_count,
+        }
+        etag = '"%s"' % hashlib.md5(
+            json.dumps(data, sort_keys=True).encode('utf-8'), usedforsecurity=False
+        ).hexdigest()
+
+        response = get_conditional_response(request, etag=etag) or Response(data)
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.BASE_INFO_CACHE_MAX_AGE)
+        return response
+
+class AsyncBaseInfoView(AsyncViewMixin, BaseInfoView):
+    """
+    BaseInfoView for the ASGI mode, reading the stats with the async ORM.
+    """
+
+    async def get(self, request):
+        return await self.acached_response(request, self.abuild_response)
+
+    async def abuild_response(self, request):
+        return self.stats_response(request, await PlatformStats.aload())
+
+class CacheStatsView(APIView):
+    """
+    API view exposing hit/miss counters of the response cache per view.
+
+    Permissions:
+      - Staff users only.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_cache_stats())
+
+class ProfilingStatsView(APIView):
+    """
+    API view exposing the request profiles of this worker per URL name
+    (see coderr_core.profiling).
+
+    Permissions:
+      - Staff users only.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_profiling_stats())
+
+class MetricsView(APIView):
+    """
+    API view exposing the metrics of all worker processes in the
+    OpenMetrics text format, for Prometheus (see coderr_core.metrics).
+
+    Permissions:
+      - Staff users only; Prometheus sends a staff user's token with
+        ``authorization: {type: Token, credentials: ...}``.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class CoderrCoreConfig(AppConfig):
+    name = 'coderr_core'
+
+    def ready(self):
+        from . import checks  # noqa: F401
@@ -2,6 +2,10 @@
 ASGI config for coderr_core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serving it enables ASYNC_VIEWS, so the read endpoints run as async views
+(see coderr_core.asgi_urls), e.g. with uvicorn workers under gunicorn::
+
+    gunicorn coderr_core.asgi:application -k uvicorn_worker.UvicornWorker
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -12,5 +16,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr_core.settings')
+os.environ.setdefault('ASYNC_VIEWS', 'true')
 
 application = get_asgi_application()
@@ -0,0 +1,30 @@
+"""
+URL configuration of the ASGI mode (settings.ASYNC_VIEWS).
+
+Same routes as coderr_core.urls, with the read endpoints listed in
+ASYNC_VIEWS served by their async variants.
+"""
+from django.urls import path
+
+from coderr_core.api.views import AsyncBaseInfoView
+from offers_app.api.views import AsyncOfferDetailRetrieveView
+from orders_app.api.views import AsyncCompletedOrderCountView, AsyncOrderCountView, AsyncOrderStatusCountsView
+from profiles_app.api.views import AsyncBusinessProfileListView, AsyncCustomerProfileListView
+
+from . import urls
+
+ASYNC_VIEWS = {
+    'base-info': AsyncBaseInfoView,
+    'offerdetail-detail': AsyncOfferDetailRetrieveView,
+    'order-count': AsyncOrderCountView,
+    'completed-order-count': AsyncCompletedOrderCountView,
+    'order-counts': AsyncOrderStatusCountsView,
+    'business-profiles': AsyncBusinessProfileListView,
+    'customer-profiles': AsyncCustomerProfileListView,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name].as_view(), name=pattern.name)
+    if getattr(pattern, 'name', None) in ASYNC_VIEWS else pattern
+    for pattern in urls.urlpatterns
+]
@@ -0,0 +1,286 @@
+"""
+Response caching for the read-heavy API views.
+
+Views opt in with CachedResponseMixin and declare the cache namespaces
+their output depends on (e.g. ``'offers'``). Cached entries are keyed by
+view, full request URL (query parameters sorted), optionally the user,
+and the current version of every namespace. Model signals call
+``invalidate()`` to bump namespace versions, which orphans all entries
+built from older data; orphaned entries simply expire.
+
+Only the Django cache API is used, so this works with the local-memory
+and file-based backends configured in settings.CACHES. Hit and miss
+counters are kept in the same cache so they are shared between worker
+processes when a shared backend is used.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+from .metrics import CACHE_REQUESTS
+
+KEY_PREFIX = 'api-cache'
+CACHED_HEADERS = ('ETag', 'Cache-Control', 'Last-Modified')
+
+_cached_view_names = set()
+
+
+def get_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def is_shared_cache():
+    """
+    Whether the API cache is seen by all worker processes, i.e. it is
+    neither the per-process local-memory nor the dummy backend.
+    """
+    return not isinstance(get_cache(), (LocMemCache, DummyCache))
+
+
+def get_worker_processes():
+    return getattr(settings, 'WEB_CONCURRENCY', 1)
+
+
+def reaches_all_workers():
+    """
+    Whether a value written to the API cache is seen by every worker
+    process serving the API: the cache is shared or there is one worker.
+    """
+    return get_worker_processes() <= 1 or is_shared_cache()
+
+
+def _version_key(namespace):
+    return f'{KEY_PREFIX}:version:{namespace}'
+
+
+def _stats_key(name, outcome):
+    return f'{KEY_PREFIX}:stats:{name}:{outcome}'
+
+
+def _incr(cache, key):
+    """
+    Increment a counter in the cache, creating it if it does not exist.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout=None):
+            return 1
+        return cache.incr(key)
+
+
+async def _aincr(cache, key):
+    try:
+        return await cache.aincr(key)
+    except ValueError:
+        if await cache.aadd(key, 1, timeout=None):
+            return 1
+        return await cache.aincr(key)
+
+
+def get_versions(namespaces):
+    """
+    Return the current version of each namespace as a tuple.
+    """
+    cache = get_cache()
+    keys = [_version_key(ns) for ns in namespaces]
+    found = cache.get_many(keys)
+    return tuple(found.get(key, 0) for key in keys)
+
+
+async def aget_versions(namespaces):
+    keys = [_version_key(ns) for ns in namespaces]
+    found = await get_cache().aget_many(keys)
+    return tuple(found.get(key, 0) for key in keys)
+
+
+def invalidate(*namespaces):
+    """
+    Invalidate all cached responses depending on the given namespaces.
+
+    The bump happens immediately and again once the surrounding
+    transaction commits, so a response rendered from not yet committed
+    data cannot outlive the commit.
+    """
+    def bump():
+        cache = get_cache()
+        for namespace in namespaces:
+            _incr(cache, _version_key(namespace))
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def record(name, hit):
+    _incr(get_cache(), _stats_key(name, 'hits' if hit else 'misses'))
+    CACHE_REQUESTS.inc(view=name, result='hit' if hit else 'miss')
+
+
+async def arecord(name, hit):
+    await _aincr(get_cache(), _stats_key(name, 'hits' if hit else 'misses'))
+    CACHE_REQUESTS.inc(view=name, result='hit' if hit else 'miss')
+
+
+def get_cache_stats():
+    """
+    Return hit/miss counters of all cached views.
+
+    Returns:
+        dict: View name -> {'hits': int, 'misses': int, 'hit_ratio': float}.
+    """
+    cache = get_cache()
+    names = sorted(_cached_view_names)
+    keys = [_stats_key(name, outcome) for name in names for outcome in ('hits', 'misses')]
+    found = cache.get_many(keys)
+    stats = {}
+    for name in names:
+        hits = found.get(_stats_key(name, 'hits'), 0)
+        misses = found.get(_stats_key(name, 'misses'), 0)
+        total = hits + misses
+        stats[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else 0.0,
+        }
+    return stats
+
+
+class CachedResponseMixin:
+    """
+    View mixin caching successful GET responses.
+
+    Attributes:
+        cache_namespaces (tuple): Namespaces whose invalidation must drop
+            this view's entries.
+        cache_per_user (bool): Whether the response differs between users.
+        cache_timeout (int): Seconds to keep entries; defaults to
+            settings.API_CACHE_TIMEOUT.
+
+    Generic views get caching for their ``get`` handler; views defining
+    ``get`` themselves wrap their logic with ``cached_response()``.
+    Responses carry an ``X-Cache: HIT`` or ``X-Cache: MISS`` header.
+    """
+    cache_namespaces = ()
+    cache_per_user = False
+    cache_timeout = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _cached_view_names.add(cls.__name__)
+
+    def get_cache_timeout(self):
+        if self.cache_timeout is not None:
+            return self.cache_timeout
+        return getattr(settings, 'API_CACHE_TIMEOUT', 300)
+
+    def get_response_cache_key(self, request, versions=None):
+        """
+        Build the cache key of the request; ``versions`` are the current
+        namespace versions (read from the cache if not given).
+        """
+        if versions is None:
+            versions = get_versions(self.cache_namespaces)
+        query = sorted(
+            (key, value) for key, values in request.query_params.lists() for value in values
+        )
+        parts = [
+            request.scheme,
+            request.get_host(),
+            request.path,
+            repr(query),
+            repr(versions),
+        ]
+        if self.cache_per_user:
+            parts.append(str(request.user.pk))
+        digest = hashlib.md5('|'.join(parts).encode('utf-8'), usedforsecurity=False).hexdigest()
+        return f'{KEY_PREFIX}:{type(self).__name__}:{digest}'
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        """
+        Serve the response from the cache, or build it with ``handler`` and
+        store it if it is a 200.
+
+        Authentication and permission checks have already run at this point.
+        Requests pinned to the primary database (see coderr_core.middleware)
+        skip the lookup, since cached entries may come from a lagging
+        replica, and store the fresh response instead.
+        """
+        key = self.get_response_cache_key(request)
+        response = self.get_cached_response(request, key)
+        if response is None:
+            record(type(self).__name__, hit=False)
+            response = self.store_response(key, handler(request, *args, **kwargs))
+        return response
+
+    async def acached_response(self, request, handler, *args, **kwargs):
+        """
+        ``cached_response()`` for async views, awaiting ``handler`` and
+        using the async cache API, so the event loop is never blocked by
+        the cache backend.
+        """
+        key = self.get_response_cache_key(request, await aget_versions(self.cache_namespaces))
+        response = await self.aget_cached_response(request, key)
+        if response is None:
+            await arecord(type(self).__name__, hit=False)
+            response = await self.astore_response(key, await handler(request, *args, **kwargs))
+        return response
+
+    def get_cached_response(self, request, key):
+        if getattr(request, 'replica_pinned', False):
+            return None
+        entry = get_cache().get(key)
+        if entry is None:
+            return None
+        record(type(self).__name__, hit=True)
+        return self.build_cached_response(request, entry)
+
+    async def aget_cached_response(self, request, key):
+        if getattr(request, 'replica_pinned', False):
+            return None
+        entry = await get_cache().aget(key)
+        if entry is None:
+            return None
+        await arecord(type(self).__name__, hit=True)
+        return self.build_cached_response(request, entry)
+
+    def build_cached_response(self, request, entry):
+        data, status_code, headers = entry
+        response = (get_conditional_response(request, etag=headers.get('ETag'))
+                    or Response(data, status=status_code))
+        for name, value in headers.items():
+            response[name] = value
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def store_response(self, key, response):
+        entry = self.get_cache_entry(response)
+        if entry is not None:
+            get_cache().set(key, entry, self.get_cache_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+
+    async def astore_response(self, key, response):
+        entry = self.get_cache_entry(response)
+        if entry is not None:
+            await get_cache().aset(key, entry, self.get_cache_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def get_cache_entry(self, response):
+        """
+        Return the (data, status, headers) entry to cache for a response, or
+        None if it must not be cached.
+        """
+        if response.status_code == 200 and hasattr(response, 'data'):
+            headers = {name: response[name] for name in CACHED_HEADERS if response.has_header(name)}
+            return response.data, response.status_code, headers
+        return None
+
+    def get(self, request, *args, **kwargs):
+        return self.cached_response(request, super().get, *args, **kwargs)
@@ -0,0 +1,41 @@
+"""
+System checks for settings that only break once several worker
+processes serve the API (``manage.py check``; gunicorn.conf.py runs them
+when the server starts).
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from .cache import get_worker_processes, reaches_all_workers
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Cache invalidation only reaches the process that made the change unless
+    the cache is shared, so the other workers keep serving stale responses.
+    """
+    if reaches_all_workers():
+        return []
+    return [Warning(
+        f'The API cache is local to each process, but {get_worker_processes()} worker processes '
+        'are configured.',
+        hint='Use a shared cache, e.g. CACHE_BACKEND=file, so invalidations reach all workers.',
+        id='coderr_core.W001',
+    )]
+
+
+@register(Tags.caches)
+def check_replica_pins(app_configs, **kwargs):
+    """
+    Replica pins live in the API cache; other workers would not see them
+    and serve a client stale reads right after its own write.
+    """
+    if not getattr(settings, 'DATABASE_REPLICAS', []) or reaches_all_workers():
+        return []
+    return [Warning(
+        'Read replicas are configured, but pins to the primary would only be seen by the worker '
+        'process that set them, so the replicas are not used.',
+        hint='Use a shared cache, e.g. CACHE_BACKEND=file, to read from the replicas.',
+        id='coderr_core.W002',
+    )]
@@ -0,0 +1,72 @@
+"""
+Helpers for write transactions under concurrent gunicorn workers.
+
+With SQLite, ``transaction_mode = 'IMMEDIATE'`` makes every atomic block
+take the write lock at ``BEGIN`` (waiting up to ``busy_timeout``), so a
+transaction can no longer fail halfway when upgrading from a read to a
+write lock. If the lock still cannot be acquired in time, SQLite raises
+"database is locked" before anything was written, and the whole operation
+can safely be retried.
+
+``retry_on_db_lock`` retries a callable with exponential backoff and
+jitter on such errors; ``write_transaction`` additionally runs it in one
+atomic block. Retries only happen at the outermost level: inside an
+enclosing transaction the error is re-raised, since only the caller that
+owns the transaction can start it over.
+"""
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+LOCK_ERROR_MESSAGES = ('database is locked', 'database table is locked', 'database is busy')
+
+
+def get_lock_retry_setting(name):
+    defaults = {'ATTEMPTS': 5, 'BACKOFF': 0.05, 'MAX_BACKOFF': 1.0}
+    return getattr(settings, 'DB_LOCK_RETRY', {}).get(name, defaults[name])
+
+
+def is_lock_error(exc):
+    return isinstance(exc, OperationalError) and any(
+        message in str(exc).lower() for message in LOCK_ERROR_MESSAGES
+    )
+
+
+def retry_on_db_lock(func=None, *, using=DEFAULT_DB_ALIAS):
+    """
+    Decorator retrying ``func`` when the database is locked.
+
+    Makes up to ``DB_LOCK_RETRY['ATTEMPTS']`` attempts, sleeping a random
+    time of up to ``BACKOFF * 2**n`` seconds (capped at ``MAX_BACKOFF``)
+    between them. ``func`` must be safe to call again, e.g. re-read its
+    objects and run its writes in one transaction.
+    """
+    if func is None:
+        return lambda f: retry_on_db_lock(f, using=using)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        attempts = get_lock_retry_setting('ATTEMPTS')
+        for attempt in range(attempts):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                if (not is_lock_error(exc) or attempt == attempts - 1
+                        or connections[using].in_atomic_block):
+                    raise
+            delay = min(get_lock_retry_setting('BACKOFF') * 2 ** attempt, get_lock_retry_setting('MAX_BACKOFF'))
+            time.sleep(random.uniform(0, delay))
+    return wrapper
+
+
+def write_transaction(func=None, *, using=DEFAULT_DB_ALIAS):
+    """
+    Decorator running ``func`` in one atomic block, retried as a whole
+    when the database is locked.
+    """
+    if func is None:
+        return lambda f: write_transaction(f, using=using)
+    return retry_on_db_lock(transaction.atomic(using=using)(func), using=using)
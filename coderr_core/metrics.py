@@ -0,0 +1,365 @@
+"""
+Prometheus metrics in the OpenMetrics text format (``/api/metrics/``).
+
+Every process writes its samples to its own memory-mapped file in
+``METRICS['DIR']`` (``<pid>.db``); a scrape sums the files of all
+processes, so any gunicorn worker answers with the totals of all of them.
+When a worker exits, gunicorn.conf.py merges its file into
+``archive.db`` (``mark_process_dead``), so its counts keep adding to the
+totals, which is what counters and histograms need, without one file per
+recycled worker. gunicorn.conf.py empties the directory when the server
+starts (with the preloaded app).
+
+Metrics are declared at module level below and updated from
+
+    RequestProfilingMiddleware  request latency and queries per URL name
+    coderr_core.cache.record    response cache hits and misses
+    orders_app.signals          created orders by status
+    CustomLoginView             failed logins
+
+The values file holds an 8-byte header with the number of bytes used,
+followed by entries of a 4-byte key length, the UTF-8 key (padded to 8
+bytes) and a float64 value. Entries are only appended and updated in
+place, so readers never see a partially written key.
+"""
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+ARCHIVE_NAME = 'archive.db'
+
+# Request methods used as label values; anything else is counted as "other".
+METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+_header = struct.Struct('i4x')
+_length = struct.Struct('i')
+_value = struct.Struct('d')
+
+_registry = []
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_metrics_setting(name):
+    defaults = {
+        'ENABLED': True,
+        'DIR': os.path.join(tempfile.gettempdir(), 'coderr-metrics'),
+    }
+    return getattr(settings, 'METRICS', {}).get(name, defaults[name])
+
+
+def _padded(length):
+    return length + (-length % 8)
+
+
+def read_values(data):
+    """
+    Yield (key, value, value offset) of the entries in a values file.
+    """
+    used = _header.unpack_from(data, 0)[0] if len(data) >= _header.size else 0
+    position = _header.size
+    while position < used:
+        length = _length.unpack_from(data, position)[0]
+        key_end = position + _length.size + length
+        offset = _padded(key_end)
+        yield data[position + _length.size:key_end].decode(), _value.unpack_from(data, offset)[0], offset
+        position = offset + _value.size
+
+
+class MmapValues:
+    """
+    Float values by key in a memory-mapped file written by one process.
+    """
+    initial_size = 1 << 16
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        with open(path, 'a+b') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < self.initial_size:
+                file.truncate(self.initial_size)
+        self.file = open(path, 'r+b')
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        self.used = _header.unpack_from(self.map, 0)[0] or _header.size
+        self.offsets = {key: offset for key, _, offset in read_values(self.map)}
+
+    def inc(self, key, amount):
+        with self.lock:
+            offset = self.offsets.get(key)
+            if offset is None:
+                offset = self.append(key)
+            value = _value.unpack_from(self.map, offset)[0]
+            _value.pack_into(self.map, offset, value + amount)
+
+    def append(self, key):
+        encoded = key.encode()
+        offset = _padded(self.used + _length.size + len(encoded))
+        end = offset + _value.size
+        if end > len(self.map):
+            self.grow(end)
+        _length.pack_into(self.map, self.used, len(encoded))
+        self.map[self.used + _length.size:self.used + _length.size + len(encoded)] = encoded
+        _value.pack_into(self.map, offset, 0.0)
+        # Publish the entry only once it is complete.
+        self.used = end
+        _header.pack_into(self.map, 0, self.used)
+        self.offsets[key] = offset
+        return offset
+
+    def grow(self, needed):
+        size = len(self.map)
+        while size < needed:
+            size *= 2
+        self.map.close()
+        self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+def get_store():
+    """
+    Return the values file of this process, opened again after a fork or a
+    change of ``METRICS['DIR']``.
+    """
+    global _store
+    directory = get_metrics_setting('DIR')
+    path = os.path.join(directory, f'{os.getpid()}.db')
+    store = _store
+    if store is None or store.path != path:
+        with _store_lock:
+            if _store is None or _store.path != path:
+                os.makedirs(directory, exist_ok=True)
+                _store = MmapValues(path)
+            store = _store
+    return store
+
+
+def collect_values():
+    """
+    Sum the values of all processes.
+
+    Returns:
+        dict: Key -> float.
+    """
+    directory = get_metrics_setting('DIR')
+    totals = defaultdict(float)
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return totals
+    for name in names:
+        if not name.endswith('.db'):
+            continue
+        try:
+            with open(os.path.join(directory, name), 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            continue
+        for key, value, _ in read_values(data):
+            totals[key] += value
+    return totals
+
+
+def mark_process_dead(pid):
+    """
+    Add the values of the exited process ``pid`` to the archive file and
+    delete its own file. Merges are serialized with a lock file, so this
+    is safe to call from several processes.
+    """
+    import fcntl
+
+    directory = get_metrics_setting('DIR')
+    path = os.path.join(directory, f'{pid}.db')
+    if not os.path.exists(path):
+        return
+    with open(os.path.join(directory, 'archive.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return
+        archive = MmapValues(os.path.join(directory, ARCHIVE_NAME))
+        try:
+            for key, value, _ in read_values(data):
+                archive.inc(key, value)
+        finally:
+            archive.close()
+        os.remove(path)
+
+
+def clear():
+    """
+    Delete the values of all processes.
+    """
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+    directory = get_metrics_setting('DIR')
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith(('.db', '.lock')):
+                os.remove(os.path.join(directory, name))
+
+
+def sample_key(name, labels):
+    return json.dumps([name, sorted(labels.items())])
+
+
+class Metric:
+    """
+    Base class of the metric types; instances register themselves for
+    rendering.
+    """
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def labels(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects the labels {", ".join(self.labelnames)}.')
+        return {name: str(value) for name, value in labels.items()}
+
+    def inc_sample(self, suffix, labels, amount):
+        if get_metrics_setting('ENABLED'):
+            get_store().inc(sample_key(self.name + suffix, labels), amount)
+
+    def samples(self, values):
+        """
+        Yield (sample name, labels, value) from the collected values.
+        """
+        prefix = self.name
+        for key, value in sorted(values.items()):
+            name, labels = json.loads(key)
+            if name.startswith(prefix) and name[len(prefix):] in self.suffixes:
+                yield name, dict(labels), value
+
+
+class Counter(Metric):
+    type = 'counter'
+    suffixes = ('_total',)
+
+    def inc(self, amount=1, **labels):
+        self.inc_sample('_total', self.labels(labels), amount)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+    suffixes = ('_bucket', '_count', '_sum')
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        labels = self.labels(labels)
+        bound = next((bound for bound in self.buckets if value <= bound), None)
+        # Buckets are stored per interval and made cumulative when rendered.
+        self.inc_sample('_bucket', {**labels, 'le': format_value(bound) if bound is not None else '+Inf'}, 1)
+        self.inc_sample('_count', labels, 1)
+        self.inc_sample('_sum', labels, value)
+
+    def samples(self, values):
+        series = defaultdict(dict)
+        for name, labels, value in super().samples(values):
+            le = labels.pop('le', None)
+            key = tuple(sorted(labels.items()))
+            series[key][name if le is None else le] = value
+        for key, found in sorted(series.items()):
+            labels = dict(key)
+            cumulative = 0.0
+            for bound in [format_value(bound) for bound in self.buckets] + ['+Inf']:
+                cumulative += found.get(bound, 0.0)
+                yield self.name + '_bucket', {**labels, 'le': bound}, cumulative
+            yield self.name + '_count', labels, found.get(self.name + '_count', 0.0)
+            yield self.name + '_sum', labels, found.get(self.name + '_sum', 0.0)
+
+
+class Gauge(Metric):
+    """
+    A gauge computed at scrape time from the collected values by
+    ``function(values)``, which yields (labels, value).
+    """
+    type = 'gauge'
+    suffixes = ()
+
+    def __init__(self, name, documentation, function):
+        super().__init__(name, documentation)
+        self.function = function
+
+    def samples(self, values):
+        for labels, value in self.function(values):
+            yield self.name, labels, value
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return f'{value:.1f}'
+    return repr(float(value))
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render():
+    """
+    Render all metrics of all processes in the OpenMetrics text format.
+    """
+    values = collect_values()
+    lines = []
+    for metric in _registry:
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        lines.append(f'# HELP {metric.name} {escape(metric.documentation)}')
+        for name, labels, value in metric.samples(values):
+            label_text = ','.join(f'{label}="{escape(text)}"' for label, text in labels.items())
+            lines.append(f'{name}{{{label_text}}} {format_value(value)}' if label_text else f'{name} {format_value(value)}')
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+def cache_hit_ratios(values):
+    counts = defaultdict(lambda: {'hit': 0.0, 'miss': 0.0})
+    for _, labels, value in CACHE_REQUESTS.samples(values):
+        counts[labels['view']][labels['result']] += value
+    for view, count in sorted(counts.items()):
+        total = count['hit'] + count['miss']
+        yield {'view': view}, count['hit'] / total if total else 0.0
+
+
+REQUEST_LATENCY = Histogram('coderr_request_duration_seconds', 'Request latency per URL name.',
+                            ('url_name', 'method'))
+REQUEST_QUERIES = Counter('coderr_db_queries', 'SQL queries run by requests per URL name.', ('url_name',))
+CACHE_REQUESTS = Counter('coderr_cache_requests', 'Response cache lookups per view.', ('view', 'result'))
+CACHE_HIT_RATIO = Gauge('coderr_cache_hit_ratio', 'Share of response cache lookups that were hits.',
+                        cache_hit_ratios)
+ORDERS_CREATED = Counter('coderr_orders_created', 'Created orders by initial status.', ('status',))
+LOGIN_FAILURES = Counter('coderr_login_failures', 'Failed logins at /api/login/.', ('reason',))
+
+
+def observe_request(url_name, method, profile):
+    method = method if method in METHODS else 'other'
+    REQUEST_LATENCY.observe(profile.total, url_name=url_name, method=method)
+    REQUEST_QUERIES.inc(profile.queries, url_name=url_name)
@@ -0,0 +1,152 @@
+"""
+Project middleware.
+"""
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .metrics import get_metrics_setting, observe_request
+from .profiling import (RequestProfile, current_profile, get_profiling_setting, get_url_name, record,
+                        sampled_cprofile)
+from .routers import get_replicas, is_pinned, pin_to_primary, replica_reads
+
+
+class RequestProfilingMiddleware:
+    """
+    Measure every request (see coderr_core.profiling) for the request
+    metrics (coderr_core.metrics) and, if request profiling is enabled,
+    record it under its URL name and add a Server-Timing header.
+
+    Put it first in MIDDLEWARE, so the total covers all other middleware.
+    Queries run after the response is returned (content of streaming
+    responses) are not counted. cProfile samples are only taken of
+    requests handled synchronously.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.is_enabled():
+            return self.get_response(request)
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            with profile.capture_queries(), sampled_cprofile(request):
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if not self.is_enabled():
+            return await self.get_response(request)
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        # The ORM runs in the request's thread for sync code, so the query
+        # hook is installed on that thread's connections.
+        queries = await sync_to_async(profile.capture_queries)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(queries.close)()
+            current_profile.reset(token)
+        return self.finish(request, response, profile)
+
+    @staticmethod
+    def is_enabled():
+        return get_profiling_setting('ENABLED') or get_metrics_setting('ENABLED')
+
+    def process_template_response(self, request, response):
+        profile = current_profile.get()
+        if profile is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                profile.render_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, profile):
+        profile.finish(response)
+        observe_request(get_url_name(request), request.method, profile)
+        if get_profiling_setting('ENABLED'):
+            record(request, profile)
+            if get_profiling_setting('SERVER_TIMING'):
+                response['Server-Timing'] = profile.server_timing()
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve GET/HEAD requests of views with ``read_from_replica = True`` from
+    the read replicas (see coderr_core.routers).
+
+    The flag is set in ``process_view``, so URL resolution and earlier
+    middleware use the primary, and cleared when the response is returned.
+    Streaming responses keep reading from the database their iterator
+    started on (see coderr_core.api.streaming); queries first run while the
+    content is sent use the primary.
+
+    After a successful write request (any other method with a status below
+    400) the client is pinned to the primary for a short time, so it reads
+    its own writes. Pinned requests are marked with ``replica_pinned`` and
+    bypass cached responses, which may have been built from a replica.
+    Without a cache shared by all workers, everything reads from the
+    primary.
+
+    Works in sync (WSGI) and async (ASGI) middleware chains.
+    """
+    sync_capable = True
+    async_capable = True
+    replica_methods = ('GET', 'HEAD')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = replica_reads.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        self.pin_after_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = replica_reads.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        self.pin_after_write(request, response)
+        return response
+
+    def pin_after_write(self, request, response):
+        if request.method not in self.replica_methods and response.status_code < 400 and get_replicas():
+            pin_to_primary(self.get_credentials(request))
+
+    def get_credentials(self, request):
+        return request.META.get('HTTP_AUTHORIZATION', '')
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        if request.method not in self.replica_methods or not getattr(view_class, 'read_from_replica', False):
+            return
+        if not get_replicas():
+            return
+        if is_pinned(self.get_credentials(request)):
+            request.replica_pinned = True
+        else:
+            replica_reads.set(True)
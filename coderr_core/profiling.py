@@ -0,0 +1,266 @@
+"""
+Per-request profiling: where does the time of an API request go?
+
+RequestProfilingMiddleware (coderr_core.middleware) measures every request
+in a RequestProfile:
+
+    total       wall time from the outermost middleware on
+    db          number and time of the SQL queries, counted with
+                ``connection.execute_wrapper`` on every database alias
+    serialize   time spent in ``to_representation`` of the project's
+                serializers (TimedSerializerMixin) and in the values
+                serializers, including queries it triggers lazily
+    render      time spent rendering the response (JSON encoding)
+    bytes       size of the response body (not for streamed responses)
+
+Samples are kept per URL name (``offer-list-create``, ``order-list``, ...)
+in a rolling in-process window summarized by ``get_profiling_stats()``
+(staff endpoint ``/api/profiling-stats/``). With ``SERVER_TIMING`` the
+numbers of the request are also returned in a ``Server-Timing`` header,
+which browser dev tools display. A share ``CPROFILE_SAMPLE_RATE`` of the
+sync requests is run under cProfile and dumped to ``CPROFILE_DIR``, to be
+opened with ``python -m pstats`` or snakeviz.
+
+The window is per worker process; see settings.REQUEST_PROFILING.
+"""
+import cProfile
+import functools
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+current_profile = ContextVar('current_profile', default=None)
+
+METRICS = (
+    ('total_ms', 1000),
+    ('queries', 1),
+    ('query_ms', 1000),
+    ('serialize_ms', 1000),
+    ('render_ms', 1000),
+    ('response_bytes', 1),
+)
+
+_histogram = None
+# Only one profiler can be active per process (enforced from Python 3.12 on).
+_cprofile_lock = threading.Lock()
+
+
+def get_profiling_setting(name):
+    defaults = {
+        'ENABLED': False,
+        'SERVER_TIMING': False,
+        'WINDOW': 1000,
+        'CPROFILE_SAMPLE_RATE': 0.0,
+        'CPROFILE_DIR': '.profiles',
+    }
+    return getattr(settings, 'REQUEST_PROFILING', {}).get(name, defaults[name])
+
+
+class RequestProfile:
+    """
+    Measurements of one request; times are in seconds.
+
+    An instance is also the ``execute_wrapper`` hook counting the queries.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+        self.response_bytes = None
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += time.perf_counter() - started
+
+    def capture_queries(self):
+        """
+        Install the query hook on all connections of the current thread
+        until the returned ExitStack is closed.
+        """
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self))
+        return stack
+
+    def finish(self, response):
+        self.total = time.perf_counter() - self.started
+        if not response.streaming:
+            self.response_bytes = len(response.content)
+
+    def sample(self):
+        return (self.total, self.queries, self.query_time, self.serialize_time,
+                self.render_time, self.response_bytes)
+
+    def server_timing(self):
+        def ms(seconds):
+            return f'{seconds * 1000:.2f}'
+
+        return ', '.join([
+            f'total;dur={ms(self.total)}',
+            f'db;dur={ms(self.query_time)};desc="{self.queries} queries"',
+            f'serialize;dur={ms(self.serialize_time)}',
+            f'render;dur={ms(self.render_time)}',
+        ])
+
+
+@contextmanager
+def timing_serialization():
+    """
+    Add the time spent in the block to the serialize time of the current
+    request. Nested serializers are only counted once.
+    """
+    profile = current_profile.get()
+    if profile is None or profile.serializing:
+        yield
+        return
+    profile.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serializing = False
+        profile.serialize_time += time.perf_counter() - started
+
+
+def timed_serialization(method):
+    """
+    Decorator counting the time of ``method`` as serialize time.
+    """
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        with timing_serialization():
+            return method(*args, **kwargs)
+    return timed
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin counting ``to_representation`` as serialize time of
+    the profiled request, including the overrides of subclasses. List
+    serializers call it per item, so ``many=True`` is covered as well.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'to_representation' in vars(cls):
+            cls.to_representation = timed_serialization(vars(cls)['to_representation'])
+
+    @timed_serialization
+    def to_representation(self, instance):
+        return super().to_representation(instance)
+
+
+@contextmanager
+def sampled_cprofile(request):
+    """
+    Run the block under cProfile for a random share of the requests and
+    dump the stats to ``CPROFILE_DIR/<url name>-<ms timestamp>-<pid>.prof``.
+
+    Only one request per process is profiled at a time; a request sampled
+    while another one (or another profiling tool) is active runs unprofiled.
+    """
+    rate = get_profiling_setting('CPROFILE_SAMPLE_RATE')
+    if (not get_profiling_setting('ENABLED') or not rate or random.random() >= rate
+            or not _cprofile_lock.acquire(blocking=False)):
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        _cprofile_lock.release()
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _cprofile_lock.release()
+        directory = get_profiling_setting('CPROFILE_DIR')
+        os.makedirs(directory, exist_ok=True)
+        filename = f'{get_url_name(request)}-{int(time.time() * 1000)}-{os.getpid()}.prof'
+        profiler.dump_stats(os.path.join(directory, filename))
+
+
+def get_url_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return (match.url_name if match else None) or 'unresolved'
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+class RollingHistogram:
+    """
+    The last ``window`` samples per URL name, summarized on demand.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.samples = defaultdict(lambda: deque(maxlen=self.window))
+        self.lock = threading.Lock()
+
+    def add(self, name, sample):
+        with self.lock:
+            self.samples[name].append(sample)
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+    def summary(self):
+        """
+        Returns:
+            dict: URL name -> {'count': int, metric: {'mean', 'p50', 'p95',
+            'p99', 'max'}} with times in milliseconds.
+        """
+        with self.lock:
+            snapshot = {name: list(samples) for name, samples in self.samples.items()}
+        stats = {}
+        for name, samples in sorted(snapshot.items()):
+            entry = {'count': len(samples)}
+            for index, (metric, scale) in enumerate(METRICS):
+                values = sorted(sample[index] * scale for sample in samples if sample[index] is not None)
+                if not values:
+                    continue
+                entry[metric] = {
+                    'mean': round(sum(values) / len(values), 2),
+                    'p50': round(percentile(values, 0.5), 2),
+                    'p95': round(percentile(values, 0.95), 2),
+                    'p99': round(percentile(values, 0.99), 2),
+                    'max': round(values[-1], 2),
+                }
+            stats[name] = entry
+        return stats
+
+
+def get_histogram():
+    global _histogram
+    if _histogram is None:
+        _histogram = RollingHistogram(get_profiling_setting('WINDOW'))
+    return _histogram
+
+
+def record(request, profile):
+    get_histogram().add(get_url_name(request), profile.sample())
+
+
+def get_profiling_stats():
+    return get_histogram().summary()
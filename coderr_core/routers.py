@@ -0,0 +1,100 @@
+"""
+Database router sending selected reads to read replicas.
+
+Replica aliases are listed in ``settings.DATABASE_REPLICAS`` (configured
+from ``DATABASE_REPLICA_URLS``). Reads are only routed to a replica while
+``replica_reads`` is set for the current request or task, which
+ReplicaRoutingMiddleware does for GET requests to views marked with
+``read_from_replica = True``. Everything else, in particular all writes,
+uses the primary ("default").
+
+Replicas lag behind the primary, so clients that have just written are
+pinned to the primary for ``DATABASE_REPLICA_PIN_SECONDS`` (read-your-
+writes). Pins are keyed by the request's credentials (the token in the
+Authorization header) and stored in the API cache, which therefore has
+to be shared between worker processes (CACHE_BACKEND=file) when several
+workers serve the API. Without a shared cache, another worker would not
+see the pin, so requests are then not routed to the replicas at all
+(and the system check coderr_core.W002 warns).
+"""
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .cache import get_cache, reaches_all_workers
+
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+def get_replicas():
+    """
+    Return the replica aliases requests may read from: none unless the
+    pins reach every worker process.
+    """
+    replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+    if replicas and not reaches_all_workers():
+        return []
+    return replicas
+
+
+def get_pin_seconds():
+    return getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 5)
+
+
+def pin_key(credentials):
+    digest = hashlib.sha256(credentials.encode('utf-8')).hexdigest()
+    return f'replica-pin:{digest}'
+
+
+def pin_to_primary(credentials):
+    """
+    Route the reads of the client identified by ``credentials`` to the
+    primary for the next ``DATABASE_REPLICA_PIN_SECONDS``.
+    """
+    seconds = get_pin_seconds()
+    if credentials and seconds > 0:
+        get_cache().set(pin_key(credentials), True, seconds)
+
+
+def is_pinned(credentials):
+    return bool(credentials) and get_cache().get(pin_key(credentials)) is not None
+
+
+@contextmanager
+def use_replicas(enabled=True):
+    """
+    Route reads inside the block to the replicas (or, with
+    ``enabled=False``, to the primary).
+    """
+    token = replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Spread reads over the replicas while ``replica_reads`` is set.
+
+    Migrations only run on the primary; replicas receive the schema by
+    replication (or, in tests, mirror the primary).
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+        if replicas and replica_reads.get():
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in getattr(settings, 'DATABASE_REPLICAS', [])
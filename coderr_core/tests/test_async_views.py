@@ -0,0 +1,142 @@
+import asyncio
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import resolve, reverse
+from rest_framework.authtoken.models import Token
+
+from offers_app.models import Offer
+from orders_app.models import Order
+from profiles_app.models import Profile
+from reviews_app.models import Review
+from stats_app.models import PlatformStats
+
+
+class AsyncViewContractTests(TestCase):
+    """
+    The async views of the ASGI mode (coderr_core.asgi_urls) must answer
+    exactly like the sync views they replace.
+    """
+    def setUp(self):
+        cache.clear()
+        self.businesses = []
+        for i in range(3):
+            user = User.objects.create_user(f'biz{i}', f'biz{i}@example.com', 'pass', first_name=f'Max{i}')
+            Profile.objects.create(user=user, type='business', location='Köln')
+            self.businesses.append(user)
+        self.customer = User.objects.create_user('cust', 'cust@example.com', 'pass')
+        Profile.objects.create(user=self.customer, type='customer')
+        for i, business in enumerate(self.businesses):
+            offer = Offer.objects.create(user=business, title=f'Logo Design {i}', description='Logos')
+            self.detail = offer.details.create(title='Basic', revisions=1, delivery_time_in_days=5,
+                                               price=99.5, features=['Logo'], offer_type='basic')
+            Order.objects.create(customer_user=self.customer, business_user=business, offer_detail=self.detail,
+                                 status='completed' if i else 'in_progress')
+            Review.objects.create(business_user=business, reviewer=self.customer, rating=i + 3, description='Ok')
+        self.headers = {'Authorization': f'Token {Token.objects.create(user=self.customer).key}'}
+
+    def get(self, urlconf, url, params, headers):
+        cache.clear()
+        with self.settings(ROOT_URLCONF=urlconf):
+            if urlconf == 'coderr_core.asgi_urls':
+                return async_to_sync(self.async_client.get)(url, params, headers=headers)
+            return self.client.get(url, params, headers=headers)
+
+    def assertSameResponses(self, url, params=None, headers=None):
+        headers = self.headers if headers is None else headers
+        expected = self.get('coderr_core.urls', url, params, headers)
+        response = self.get('coderr_core.asgi_urls', url, params, headers)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    def test_read_endpoints_are_async(self):
+        for name, args in [('base-info', []), ('offerdetail-detail', [1]), ('order-count', [1]),
+                           ('completed-order-count', [1]), ('order-counts', []),
+                           ('business-profiles', []), ('customer-profiles', [])]:
+            with self.subTest(name=name):
+                url = reverse(name, args=args)
+                self.assertTrue(iscoroutinefunction(resolve(url, 'coderr_core.asgi_urls').func))
+                self.assertFalse(iscoroutinefunction(resolve(url, 'coderr_core.urls').func))
+
+    def test_endpoints_match(self):
+        business_id = self.businesses[1].pk
+        cases = [
+            (reverse('base-info'), None),
+            (reverse('offerdetail-detail', args=[self.detail.pk]), None),
+            (reverse('offerdetail-detail', args=[9999]), None),
+            (reverse('order-count', args=[self.businesses[0].pk]), None),
+            (reverse('order-count', args=[self.customer.pk]), None),
+            (reverse('order-count', args=[9999]), None),
+            (reverse('completed-order-count', args=[business_id]), None),
+            (reverse('order-counts'), {'business_user_id': f'{business_id},{self.customer.pk}'}),
+            (reverse('order-counts'), {'business_user_id': 'x'}),
+            (reverse('business-profiles'), None),
+            (reverse('business-profiles'), {'page_size': 2, 'page': 2}),
+            (reverse('business-profiles'), {'page': 5}),
+            (reverse('business-profiles'), {'pagination': 'cursor', 'page_size': 2, 'ordering': '-created_at'}),
+            (reverse('business-profiles'), {'cursor': 'broken'}),
+            (reverse('customer-profiles'), None),
+        ]
+        for url, params in cases:
+            with self.subTest(url=url, params=params):
+                self.assertSameResponses(url, params)
+
+    def test_cursor_links_match(self):
+        url, params = reverse('business-profiles'), {'pagination': 'cursor', 'page_size': 1}
+        pages = 0
+        while url:
+            response = self.assertSameResponses(url, params)
+            url, params = response.json()['next'], None
+            pages += 1
+        self.assertEqual(pages, 3)
+
+    def test_authentication_errors_match(self):
+        for url in (reverse('base-info'), reverse('order-count', args=[self.businesses[0].pk]),
+                    reverse('business-profiles')):
+            with self.subTest(url=url):
+                self.assertSameResponses(url, headers={})
+                self.assertSameResponses(url, headers={'Authorization': 'Token invalid'})
+
+    def test_cached_response(self):
+        url = reverse('base-info')
+        with self.settings(ROOT_URLCONF='coderr_core.asgi_urls'):
+            first = async_to_sync(self.async_client.get)(url)
+            second = async_to_sync(self.async_client.get)(url)
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(first.content, second.content)
+
+    def test_cache_is_not_called_in_event_loop(self):
+        """
+        The blocking cache API runs in worker threads, never in the event loop.
+        """
+        blocking_calls = []
+
+        def in_loop(method):
+            def wrapper(*args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    blocking_calls.append(method.__name__)
+                except RuntimeError:
+                    pass
+                return method(*args, **kwargs)
+            return wrapper
+
+        url = reverse('base-info')
+        with self.settings(ROOT_URLCONF='coderr_core.asgi_urls'):
+            with patch.multiple(cache, **{name: in_loop(getattr(cache, name))
+                                          for name in ('get', 'get_many', 'set', 'add', 'incr')}):
+                first = async_to_sync(self.async_client.get)(url)
+                second = async_to_sync(self.async_client.get)(url)
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(blocking_calls, [])
+
+    def test_missing_stats_are_rebuilt(self):
+        expected = PlatformStats.compute()
+        PlatformStats.objects.all().delete()
+        self.assertEqual(async_to_sync(PlatformStats.acompute)(), expected)
+        stats = async_to_sync(PlatformStats.aload)()
+        self.assertEqual({name: getattr(stats, name) for name in expected}, expected)
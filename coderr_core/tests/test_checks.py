@@ -0,0 +1,44 @@
+from django.core.checks import Warning
+from django.test import SimpleTestCase, override_settings
+
+from coderr_core.checks import check_replica_pins, check_shared_cache
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+FILE = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                    'LOCATION': '/tmp/coderr-check-cache'}}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    """
+    Tests for the system check against per-process caches with several workers.
+    """
+    @override_settings(CACHES=LOCMEM, WEB_CONCURRENCY=1)
+    def test_single_worker_may_use_locmem(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(CACHES=LOCMEM, WEB_CONCURRENCY=4)
+    def test_several_workers_with_locmem(self):
+        messages = check_shared_cache(None)
+        self.assertEqual([message.id for message in messages], ['coderr_core.W001'])
+        self.assertIsInstance(messages[0], Warning)
+
+    @override_settings(CACHES=FILE, WEB_CONCURRENCY=4)
+    def test_several_workers_with_file_cache(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+
+class ReplicaPinsCheckTests(SimpleTestCase):
+    """
+    Tests for the system check against replicas with per-process pins.
+    """
+    @override_settings(CACHES=LOCMEM, WEB_CONCURRENCY=4, DATABASE_REPLICAS=['replica_1'])
+    def test_replicas_with_locmem(self):
+        self.assertEqual([message.id for message in check_replica_pins(None)], ['coderr_core.W002'])
+
+    @override_settings(CACHES=FILE, WEB_CONCURRENCY=4, DATABASE_REPLICAS=['replica_1'])
+    def test_replicas_with_file_cache(self):
+        self.assertEqual(check_replica_pins(None), [])
+
+    @override_settings(CACHES=LOCMEM, WEB_CONCURRENCY=4, DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        self.assertEqual(check_replica_pins(None), [])
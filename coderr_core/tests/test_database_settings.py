@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, TestCase
+
+
+class DatabaseConnectionSettingsTests(SimpleTestCase):
+    """
+    Persistent connections and health checks are configured by default.
+    """
+    def test_defaults(self):
+        default = settings.DATABASES['default']
+        if 'pool' in default['OPTIONS']:
+            self.skipTest('Pooled connections are not persistent.')
+        self.assertEqual(default['CONN_MAX_AGE'], 60)
+        self.assertTrue(default['CONN_HEALTH_CHECKS'])
+
+
+class SQLitePragmaTests(TestCase):
+    """
+    The SQLite pragmas are applied once on every new connection.
+    """
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+
+    def pragma(self, cursor, name):
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+    def test_pragmas_on_file_database(self):
+        directory = tempfile.mkdtemp(prefix='coderr-test-db-')
+        path = os.path.join(directory, 'test.sqlite3')
+        wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': path}, alias='pragma-test')
+        try:
+            with wrapper.cursor() as cursor:
+                self.assertEqual(self.pragma(cursor, 'journal_mode'), 'wal')
+                self.assertEqual(self.pragma(cursor, 'synchronous'), 1)  # NORMAL
+                self.assertEqual(self.pragma(cursor, 'busy_timeout'), settings.SQLITE_PRAGMAS['busy_timeout'])
+                self.assertEqual(self.pragma(cursor, 'cache_size'), settings.SQLITE_PRAGMAS['cache_size'])
+                self.assertEqual(self.pragma(cursor, 'temp_store'), 2)  # MEMORY
+        finally:
+            wrapper.close()
+            shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,77 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from coderr_core.db import retry_on_db_lock, write_transaction
+
+BENCHMARKS = Path(settings.BASE_DIR) / 'benchmarks'
+
+
+@patch('coderr_core.db.time.sleep')
+class RetryOnDbLockTests(TransactionTestCase):
+    """
+    Tests for the retry_on_db_lock and write_transaction decorators.
+    """
+    def test_retries_lock_errors_until_success(self, sleep):
+        func = Mock(side_effect=[OperationalError('database is locked'), OperationalError('database is locked'), 'ok'])
+        self.assertEqual(retry_on_db_lock(func)(), 'ok')
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_gives_up_after_configured_attempts(self, sleep):
+        func = Mock(side_effect=OperationalError('database is locked'))
+        with self.settings(DB_LOCK_RETRY={'ATTEMPTS': 3}):
+            with self.assertRaises(OperationalError):
+                retry_on_db_lock(func)()
+        self.assertEqual(func.call_count, 3)
+
+    def test_other_errors_are_not_retried(self, sleep):
+        func = Mock(side_effect=OperationalError('no such table: foo'))
+        with self.assertRaises(OperationalError):
+            retry_on_db_lock(func)()
+        self.assertEqual(func.call_count, 1)
+
+    def test_no_retry_inside_an_outer_transaction(self, sleep):
+        func = Mock(side_effect=OperationalError('database is locked'))
+        with self.assertRaises(OperationalError), transaction.atomic():
+            retry_on_db_lock(func)()
+        self.assertEqual(func.call_count, 1)
+
+    def test_write_transaction_runs_in_one_atomic_block(self, sleep):
+        calls = []
+
+        @write_transaction
+        def write():
+            calls.append(connection.in_atomic_block)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+            return 'done'
+
+        self.assertEqual(write(), 'done')
+        self.assertEqual(calls, [True, True])
+        self.assertFalse(connection.in_atomic_block)
+
+
+class SQLiteWriteContentionTests(TestCase):
+    """
+    Several processes writing orders and reviews while reading offers
+    must not see "database is locked" errors (see the stress script).
+    """
+    def test_concurrent_workers_without_errors(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        result = subprocess.run(
+            [sys.executable, '-W', 'ignore', str(BENCHMARKS / 'sqlite_write_contention.py'),
+             '--processes', '4', '--iterations', '60'],
+            capture_output=True, text=True, timeout=300, cwd=settings.BASE_DIR,
+        )
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        summary = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual(summary['errors'], 0)
+        self.assertEqual(summary['counter_problems'], [])
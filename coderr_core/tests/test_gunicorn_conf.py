@@ -0,0 +1,86 @@
+import importlib.util
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+CONFIG_PATH = os.path.join(settings.BASE_DIR, 'gunicorn.conf.py')
+
+
+def exec_config():
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', CONFIG_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_config(**env):
+    with patch.dict(os.environ, env):
+        return exec_config()
+
+
+class GunicornConfigTests(SimpleTestCase):
+    """
+    Tests for the worker autotuning in gunicorn.conf.py.
+    """
+    def setUp(self):
+        self.config = load_config()
+
+    def test_defaults(self):
+        self.assertEqual(self.config.worker_class, 'gthread')
+        self.assertEqual(self.config.wsgi_app, 'coderr_core.wsgi:application')
+        self.assertTrue(self.config.preload_app)
+        self.assertGreaterEqual(self.config.workers, 1)
+        self.assertEqual(self.config.threads, 4)
+        self.assertGreater(self.config.max_requests_jitter, 0)
+
+    def test_uvicorn_workers(self):
+        config = load_config(GUNICORN_WORKER_CLASS='uvicorn', WEB_CONCURRENCY='3')
+        self.assertEqual(config.worker_class, 'uvicorn_worker.UvicornWorker')
+        self.assertEqual(config.wsgi_app, 'coderr_core.asgi:application')
+        self.assertEqual((config.workers, config.threads), (3, 1))
+        with self.assertRaises(RuntimeError):
+            load_config(GUNICORN_WORKER_CLASS='eventlet')
+
+    def test_shared_cache_by_default(self):
+        environ = {'WEB_CONCURRENCY': '3'}
+        with patch.object(os, 'environ', environ):
+            exec_config()
+        self.assertEqual(environ, {'WEB_CONCURRENCY': '3', 'CACHE_BACKEND': 'file'})
+        environ = {'CACHE_BACKEND': 'locmem'}
+        with patch.object(os, 'environ', environ):
+            config = exec_config()
+        self.assertEqual(environ['CACHE_BACKEND'], 'locmem')
+        self.assertEqual(environ['WEB_CONCURRENCY'], str(config.workers))
+
+    def test_worker_count(self):
+        gib = 1024 ** 3
+        self.assertEqual(self.config.worker_count(4, 16 * gib, 'gthread'), 9)
+        self.assertEqual(self.config.worker_count(4, 16 * gib, 'uvicorn'), 4)
+        # Memory caps the count: 512 MiB fit three workers of 150 MiB.
+        self.assertEqual(self.config.worker_count(4, gib // 2, 'gthread'), 3)
+        self.assertEqual(self.config.worker_count(4, 0, 'gthread'), 1)
+        self.assertEqual(self.config.worker_count(2, None, 'gthread'), 5)
+
+    def write(self, directory, name, content):
+        path = os.path.join(directory, name)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def test_cgroup_limits(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cpu_max = self.write(directory, 'cpu.max', '150000 100000\n')
+            self.assertEqual(self.config.cgroup_cpu_limit([cpu_max]), 1.5)
+            self.write(directory, 'cpu.max', 'max 100000\n')
+            self.assertIsNone(self.config.cgroup_cpu_limit([cpu_max]))
+            quota = self.write(directory, 'cpu.cfs_quota_us', '50000')
+            self.write(directory, 'cpu.cfs_period_us', '100000')
+            self.assertEqual(self.config.cgroup_cpu_limit([quota]), 0.5)
+
+            memory = self.write(directory, 'memory.max', str(256 * 1024 ** 2))
+            self.assertEqual(self.config.memory_bytes([memory]), 256 * 1024 ** 2)
+            self.write(directory, 'memory.max', 'max')
+            self.assertGreater(self.config.memory_bytes([memory]), 256 * 1024 ** 2)
@@ -0,0 +1,171 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from coderr_core import metrics
+from coderr_core.metrics import MmapValues, collect_values, sample_key
+from offers_app.models import Offer
+from orders_app.models import Order
+from profiles_app.models import Profile
+
+
+def parse(text):
+    """
+    Return {sample with labels: value} of an OpenMetrics exposition.
+    """
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            sample, _, value = line.rpartition(' ')
+            samples[sample] = float(value)
+    return samples
+
+
+class MetricsDirMixin:
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        override = override_settings(METRICS={'DIR': self.directory})
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(metrics.clear)
+
+
+class MetricsEndpointTests(MetricsDirMixin, APITestCase):
+    """
+    Tests for /api/metrics/ and the metrics recorded by the API.
+    """
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.staff = User.objects.create_user('staff', 'staff@example.com', 'pass', is_staff=True)
+        self.biz = User.objects.create_user('biz', 'biz@example.com', 'pass')
+        Profile.objects.create(user=self.biz, type='business')
+        self.customer = User.objects.create_user('cust', 'cust@example.com', 'pass')
+        Profile.objects.create(user=self.customer, type='customer')
+        offer = Offer.objects.create(user=self.biz, title='Logo', description='Design')
+        self.detail = offer.details.create(title='A', revisions=1, delivery_time_in_days=5,
+                                           price=100, features=['X'], offer_type='basic')
+
+    def scrape(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get_or_create(user=self.staff)[0].key)
+        response = self.client.get(reverse('metrics'))
+        self.client.credentials()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        self.assertTrue(response.content.decode().endswith('# EOF\n'))
+        return parse(response.content.decode())
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=self.biz).key)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+    def test_request_latency_and_queries(self):
+        for _ in range(2):
+            self.client.get(reverse('offer-list-create'))
+        samples = self.scrape()
+        labels = 'method="GET",url_name="offer-list-create"'
+        self.assertEqual(samples[f'coderr_request_duration_seconds_count{{{labels}}}'], 2)
+        self.assertEqual(samples[f'coderr_request_duration_seconds_bucket{{{labels},le="+Inf"}}'], 2)
+        self.assertGreater(samples[f'coderr_request_duration_seconds_sum{{{labels}}}'], 0)
+        self.assertGreater(samples['coderr_db_queries_total{url_name="offer-list-create"}'], 0)
+
+        # The second request was answered from the response cache.
+        view = 'view="OfferListCreateView"'
+        self.assertEqual(samples[f'coderr_cache_requests_total{{result="hit",{view}}}'], 1)
+        self.assertEqual(samples[f'coderr_cache_hit_ratio{{{view}}}'], 0.5)
+
+    def test_orders_created_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for status in ('in_progress', 'in_progress', 'completed'):
+                Order.objects.create(customer_user=self.customer, business_user=self.biz,
+                                     offer_detail=self.detail, status=status)
+        samples = self.scrape()
+        self.assertEqual(samples['coderr_orders_created_total{status="in_progress"}'], 2)
+        self.assertEqual(samples['coderr_orders_created_total{status="completed"}'], 1)
+
+    def test_login_failures(self):
+        url = reverse('login')
+        self.client.post(url, {'username': 'cust', 'password': 'wrong'})
+        self.client.post(url, {'username': 'nobody', 'password': 'pass'})
+        self.client.post(url, {'username': 'cust'})
+        self.assertEqual(self.client.post(url, {'username': 'cust', 'password': 'pass'}).status_code, 200)
+        samples = self.scrape()
+        self.assertEqual(samples['coderr_login_failures_total{reason="invalid_credentials"}'], 2)
+        self.assertEqual(samples['coderr_login_failures_total{reason="invalid_request"}'], 1)
+
+    def test_unknown_methods_are_other(self):
+        self.client.generic('PROPFIND', reverse('offer-list-create'))
+        samples = self.scrape()
+        labels = 'method="other",url_name="offer-list-create"'
+        self.assertEqual(samples[f'coderr_request_duration_seconds_count{{{labels}}}'], 1)
+
+    def test_disabled(self):
+        with self.settings(METRICS={'ENABLED': False, 'DIR': self.directory}):
+            self.client.post(reverse('login'), {'username': 'cust', 'password': 'wrong'})
+            self.assertEqual(collect_values(), {})
+
+
+class MetricsStoreTests(MetricsDirMixin, SimpleTestCase):
+    """
+    Tests for the per-process values files and their aggregation.
+    """
+    def test_values_of_all_processes_are_summed(self):
+        metrics.LOGIN_FAILURES.inc(reason='invalid_credentials')
+        script = ("import django; django.setup(); from coderr_core import metrics; "
+                  "metrics.LOGIN_FAILURES.inc(2, reason='invalid_credentials')")
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'coderr_core.settings', 'METRICS_DIR': self.directory}
+        for _ in range(2):
+            subprocess.run([sys.executable, '-c', script], env=env, cwd=settings.BASE_DIR, check=True)
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+        samples = parse(metrics.render())
+        self.assertEqual(samples['coderr_login_failures_total{reason="invalid_credentials"}'], 5)
+
+    def test_dead_processes_are_archived(self):
+        script = ("import django, os; django.setup(); from coderr_core import metrics; "
+                  "metrics.LOGIN_FAILURES.inc(2, reason='invalid_credentials'); print(os.getpid())")
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'coderr_core.settings', 'METRICS_DIR': self.directory}
+        for _ in range(2):
+            result = subprocess.run([sys.executable, '-c', script], env=env, cwd=settings.BASE_DIR, check=True,
+                                    capture_output=True, text=True)
+            metrics.mark_process_dead(int(result.stdout))
+        metrics.mark_process_dead(os.getpid() + 1_000_000)
+        self.assertEqual(sorted(name for name in os.listdir(self.directory) if name.endswith('.db')),
+                         [metrics.ARCHIVE_NAME])
+        samples = parse(metrics.render())
+        self.assertEqual(samples['coderr_login_failures_total{reason="invalid_credentials"}'], 4)
+
+    def test_file_grows_and_reopens(self):
+        path = os.path.join(self.directory, 'values.db')
+        values = MmapValues(path)
+        keys = [sample_key('coderr_test_total', {'n': 'x' * 50 + str(i)}) for i in range(2000)]
+        for key in keys:
+            values.inc(key, 1.5)
+        values.inc(keys[0], 1)
+        self.assertGreater(os.path.getsize(path), MmapValues.initial_size)
+        values.close()
+
+        reopened = MmapValues(path)
+        reopened.inc(keys[-1], 1)
+        collected = collect_values()
+        self.assertEqual(len(collected), 2000)
+        self.assertEqual((collected[keys[0]], collected[keys[1]], collected[keys[-1]]), (2.5, 1.5, 2.5))
+        reopened.close()
+
+    def test_label_escaping(self):
+        metrics.LOGIN_FAILURES.inc(reason='a "b"\\c\n')
+        self.assertIn('coderr_login_failures_total{reason="a \\"b\\"\\\\c\\n"} 1.0', metrics.render())
+        with self.assertRaises(ValueError):
+            metrics.LOGIN_FAILURES.inc(status='x')
@@ -0,0 +1,76 @@
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+
+from profiles_app.models import Profile
+from reviews_app.models import Review
+
+
+class ListPaginationTests(APITestCase):
+    """
+    Tests for the shared pagination layer of the order, review and profile lists.
+    """
+    def setUp(self):
+        """
+        Create one business user reviewed by five customers.
+        """
+        self.biz = User.objects.create_user('biz', 'biz@test.de', 'pw123456')
+        Profile.objects.create(user=self.biz, type='business')
+        self.reviews = []
+        for i in range(5):
+            cust = User.objects.create_user(f'cust{i}', f'cust{i}@test.de', 'pw123456')
+            Profile.objects.create(user=cust, type='customer')
+            self.reviews.append(Review.objects.create(
+                business_user=self.biz, reviewer=cust, rating=i % 3 + 1, description='ok'
+            ))
+        token = Token.objects.create(user=self.biz)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.url = reverse('review-list')
+
+    def test_compat_mode_returns_plain_array(self):
+        """
+        Without page parameters the list keeps its unpaginated array shape.
+        """
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(resp.data, list)
+        self.assertEqual(len(resp.data), 5)
+
+    def test_page_number_mode(self):
+        """
+        ?page_size= switches to a paginated response with count and links.
+        """
+        resp = self.client.get(self.url, {'page_size': 2, 'page': 3})
+        self.assertEqual(resp.data['count'], 5)
+        self.assertEqual(len(resp.data['results']), 1)
+        self.assertIsNone(resp.data['next'])
+
+    @override_settings(LIST_PAGINATION={'PAGE_SIZE': 2, 'MAX_PAGE_SIZE': 3, 'UNPAGINATED_COMPAT': False})
+    def test_configured_sizes_without_compat(self):
+        """
+        With compat disabled lists are always paginated, and page_size is capped.
+        """
+        resp = self.client.get(reverse('customer-profiles'))
+        self.assertEqual(resp.data['count'], 5)
+        self.assertEqual(len(resp.data['results']), 2)
+
+        resp = self.client.get(reverse('customer-profiles'), {'page_size': 50})
+        self.assertEqual(len(resp.data['results']), 3)
+
+    def test_cursor_mode_walks_all_rows(self):
+        """
+        ?pagination=cursor pages by rating with id as tie-breaker.
+        """
+        resp = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 2, 'ordering': 'rating'})
+        ids = []
+        while True:
+            self.assertNotIn('count', resp.data)
+            ids += [r['id'] for r in resp.data['results']]
+            if not resp.data['next']:
+                break
+            resp = self.client.get(resp.data['next'])
+        expected = sorted(self.reviews, key=lambda r: (r.rating, r.id))
+        self.assertEqual(ids, [r.id for r in expected])
@@ -0,0 +1,151 @@
+import os
+import pstats
+import re
+import tempfile
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from coderr_core import profiling
+from coderr_core.profiling import RollingHistogram, get_histogram
+from offers_app.models import Offer
+from profiles_app.models import Profile
+
+SERVER_TIMING = re.compile(
+    r'total;dur=(?P<total>[\d.]+), db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", '
+    r'serialize;dur=(?P<serialize>[\d.]+), render;dur=(?P<render>[\d.]+)$'
+)
+
+
+@override_settings(REQUEST_PROFILING={'ENABLED': True, 'SERVER_TIMING': True})
+class RequestProfilingTests(APITestCase):
+    """
+    Tests for RequestProfilingMiddleware and the per-URL-name statistics.
+    """
+    def setUp(self):
+        cache.clear()
+        get_histogram().clear()
+        self.biz = User.objects.create_user('biz', 'biz@example.com', 'pass')
+        Profile.objects.create(user=self.biz, type='business')
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=self.biz).key)
+        for i in range(3):
+            offer = Offer.objects.create(user=self.biz, title=f'Logo {i}', description='Design')
+            offer.details.create(title='A', revisions=1, delivery_time_in_days=5,
+                                 price=100, features=['X'], offer_type='basic')
+
+    def timing(self, response):
+        match = SERVER_TIMING.match(response['Server-Timing'])
+        self.assertIsNotNone(match, response['Server-Timing'])
+        return {name: float(value) for name, value in match.groupdict().items()}
+
+    def test_server_timing_header(self):
+        """
+        The header reports the queries of the request and its phases.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('offer-list-create'))
+        timing = self.timing(response)
+        self.assertEqual(timing['queries'], len(queries))
+        self.assertGreater(timing['serialize'], 0)
+        self.assertGreater(timing['render'], 0)
+        self.assertGreaterEqual(timing['total'], timing['db'])
+
+    def test_model_serializer_time(self):
+        """
+        DRF serializers are timed as well as the values serializers.
+        """
+        response = self.client.get(reverse('profile-detail', args=[self.biz.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self.timing(response)['serialize'], 0)
+
+    @override_settings(REQUEST_PROFILING={'ENABLED': True, 'SERVER_TIMING': False})
+    def test_header_disabled(self):
+        response = self.client.get(reverse('offer-list-create'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_stats_per_url_name(self):
+        """
+        Samples are summarized per URL name, for staff users only.
+        """
+        for _ in range(3):
+            self.client.get(reverse('offer-list-create'))
+        response = self.client.get(reverse('base-info'))
+        self.assertEqual(self.client.get(reverse('profiling-stats')).status_code, 403)
+
+        self.biz.is_staff = True
+        self.biz.save()
+        stats = self.client.get(reverse('profiling-stats')).json()
+        self.assertEqual(stats['offer-list-create']['count'], 3)
+        self.assertEqual(stats['base-info']['count'], 1)
+        self.assertEqual(stats['base-info']['response_bytes']['max'], len(response.content))
+        self.assertEqual(set(stats['offer-list-create']),
+                         {'count', 'total_ms', 'queries', 'query_ms', 'serialize_ms', 'render_ms', 'response_bytes'})
+        # The first request misses the response cache, the others are hits.
+        self.assertGreater(stats['offer-list-create']['queries']['max'], 0)
+        self.assertEqual(stats['offer-list-create']['queries']['p50'], 0)
+
+    @override_settings(REQUEST_PROFILING={'ENABLED': False, 'SERVER_TIMING': True})
+    def test_disabled(self):
+        response = self.client.get(reverse('offer-list-create'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(get_histogram().summary(), {})
+
+    def test_cprofile_sample(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.settings(REQUEST_PROFILING={'ENABLED': True, 'CPROFILE_SAMPLE_RATE': 1.0,
+                                                  'CPROFILE_DIR': directory}):
+                self.client.get(reverse('offer-list-create'))
+            files = os.listdir(directory)
+            self.assertEqual(len(files), 1)
+            self.assertTrue(files[0].startswith('offer-list-create-'))
+            self.assertGreater(pstats.Stats(os.path.join(directory, files[0])).total_calls, 0)
+
+    def test_one_cprofile_at_a_time(self):
+        """
+        A request sampled while another one is profiled runs unprofiled.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            with self.settings(REQUEST_PROFILING={'ENABLED': True, 'CPROFILE_SAMPLE_RATE': 1.0,
+                                                  'CPROFILE_DIR': directory}):
+                with profiling._cprofile_lock:
+                    response = self.client.get(reverse('offer-list-create'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(os.listdir(directory), [])
+
+    @override_settings(REQUEST_PROFILING={})
+    def test_off_by_default(self):
+        response = self.client.get(reverse('offer-list-create'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(get_histogram().summary(), {})
+
+    def test_async_request(self):
+        """
+        Queries of the sync parts of an async view are counted.
+        """
+        with self.settings(ROOT_URLCONF='coderr_core.asgi_urls'):
+            response = async_to_sync(self.async_client.get)(reverse('base-info'))
+        timing = self.timing(response)
+        self.assertGreater(timing['queries'], 0)
+        self.assertEqual(get_histogram().summary()['base-info']['count'], 1)
+
+
+class RollingHistogramTests(SimpleTestCase):
+    """
+    Tests for the rolling window summary.
+    """
+    def test_window_and_percentiles(self):
+        histogram = RollingHistogram(window=100)
+        for i in range(150):
+            histogram.add('offer-list-create', (i / 1000, i, 0.0, 0.0, 0.0, None))
+        stats = histogram.summary()['offer-list-create']
+        self.assertEqual(stats['count'], 100)
+        self.assertEqual(stats['queries'], {'mean': 99.5, 'p50': 100, 'p95': 145, 'p99': 149, 'max': 149})
+        self.assertEqual(stats['total_ms']['max'], 149)
+        self.assertNotIn('response_bytes', stats)
@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from unittest import skipUnless
+
+from offers_app.api.views import OfferListCreateView
+from orders_app.api.views import OrderListCreateView
+from orders_app.models import Order, OrderStatusCount
+from profiles_app.api.views import BusinessProfileListView, CustomerProfileListView
+from reviews_app.api.views import ReviewListCreateView
+
+
+@skipUnless(connection.vendor == 'sqlite', "Query plans are checked against SQLite.")
+class HotQueryPlanTests(TestCase):
+    """
+    Run EXPLAIN QUERY PLAN on the hot queries of the API and assert that
+    SQLite answers each of them from the expected index. List queries are
+    built by the views themselves (get_queryset() and their filters) for a
+    request of ``user``, so changes to the views are covered as well.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('biz', 'biz@test.de', 'pw123456')
+
+    def view_queryset(self, view_class, params=None):
+        """
+        Return the filtered queryset ``view_class`` lists for a GET request
+        of ``self.user`` with the query ``params``.
+        """
+        view = view_class()
+        request = APIRequestFactory().get('/', params)
+        view.setup(request)
+        view.request = view.initialize_request(request)
+        view.request.user = self.user
+        view.format_kwarg = None
+        return view.filter_queryset(view.get_queryset())
+
+    def assertUsesIndex(self, queryset, *index_names):
+        plan = queryset.explain()
+        for index_name in index_names:
+            self.assertIn(f'INDEX {index_name}', plan, plan)
+
+    def test_order_counts(self):
+        self.assertUsesIndex(
+            Order.objects.filter(business_user=self.user, status='in_progress'),
+            'order_biz_status_idx',
+        )
+        self.assertUsesIndex(OrderStatusCount.counts_queryset([self.user.pk]),
+                             'orders_app_orderstatuscount_business_user_id')
+
+    def test_order_list(self):
+        """
+        Orders of the user as customer OR business: one index per branch.
+        """
+        queryset = self.view_queryset(OrderListCreateView)
+        self.assertUsesIndex(queryset, 'order_cust_created_idx', 'order_biz_created_idx')
+        self.assertIn('MULTI-INDEX OR', queryset.explain())
+        self.assertUsesIndex(queryset.order_by('-created_at'), 'order_cust_created_idx', 'order_biz_created_idx')
+
+    def test_review_lists(self):
+        self.assertUsesIndex(self.view_queryset(ReviewListCreateView, {'business_user_id': self.user.pk}),
+                             'review_biz_updated_idx')
+        self.assertUsesIndex(self.view_queryset(ReviewListCreateView, {'reviewer_id': self.user.pk}),
+                             'review_reviewer_updated_idx')
+        self.assertUsesIndex(self.view_queryset(ReviewListCreateView), 'review_updated_idx')
+
+    def test_profile_lists(self):
+        self.assertUsesIndex(self.view_queryset(BusinessProfileListView), 'profile_type_idx')
+        self.assertUsesIndex(self.view_queryset(CustomerProfileListView), 'profile_type_idx')
+
+    def test_offer_lists(self):
+        self.assertUsesIndex(self.view_queryset(OfferListCreateView, {'ordering': '-updated_at'})[:6],
+                             'offer_updated_idx')
+        self.assertUsesIndex(
+            self.view_queryset(OfferListCreateView, {'creator_id': self.user.pk, 'ordering': '-updated_at'}),
+            'offer_user_updated_idx',
+        )
+        self.assertUsesIndex(self.view_queryset(OfferListCreateView, {'ordering': 'min_price'})[:6],
+                             'offers_app_offer_min_price')
@@ -0,0 +1,159 @@
+import datetime
+import decimal
+import io
+import timeit
+import uuid
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from coderr_core.api import parsers, renderers
+from coderr_core.api.parsers import ORJSONParser
+from coderr_core.api.renderers import ORJSONRenderer
+from offers_app.models import Offer
+from orders_app.models import Order
+from profiles_app.models import Profile
+
+RAW_VALUES = {
+    'datetime': datetime.datetime(2025, 7, 1, 12, 30, 45, 123456, tzinfo=datetime.timezone.utc),
+    'naive_datetime': datetime.datetime(2025, 7, 1, 12, 30, 45),
+    'date': datetime.date(2025, 7, 1),
+    'time': datetime.time(8, 15, 0, 500),
+    'decimal': decimal.Decimal('150.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'lazy': gettext_lazy('Not found.'),
+    'features': ['Logo Design', 'Visitenkarte', 'Grüße ✓', 'line\u2028break\u2029end'],
+    'numbers': [0, -1, 2 ** 40, 1.5, 150.0, 0.1, 1e-3, 12345.678],
+    'int_keys': {1: 'a', 2: 'b'},
+    'tuple': (1, 'two'),
+    'nested': {'empty': {}, 'none': None, 'flags': [True, False]},
+    'big_int': 2 ** 70,
+}
+
+
+def orjson_render(data, media_type='application/json'):
+    return ORJSONRenderer().render(data, media_type, {})
+
+
+def stdlib_render(data, media_type='application/json'):
+    return JSONRenderer().render(data, media_type, {})
+
+
+class ORJSONRendererTests(APITestCase):
+    """
+    ORJSONRenderer must produce the same bytes as DRF's JSONRenderer.
+    """
+    def test_raw_types_match_stdlib(self):
+        for name, value in RAW_VALUES.items():
+            with self.subTest(name=name):
+                self.assertEqual(orjson_render(value), stdlib_render(value))
+        self.assertEqual(orjson_render(RAW_VALUES), stdlib_render(RAW_VALUES))
+
+    def test_indented_and_empty_output(self):
+        self.assertEqual(orjson_render({'a': [1]}, 'application/json; indent=4'),
+                         stdlib_render({'a': [1]}, 'application/json; indent=4'))
+        self.assertEqual(orjson_render(None), b'')
+
+    def test_fallback_without_orjson(self):
+        with patch.object(renderers, 'orjson', None):
+            self.assertEqual(orjson_render(RAW_VALUES), stdlib_render(RAW_VALUES))
+            streamed = b''.join(ORJSONRenderer().render_stream(iter([RAW_VALUES]), 'application/json', {}))
+        self.assertEqual(streamed, stdlib_render([RAW_VALUES]))
+
+    def test_render_stream_matches(self):
+        rows = [RAW_VALUES, {'id': 2}]
+        streamed = b''.join(ORJSONRenderer().render_stream(iter(rows), 'application/json', {}))
+        self.assertEqual(streamed, stdlib_render(rows))
+
+
+class ORJSONEndpointTests(APITestCase):
+    """
+    Real endpoint payloads render identically with both renderers.
+    """
+    def setUp(self):
+        self.biz = User.objects.create_user('biz', 'biz@example.com', 'pass')
+        Profile.objects.create(user=self.biz, type='business')
+        self.cust = User.objects.create_user('cust', 'cust@example.com', 'pass')
+        Profile.objects.create(user=self.cust, type='customer')
+        offer = Offer.objects.create(user=self.biz, title='Logo', description='Design – ✓')
+        self.detail = offer.details.create(
+            title='Basic', revisions=2, delivery_time_in_days=5,
+            price=99.9, features=['Logo', 'Grüße'], offer_type='basic'
+        )
+        Order.objects.create(customer_user=self.cust, business_user=self.biz, offer_detail=self.detail)
+        token = Token.objects.create(user=self.cust)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_offer_and_order_payloads(self):
+        for url in (reverse('offer-list-create'), reverse('order-list'),
+                    reverse('offerdetail-detail', kwargs={'pk': self.detail.pk})):
+            with self.subTest(url=url):
+                data = self.client.get(url).data
+                self.assertEqual(orjson_render(data), stdlib_render(data))
+
+    def test_default_renderer_is_orjson(self):
+        response = self.client.get(reverse('order-list'))
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(response.content, stdlib_render(response.data))
+
+
+class ORJSONParserTests(APITestCase):
+    """
+    ORJSONParser must return the same data as DRF's JSONParser.
+    """
+    body = '{"title": "Grüße", "price": 1.5, "features": ["a"], "n": 12, "big": %d}' % 2 ** 70
+
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser.parse(io.BytesIO(body.encode(encoding)), 'application/json', {'encoding': encoding})
+
+    def test_same_result_as_json_parser(self):
+        self.assertEqual(self.parse(ORJSONParser(), self.body), self.parse(JSONParser(), self.body))
+        with patch.object(parsers, 'orjson', None):
+            self.assertEqual(self.parse(ORJSONParser(), self.body), self.parse(JSONParser(), self.body))
+
+    def test_other_charsets_use_json_parser(self):
+        self.assertEqual(self.parse(ORJSONParser(), self.body, 'utf-16'),
+                         self.parse(JSONParser(), self.body, 'utf-16'))
+
+    def test_invalid_json_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(ORJSONParser(), '{"title": ')
+
+
+@skipUnless(renderers.orjson, 'orjson is not installed')
+class ORJSONMicrobenchmarkTests(APITestCase):
+    """
+    Microbenchmark: orjson vs. the stdlib encoder on an offer-list-sized page.
+    """
+    def payload(self):
+        return {
+            'count': 1000, 'next': 'http://testserver/api/offers/?page=2', 'previous': None,
+            'results': [{
+                'id': i, 'user': i % 7, 'title': f'Offer {i}', 'image': None,
+                'description': 'Professional logo design for your business ' * 3,
+                'created_at': '2025-07-01T12:30:45.123456Z', 'updated_at': '2025-07-02T08:00:00Z',
+                'details': [{'id': i * 3 + k, 'url': f'http://testserver/api/offerdetails/{i * 3 + k}/'}
+                            for k in range(3)],
+                'min_price': 49.99 + i, 'min_delivery_time': 3,
+                'user_details': {'first_name': 'Max', 'last_name': 'Müller', 'username': f'user{i}'},
+            } for i in range(100)],
+        }
+
+    def test_orjson_is_faster(self):
+        data = self.payload()
+        orjson_renderer, stdlib_renderer = ORJSONRenderer(), JSONRenderer()
+        self.assertEqual(orjson_renderer.render(data), stdlib_renderer.render(data))
+
+        fast = min(timeit.repeat(lambda: orjson_renderer.render(data), number=50, repeat=5))
+        slow = min(timeit.repeat(lambda: stdlib_renderer.render(data), number=50, repeat=5))
+        print(f'\nrender 100 offers x50: orjson {fast * 1000:.1f} ms, stdlib {slow * 1000:.1f} ms '
+              f'({slow / fast:.1f}x)')
+        self.assertLess(fast, slow)
@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from offers_app.models import Offer
+from profiles_app.models import Profile
+from reviews_app.models import Review
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'], DATABASE_REPLICA_PIN_SECONDS=5)
+class ReplicaStickinessTests(TransactionTestCase):
+    """
+    Read-your-writes with a lagging replica: a second SQLite file holds a
+    snapshot of the primary taken in setUp. Clients that just wrote read
+    from the primary, everybody else keeps reading the stale snapshot.
+    """
+    databases = {'default', 'replica_1'}
+
+    @classmethod
+    def setUpClass(cls):
+        handle, cls.replica_path = tempfile.mkstemp(prefix='coderr-replica-', suffix='.sqlite3')
+        os.close(handle)
+        connections.settings['replica_1'] = connections.configure_settings({
+            'default': settings.DATABASES['default'],
+            'replica_1': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': cls.replica_path},
+        })['replica_1']
+        super().setUpClass()
+        # The schema, so the replica can be flushed after every test.
+        cls.snapshot_replica()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica_1'].close()
+        del connections['replica_1']
+        del connections.settings['replica_1']
+        os.remove(cls.replica_path)
+
+    def setUp(self):
+        cache.clear()
+        self.business = User.objects.create_user('biz', 'biz@example.com', 'pass')
+        Profile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user('cust', 'cust@example.com', 'pass')
+        Profile.objects.create(user=self.customer, type='customer')
+        self.offer = Offer.objects.create(user=self.business, title='Logo Design', description='Logos')
+        for offer_type in ('basic', 'standard', 'premium'):
+            self.offer.details.create(title=offer_type.title(), revisions=1, delivery_time_in_days=5,
+                                      price=100, features=['Logo'], offer_type=offer_type)
+        self.detail = self.offer.details.get(offer_type='basic')
+        self.customer_client = self.client_for(self.customer)
+        self.business_client = self.client_for(self.business)
+        self.snapshot_replica()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        return client
+
+    @classmethod
+    def snapshot_replica(cls):
+        """
+        Copy the primary into the replica file, like a replication step.
+        """
+        connections['replica_1'].close()
+        target = sqlite3.connect(cls.replica_path)
+        try:
+            connections['default'].ensure_connection()
+            connections['default'].connection.backup(target)
+        finally:
+            target.close()
+
+    def test_reads_come_from_replica(self):
+        self.detail.title = 'Renamed'
+        self.detail.save()
+        cache.clear()
+        response = self.business_client.get(reverse('offerdetail-detail', args=[self.detail.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'Basic')
+
+    def test_no_replica_reads_without_shared_cache(self):
+        """
+        With several workers and per-process pins, everything reads from the primary.
+        """
+        self.detail.title = 'Renamed'
+        self.detail.save()
+        cache.clear()
+        with self.settings(WEB_CONCURRENCY=4):
+            response = self.business_client.get(reverse('offerdetail-detail', args=[self.detail.pk]))
+        self.assertEqual(response.data['title'], 'Renamed')
+
+    def test_writer_reads_own_writes(self):
+        response = self.customer_client.post(reverse('review-list'), {
+            'business_user': self.business.pk, 'rating': 5, 'description': 'Great'}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        # The business did not write: replica (and a cached replica response).
+        self.assertEqual(len(self.business_client.get(reverse('review-list')).data), 0)
+        # The customer is pinned to the primary and bypasses that cache entry.
+        response = self.customer_client.get(reverse('review-list'))
+        self.assertEqual([review['id'] for review in response.data], [Review.objects.get().pk])
+        base_info = self.customer_client.get(reverse('base-info'))
+        self.assertEqual(base_info.data['review_count'], 1)
+
+    def test_order_pins_customer(self):
+        response = self.customer_client.post(reverse('order-list'), {'offer_detail_id': self.detail.pk},
+                                             format='json')
+        self.assertEqual(response.status_code, 201)
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description='Ok')
+        self.assertEqual(len(self.customer_client.get(reverse('review-list')).data), 1)
+        self.assertEqual(len(self.business_client.get(reverse('review-list')).data), 0)
+
+    def test_failed_writes_do_not_pin(self):
+        response = self.customer_client.post(reverse('review-list'), {'rating': 9}, format='json')
+        self.assertEqual(response.status_code, 400)
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description='Ok')
+        self.assertEqual(len(self.customer_client.get(reverse('review-list')).data), 0)
+
+    def test_pin_expires(self):
+        with self.settings(DATABASE_REPLICA_PIN_SECONDS=0):
+            response = self.customer_client.post(reverse('review-list'), {
+                'business_user': self.business.pk, 'rating': 5, 'description': 'Great'}, format='json')
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(len(self.customer_client.get(reverse('review-list')).data), 0)
+
+    def test_new_token_authenticates_against_primary(self):
+        """
+        A token created after the snapshot is only on the primary.
+        """
+        Token.objects.filter(user=self.customer).delete()
+        response = self.client_for(self.customer).get(reverse('offerdetail-detail', args=[self.detail.pk]))
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,157 @@
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from coderr_core.cache import get_cache_stats
+from offers_app.models import Offer
+from profiles_app.models import Profile
+from reviews_app.models import Review
+
+
+class ResponseCacheTests(APITestCase):
+    """
+    Tests for the per-view response cache and its signal-driven invalidation.
+    """
+    def setUp(self):
+        cache.clear()
+        self.biz = User.objects.create_user('biz', 'biz@example.com', 'pass')
+        Profile.objects.create(user=self.biz, type='business')
+        self.cust = User.objects.create_user('cust', 'cust@example.com', 'pass')
+        Profile.objects.create(user=self.cust, type='customer')
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=self.cust).key)
+        self.offer = Offer.objects.create(user=self.biz, title='Logo', description='Design')
+        self.detail = self.offer.details.create(
+            title='A', revisions=1, delivery_time_in_days=5,
+            price=100, features=['X'], offer_type='basic'
+        )
+
+    def test_offer_list_hit_and_invalidation(self):
+        """
+        A repeated list request is a hit; creating an offer invalidates it.
+        """
+        url = reverse('offer-list-create')
+        first = self.client.get(url)
+        second = self.client.get(url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json(), second.json())
+
+        Offer.objects.create(user=self.biz, title='Web', description='Site')
+        third = self.client.get(url)
+        self.assertEqual(third['X-Cache'], 'MISS')
+        self.assertEqual(third.json()['count'], 2)
+
+    def test_query_params_are_part_of_the_key(self):
+        """
+        Different query strings are cached separately; parameter order does not matter.
+        """
+        url = reverse('offer-list-create')
+        self.client.get(url, {'search': 'logo', 'ordering': 'min_price'})
+        same = self.client.get(url + '?ordering=min_price&search=logo')
+        other = self.client.get(url, {'search': 'web'})
+        self.assertEqual(same['X-Cache'], 'HIT')
+        self.assertEqual(other['X-Cache'], 'MISS')
+
+    def test_detail_change_invalidates_offer_retrieve(self):
+        """
+        Saving an OfferDetail invalidates the cached offer and detail views.
+        """
+        offer_url = reverse('offer-detail', kwargs={'pk': self.offer.pk})
+        detail_url = reverse('offerdetail-detail', kwargs={'pk': self.detail.pk})
+        self.client.get(offer_url)
+        self.client.get(detail_url)
+        self.assertEqual(self.client.get(detail_url)['X-Cache'], 'HIT')
+
+        self.detail.price = 50
+        self.detail.save()
+        offer = self.client.get(offer_url)
+        detail = self.client.get(detail_url)
+        self.assertEqual(offer['X-Cache'], 'MISS')
+        self.assertEqual(offer.json()['min_price'], 50)
+        self.assertEqual(detail.json()['price'], 50)
+
+    def test_unauthenticated_requests_are_not_served_from_cache(self):
+        """
+        Permission checks run before the cache lookup.
+        """
+        url = reverse('business-profiles')
+        self.client.get(url)
+        self.client.credentials()
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+    def test_profile_and_review_changes_invalidate(self):
+        """
+        Profile changes drop profile lists; reviews drop base-info.
+        """
+        profiles_url = reverse('business-profiles')
+        self.client.get(profiles_url)
+        profile = Profile.objects.get(user=self.biz)
+        profile.location = 'Berlin'
+        profile.save()
+        response = self.client.get(profiles_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()[0]['location'], 'Berlin')
+
+        info_url = reverse('base-info')
+        self.client.get(info_url)
+        self.assertEqual(self.client.get(info_url)['X-Cache'], 'HIT')
+        Review.objects.create(business_user=self.biz, reviewer=self.cust, rating=5, description='Top')
+        response = self.client.get(info_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['review_count'], 1)
+
+    def test_cached_base_info_honours_etag(self):
+        """
+        A cache hit still answers If-None-Match with 304.
+        """
+        url = reverse('base-info')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_cache_stats(self):
+        """
+        Hits and misses are counted per view and exposed to staff only.
+        """
+        url = reverse('customer-profiles')
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(get_cache_stats()['CustomerProfileListView'],
+                         {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+        stats_url = reverse('cache-stats')
+        self.assertEqual(self.client.get(stats_url).status_code, 403)
+        self.cust.is_staff = True
+        self.cust.save()
+        response = self.client.get(stats_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('OfferListCreateView', response.json())
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': tempfile.mkdtemp(prefix='coderr-cache-'),
+    }
+})
+class FileBasedResponseCacheTests(APITestCase):
+    """
+    The response cache works unchanged on the file-based backend.
+    """
+    def test_hit_and_invalidation(self):
+        cache.clear()
+        user = User.objects.create_user('biz', 'biz@example.com', 'pass')
+        Profile.objects.create(user=user, type='business')
+        url = reverse('base-info')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        Offer.objects.create(user=user, title='Logo', description='Design')
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['offer_count'], 1)
@@ -0,0 +1,95 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from coderr_core.api.renderers import StreamingJSONRenderer
+from profiles_app.api.views import CustomerProfileListView
+from profiles_app.models import Profile
+from reviews_app.api.views import ReviewListCreateView
+from reviews_app.models import Review
+
+
+class StreamingJSONRendererTests(APITestCase):
+    """
+    The streamed encoding must match JSONRenderer byte for byte.
+    """
+    def test_render_stream_matches_render(self):
+        data = [
+            {'id': 1, 'text': 'Grüße     "quoted"', 'price': 1.5, 'tags': []},
+            {'id': 2, 'text': None, 'nested': {'a': [1, 2]}},
+        ]
+        renderer = StreamingJSONRenderer()
+        renderer.chunk_size = 16
+        for rows in ([], data[:1], data):
+            streamed = b''.join(renderer.render_stream(iter(rows), 'application/json', {}))
+            self.assertEqual(streamed, JSONRenderer().render(rows, 'application/json', {}))
+
+    def test_indented_output_falls_back_to_render(self):
+        data = [{'id': 1}, {'id': 2}]
+        streamed = b''.join(StreamingJSONRenderer().render_stream(iter(data), 'application/json; indent=2', {}))
+        self.assertEqual(streamed, JSONRenderer().render(data, 'application/json; indent=2', {}))
+
+
+class StreamingListTests(APITestCase):
+    """
+    Tests for StreamingListMixin on the unpaginated list endpoints.
+    """
+    def setUp(self):
+        self.customers = []
+        business = User.objects.create_user('biz', 'biz@example.com', 'pass')
+        Profile.objects.create(user=business, type='business', location='Köln')
+        for i in range(7):
+            customer = User.objects.create_user(f'cust{i}', f'cust{i}@example.com', 'pass')
+            Profile.objects.create(user=customer, type='customer')
+            Review.objects.create(business_user=business, reviewer=customer,
+                                  rating=i % 5 + 1, description=f'Review {i} ✓')
+            self.customers.append(customer)
+        token = Token.objects.create(user=self.customers[0])
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def buffered(self, view, url, params=None):
+        with patch.object(view, 'stream_list', False):
+            response = self.client.get(url, params)
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+        return response.content
+
+    def test_large_list_is_streamed_identically(self):
+        url = reverse('review-list')
+        expected = self.buffered(ReviewListCreateView, url, {'ordering': 'rating'})
+        with patch.object(ReviewListCreateView, 'stream_chunk_size', 3):
+            response = self.client.get(url, {'ordering': 'rating'})
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(b''.join(response.streaming_content), expected)
+
+    def test_short_list_is_a_regular_response(self):
+        response = self.client.get(reverse('review-list'))
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(len(response.data), 7)
+
+    def test_paginated_list_is_not_streamed(self):
+        with patch.object(ReviewListCreateView, 'stream_chunk_size', 3):
+            response = self.client.get(reverse('review-list'), {'page_size': 2})
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response.data['count'], 7)
+
+    def test_streamed_profile_list_is_not_cached(self):
+        """
+        Streamed responses bypass the response cache but keep the same body.
+        """
+        url = reverse('customer-profiles')
+        expected = self.buffered(CustomerProfileListView, url)
+        cache.clear()
+        with patch.object(CustomerProfileListView, 'stream_chunk_size', 3):
+            first = self.client.get(url)
+            second = self.client.get(url)
+        self.assertIsInstance(first, StreamingHttpResponse)
+        self.assertEqual(second['X-Cache'], 'MISS')
+        self.assertEqual(b''.join(first.streaming_content), expected)
+        self.assertEqual(b''.join(second.streaming_content), expected)
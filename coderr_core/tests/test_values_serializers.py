@@ -0,0 +1,147 @@
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from offers_app.api.serializers import OfferListSerializer, OfferListValuesSerializer
+from offers_app.api.views import OfferListCreateView
+from offers_app.models import Offer
+from orders_app.api.serializers import OrderSerializer, OrderValuesSerializer
+from orders_app.api.views import OrderListCreateView
+from orders_app.models import Order
+from profiles_app.api.serializers import BusinessProfileListSerializer, BusinessProfileListValuesSerializer
+from profiles_app.api.views import BusinessProfileListView, CustomerProfileListView
+from profiles_app.models import Profile
+from reviews_app.api.serializers import ReviewSerializer, ReviewValuesSerializer
+from reviews_app.api.views import ReviewListCreateView
+from reviews_app.models import Review
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix='coderr-test-media-')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ValuesSerializerContractTests(APITestCase):
+    """
+    The values serializers must produce exactly the output of the model
+    serializers they replace, for every list endpoint and pagination mode.
+    """
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.businesses = []
+        for i in range(3):
+            user = User.objects.create_user(f'biz{i}', f'biz{i}@example.com', 'pass',
+                                            first_name=f'Max{i}', last_name='Müller')
+            Profile.objects.create(
+                user=user, type='business', location='Köln', tel='0221 123',
+                file=SimpleUploadedFile(f'logo{i}.png', b'png') if i else None,
+            )
+            self.businesses.append(user)
+        self.customer = User.objects.create_user('cust', 'cust@example.com', 'pass')
+        Profile.objects.create(user=self.customer, type='customer', file=SimpleUploadedFile('me.png', b'png'))
+
+        for i, business in enumerate(self.businesses * 2):
+            offer = Offer.objects.create(
+                user=business, title=f'Logo Design {i}', description='Design – ✓',
+                image=SimpleUploadedFile(f'offer{i}.png', b'png') if i % 2 else None,
+            )
+            for offer_type, price in (('basic', 99.9 + i), ('standard', 150), ('premium', 300.555)):
+                offer.details.create(title=offer_type.title(), revisions=i, delivery_time_in_days=7 - i,
+                                     price=price, features=['Logo', 'Grüße'], offer_type=offer_type)
+            detail = offer.details.get(offer_type='basic')
+            Order.objects.create(customer_user=self.customer, business_user=business, offer_detail=detail,
+                                 status='completed' if i % 2 else 'in_progress')
+        for i, business in enumerate(self.businesses):
+            Review.objects.create(business_user=business, reviewer=self.customer,
+                                  rating=i + 3, description=f'Review {i} "quoted"')
+        self.client.force_authenticate(self.customer)
+
+    def assertSameResponses(self, view, url, params=None):
+        """
+        Compare the bodies with and without the values serializer.
+        """
+        with patch.object(view, 'values_serializer_class', None):
+            expected = self.client.get(url, params)
+        cache.clear()
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    def test_list_endpoints_match(self):
+        cases = [
+            (OfferListCreateView, 'offer-list-create',
+             [{}, {'page_size': 2, 'page': 2}, {'ordering': 'min_price'}, {'search': 'design'},
+              {'creator_id': self.businesses[1].pk}, {'pagination': 'cursor', 'page_size': 2}]),
+            (OrderListCreateView, 'order-list',
+             [{}, {'page_size': 4}, {'pagination': 'cursor', 'page_size': 2, 'ordering': 'updated_at'}]),
+            (ReviewListCreateView, 'review-list',
+             [{}, {'ordering': 'rating'}, {'business_user_id': self.businesses[0].pk},
+              {'pagination': 'cursor', 'page_size': 1, 'ordering': '-rating'}]),
+            (BusinessProfileListView, 'business-profiles',
+             [{}, {'page_size': 2}, {'pagination': 'cursor', 'page_size': 2, 'ordering': 'created_at'}]),
+            (CustomerProfileListView, 'customer-profiles', [{}]),
+        ]
+        for view, name, param_sets in cases:
+            for params in param_sets:
+                with self.subTest(view=view.__name__, params=params):
+                    self.assertSameResponses(view, reverse(name), params)
+
+    def test_cursor_links_match(self):
+        """
+        Following the next links of both modes visits the same pages.
+        """
+        url, params = reverse('offer-list-create'), {'pagination': 'cursor', 'page_size': 2}
+        while url:
+            response = self.assertSameResponses(OfferListCreateView, url, params)
+            url, params = response.data['next'], None
+
+    def test_streamed_list_matches(self):
+        url = reverse('order-list')
+        with patch.object(OrderListCreateView, 'stream_chunk_size', 4):
+            with patch.object(OrderListCreateView, 'values_serializer_class', None):
+                expected = b''.join(self.client.get(url).streaming_content)
+            streamed = b''.join(self.client.get(url).streaming_content)
+        self.assertEqual(streamed, expected)
+
+    def test_serializers_match_directly(self):
+        """
+        Field-by-field comparison outside the views, with a request context
+        (absolute file URLs) and without one (relative URLs).
+        """
+        request = APIRequestFactory().get('/')
+        cases = [
+            (OfferListSerializer, OfferListValuesSerializer, Offer.objects.all()),
+            (OrderSerializer, OrderValuesSerializer, Order.objects.all()),
+            (ReviewSerializer, ReviewValuesSerializer, Review.objects.all()),
+            (BusinessProfileListSerializer, BusinessProfileListValuesSerializer, Profile.objects.all()),
+        ]
+        for serializer_class, values_class, queryset in cases:
+            for context in ({'request': request}, {}):
+                with self.subTest(serializer=serializer_class.__name__, context=bool(context)):
+                    queryset = queryset.order_by('pk')
+                    expected = serializer_class(queryset, many=True, context=context).data
+                    rows = values_class.prepare(queryset)
+                    self.assertEqual(values_class(rows, many=True, context=context).data, expected)
+                    self.assertEqual(values_class(rows[0], context=context).data, expected[0])
+
+    def test_offer_page_queries(self):
+        """
+        An offer page is read with one query for the rows and one for the
+        detail ids, like the prefetching model serializer.
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('offer-list-create'))
+        self.assertEqual(len(ctx.captured_queries), 3)
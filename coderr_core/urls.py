@@ -17,12 +17,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 
-from user_auth_app.api.views import RegistrationView, CustomLoginView
+from user_auth_app.api.views import RegistrationView, CustomLoginView, LogoutView
 from profiles_app.api.views import ProfileDetailView, BusinessProfileListView, CustomerProfileListView
-from offers_app.api.views import OfferListCreateView, OfferRetrieveUpdateDestroyView, OfferDetailRetrieveView
-from orders_app.api.views import OrderListCreateView, OrderRetrieveUpdateDestroyView, OrderCountView, CompletedOrderCountView
+from offers_app.api.views import OfferListCreateView, OfferRetrieveUpdateDestroyView, OfferDetailRetrieveView, OfferBulkView
+from orders_app.api.views import OrderListCreateView, OrderRetrieveUpdateDestroyView, OrderCountView, CompletedOrderCountView, OrderStatusCountsView
 from reviews_app.api.views import ReviewListCreateView, ReviewRetrieveUpdateDestroyView
-from coderr_core.api.views import BaseInfoView
+from coderr_core.api.views import BaseInfoView, CacheStatsView, MetricsView, ProfilingStatsView
 
 from django.conf.urls.static import static
 from coderr_core import settings
@@ -33,12 +33,14 @@ urlpatterns = [
 
     path('api/registration/', RegistrationView.as_view(), name='registration'),
     path('api/login/', CustomLoginView.as_view(), name='login'),
+    path('api/logout/', LogoutView.as_view(), name='logout'),
 
     path('api/profile/<int:pk>/', ProfileDetailView.as_view(), name='profile-detail'),
     path('api/profiles/business/', BusinessProfileListView.as_view(), name='business-profiles'),
     path('api/profiles/customer/', CustomerProfileListView.as_view(), name='customer-profiles'),
 
     path('api/offers/', OfferListCreateView.as_view(), name='offer-list-create'),
+    path('api/offers/bulk/', OfferBulkView.as_view(), name='offer-bulk'),
     path('api/offers/<int:pk>/', OfferRetrieveUpdateDestroyView.as_view(), name='offer-detail'),
     path('api/offerdetails/<int:pk>/', OfferDetailRetrieveView.as_view(), name='offerdetail-detail'),
 
@@ -46,9 +48,13 @@ urlpatterns = [
     path('api/orders/<int:pk>/', OrderRetrieveUpdateDestroyView.as_view(), name='order-detail'),
     path('api/order-count/<int:business_user_id>/', OrderCountView.as_view(), name='order-count'),
     path('api/completed-order-count/<int:business_user_id>/', CompletedOrderCountView.as_view(), name='completed-order-count'),
+    path('api/order-counts/', OrderStatusCountsView.as_view(), name='order-counts'),
 
     path('api/reviews/', ReviewListCreateView.as_view(), name='review-list'),
     path('api/reviews/<int:pk>/', ReviewRetrieveUpdateDestroyView.as_view(), name='review-detail'),
 
     path('api/base-info/', BaseInfoView.as_view(), name='base-info'),
+    path('api/cache-stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('api/profiling-stats/', ProfilingStatsView.as_view(), name='profiling-stats'),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ] + staticfiles_urlpatterns()
@@ -0,0 +1,180 @@
+"""
+Gunicorn configuration for production.
+
+gunicorn picks this file up from the working directory, so
+``gunicorn`` alone (or ``gunicorn --config gunicorn.conf.py``) starts the
+API. Settings come from the environment:
+
+    GUNICORN_WORKER_CLASS   "gthread" (default): coderr_core.wsgi with threads
+                            "uvicorn": coderr_core.asgi with async views
+    WEB_CONCURRENCY         worker processes; default from CPUs and memory
+    GUNICORN_THREADS        threads per gthread worker (default 4)
+    GUNICORN_WORKER_MEMORY_MB
+                            memory budgeted per worker (default 150)
+    GUNICORN_BIND           address (default 0.0.0.0:8000)
+    GUNICORN_TIMEOUT, GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_KEEPALIVE
+    GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER
+    CACHE_BACKEND           defaults to "file" here, so all workers share the
+                            API cache and its invalidations
+
+Workers default to 2 * CPUs + 1 for gthread and one per CPU for uvicorn
+(each runs an event loop), but never more than fit into the available
+memory. CPUs and memory respect container (cgroup) limits.
+"""
+import math
+import os
+
+CGROUP_CPU_FILES = ('/sys/fs/cgroup/cpu.max', '/sys/fs/cgroup/cpu/cpu.cfs_quota_us')
+CGROUP_MEMORY_FILES = ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes')
+
+WORKER_CLASSES = {
+    'gthread': ('gthread', 'coderr_core.wsgi:application'),
+    'uvicorn': ('uvicorn_worker.UvicornWorker', 'coderr_core.asgi:application'),
+}
+
+
+def read_file(path):
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit(paths=CGROUP_CPU_FILES):
+    """
+    Return the CPU quota of the container in (possibly fractional) CPUs,
+    or None without a limit. Reads cgroup v2 ``cpu.max`` ("quota period")
+    or the cgroup v1 quota and period files.
+    """
+    for path in paths:
+        content = read_file(path)
+        if not content:
+            continue
+        if path.endswith('cpu.max'):
+            quota, _, period = content.partition(' ')
+        else:
+            quota, period = content, read_file(path.replace('quota', 'period'))
+        if quota in ('max', '-1') or not period:
+            return None
+        return int(quota) / int(period)
+    return None
+
+
+def cpu_count():
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        count = min(count, max(1, math.ceil(limit)))
+    return count
+
+
+def memory_bytes(paths=CGROUP_MEMORY_FILES):
+    """
+    Return the memory available to this container or host in bytes, or
+    None if it cannot be determined.
+    """
+    limits = []
+    for path in paths:
+        content = read_file(path)
+        # cgroup v1 reports "no limit" as a huge number.
+        if content and content.isdigit() and int(content) < 1 << 60:
+            limits.append(int(content))
+    try:
+        limits.append(os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES'))
+    except (AttributeError, ValueError, OSError):
+        pass
+    return min(limits) if limits else None
+
+
+def worker_count(cpus, memory, worker_class, worker_memory_mb=150):
+    """
+    Number of worker processes for ``cpus`` CPUs and ``memory`` bytes.
+    """
+    count = cpus if worker_class == 'uvicorn' else 2 * cpus + 1
+    if memory is not None:
+        count = min(count, memory // (worker_memory_mb * 1024 * 1024))
+    return max(1, count)
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+worker_mode = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread').lower()
+if worker_mode not in WORKER_CLASSES:
+    raise RuntimeError(f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, not '{worker_mode}'.")
+worker_class, wsgi_app = WORKER_CLASSES[worker_mode]
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = env_int('WEB_CONCURRENCY', 0) or worker_count(
+    cpu_count(), memory_bytes(), worker_mode, env_int('GUNICORN_WORKER_MEMORY_MB', 150)
+)
+threads = env_int('GUNICORN_THREADS', 4) if worker_mode == 'gthread' else 1
+
+# Let the settings (and their system checks) know about the workers, and
+# share the API cache between them unless configured otherwise.
+os.environ['WEB_CONCURRENCY'] = str(workers)
+os.environ.setdefault('CACHE_BACKEND', 'file')
+
+# Import the app once in the master; forked workers share its memory pages
+# and restart quickly.
+preload_app = True
+
+# Recycle workers after a randomized number of requests, so memory creep is
+# capped and the workers do not all restart at the same time.
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 200)
+
+# Requests may take up to `timeout` seconds; on shutdown or reload, workers
+# get `graceful_timeout` seconds to finish the requests in flight.
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+
+# Heartbeat files in memory, not on a (possibly slow) container file system.
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
+errorlog = '-'
+
+
+def pre_fork(server, worker):
+    """
+    Close database connections opened while preloading, so workers never
+    share a connection with the master.
+    """
+    from django.apps import apps
+    if apps.ready:
+        from django.db import connections
+        connections.close_all()
+
+
+def child_exit(server, worker):
+    """
+    Merge the metrics of an exited worker into the archive file.
+    """
+    from django.apps import apps
+    if apps.ready:
+        from coderr_core import metrics
+        metrics.mark_process_dead(worker.pid)
+
+
+def on_starting(server):
+    """
+    Report failed system checks (e.g. a per-process cache with several
+    workers) and start the metrics of this run from zero (see
+    coderr_core.metrics).
+    """
+    from django.apps import apps
+    if apps.ready:
+        from django.core.checks import run_checks
+        from coderr_core import metrics
+        for message in run_checks():
+            if not message.is_silenced():
+                server.log.warning(str(message))
+        metrics.clear()
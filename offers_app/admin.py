@@ -1,5 +1,4 @@
 from django.contrib import admin
-from django.db.models import Min
 from .models import Offer, OfferDetail
 
 # Register your models here.
@@ -26,13 +25,13 @@ class OfferAdmin(admin.ModelAdmin):
     list_filter = ('user',)
     inlines = (OfferDetailInline,)
 
+    @admin.display(description='Mindestpreis', ordering='min_price')
     def min_price(self, obj):
-        return obj.details.aggregate(Min('price'))['price__min'] or 0
-    min_price.short_description = 'Mindestpreis'
+        return obj.min_price or 0
 
+    @admin.display(description='Min. Lieferzeit (Tage)', ordering='min_delivery_time')
     def min_delivery_time(self, obj):
-        return obj.details.aggregate(Min('delivery_time_in_days'))['delivery_time_in_days__min'] or 0
-    min_delivery_time.short_description = 'Min. Lieferzeit (Tage)'
+        return obj.min_delivery_time or 0
 
 @admin.register(OfferDetail)
 class OfferDetailAdmin(admin.ModelAdmin):
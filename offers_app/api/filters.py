@@ -1,7 +1,8 @@
 import django_filters
-from django.db.models import Min
+from rest_framework import filters
 
 from ..models import Offer
+from ..search import get_search_backend
 
 class OfferFilter(django_filters.FilterSet):
     """
@@ -10,39 +11,34 @@ class OfferFilter(django_filters.FilterSet):
     Filters:
         creator_id: exact match on the creating user ID.
         user__id: exact match on the user ID.
-        min_price: filter offers with any detail price >= value.
-        max_delivery_time: filter offers with any detail delivery time <= value.
+        min_price: filter offers whose lowest detail price is >= value.
+        max_delivery_time: filter offers whose shortest delivery time is <= value.
+
+    The price and delivery time filters run against the denormalized
+    columns on Offer, so no join over OfferDetail is needed.
     """
     creator_id        = django_filters.NumberFilter(field_name='user__id', lookup_expr='exact')
     user__id          = django_filters.NumberFilter(field_name='user__id', lookup_expr='exact')
-    min_price         = django_filters.NumberFilter(field_name='details__price', lookup_expr='gte')
-    max_delivery_time = django_filters.NumberFilter(field_name='details__delivery_time_in_days', lookup_expr='lte')
+    min_price         = django_filters.NumberFilter(field_name='min_price', lookup_expr='gte')
+    max_delivery_time = django_filters.NumberFilter(field_name='min_delivery_time', lookup_expr='lte')
 
     class Meta:
         model = Offer
         fields = ['user__id', 'min_price', 'max_delivery_time']
 
-    def queryset(self):
-        """
-        Annotate the base queryset with the minimum price and
-        minimum delivery time across related details.
-        """
-        base_queryset = super().queryset
-        return base_queryset.annotate(
-            min_price=Min('details__price'), 
-            min_delivery_time=Min('details__delivery_time_in_days')
-        )
-
-    def filter_min_price(self, queryset, name, value):
-        """
-        Apply filter to include only offers where the annotated
-        minimum price is >= the specified value.
-        """
-        return queryset.filter(min_price__gte=value)
-
-    def filter_max_delivery_time(self, queryset, name, value):
-        """
-        Apply filter to include only offers where the annotated
-        minimum delivery time is <= the specified value.
-        """
-        return queryset.filter(min_delivery_time__lte=value)
\ No newline at end of file
+
+class OfferSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for DRF's SearchFilter on the offer list.
+
+    Reads the same ``?search=`` parameter but delegates matching and
+    ranking to the configured offer search backend instead of running
+    ``icontains`` scans over ``search_fields``. Results are ordered by
+    relevance unless the client asks for an explicit ``ordering``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return get_search_backend().search(queryset, ' '.join(terms))
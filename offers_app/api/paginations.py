@@ -1,5 +1,7 @@
 from rest_framework.pagination import PageNumberPagination
 
+from coderr_core.api.paginations import KeysetPagination
+
 class OfferPagination(PageNumberPagination):
     """
     Pagination class for Offer listings.
@@ -8,6 +10,20 @@ class OfferPagination(PageNumberPagination):
         page_size_query_param (str): Query parameter name for clients to
             specify page size.
         page_size (int): Default number of items per page.
+        max_page_size (int): Hard upper bound for client-requested page sizes.
     """
     page_size_query_param = 'page_size'
-    page_size = 6
\ No newline at end of file
+    page_size = 6
+    max_page_size = 100
+
+class OfferCursorPagination(KeysetPagination):
+    """
+    Opt-in keyset pagination for the offer list (``?pagination=cursor``).
+
+    Supports the same orderings as the page-number mode and uses the
+    newest offers first when no ordering is requested.
+    """
+    page_size = OfferPagination.page_size
+    max_page_size = OfferPagination.max_page_size
+    ordering_fields = ('updated_at', 'min_price', 'min_delivery_time')
+    default_ordering = '-updated_at'
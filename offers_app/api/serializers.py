@@ -1,14 +1,22 @@
-from django.db import models
+from django.db import models, transaction
 from django.db.models import ProtectedError
 from django.urls import reverse
 from rest_framework import serializers
 
+from coderr_core.profiling import TimedSerializerMixin
+from coderr_core.api.values_serializers import ValuesSerializer
+
 from ..models import Offer, OfferDetail
 
-class OfferDetailSerializer(serializers.ModelSerializer):
+class OfferDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for OfferDetail, used for nested create/update and full detail view.
+
+    ``id`` is accepted on input so nested updates (PATCH/PUT of an offer)
+    can address existing details. An ``id`` that does not belong to the
+    offer being updated is ignored and the detail is created as a new one.
     """
+    id = serializers.IntegerField(required=False)
     revisions = serializers.IntegerField(min_value=1)
     delivery_time_in_days = serializers.IntegerField(min_value=1)
     price = serializers.FloatField(min_value=0)
@@ -31,7 +39,7 @@ class OfferDetailSerializer(serializers.ModelSerializer):
             'offer_type',
         ]
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Core serializer for Offer, handling nested details,
     creation and update of related OfferDetail instances.
@@ -52,59 +60,115 @@ class OfferSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """
-        Override to handle creating nested OfferDetail instances after
-        creating the Offer itself.
+        Create the offer and all its details in one transaction.
+
+        The aggregates are computed from the validated details up front, so
+        the offer row is inserted complete and the details are inserted with
+        a single bulk INSERT, however many tiers there are. The created
+        details are attached to the returned instance (no re-query).
         """
         details_data = validated_data.pop('details')
         user = self.context['request'].user
-        offer = Offer.objects.create(user=user, **validated_data)
-        for det in details_data:
-            OfferDetail.objects.create(offer=offer, **det)
+        details = [OfferDetail(**self._detail_values(det)) for det in details_data]
+        offer = Offer(user=user, **validated_data)
+        offer.set_price_aggregates(details)
+
+        with transaction.atomic():
+            offer.save()
+            for detail in details:
+                detail.offer = offer
+            OfferDetail.objects.bulk_create(details)
+
+        self._attach_details(offer, details)
         return offer
 
     def update(self, instance, validated_data):
         """
         Override to handle updating and synchronizing nested details:
-        - Update existing details by ID.
+        - Update existing details by ID (only fields that changed).
         - Create new details if ID not provided.
         - Delete details omitted from the update payload.
+
+        All writes happen in one transaction with one bulk statement per
+        kind of change, so the query count does not grow with the number
+        of tiers. The resulting details are attached to the instance.
         """
         details_data = validated_data.pop('details', None)
+        changed_fields = []
         for attr, val in validated_data.items():
-            setattr(instance, attr, val)
-        instance.save()
-
-        if details_data is not None:
-            existing = {d.id: d for d in instance.details.all()}
-            valid_ids = []
-
-            for det in details_data:
-                det_id = det.get('id')
-                offer_type = det.get('offer_type')
-
-                if det_id and det_id in existing and existing[det_id].offer_type == offer_type:
-                    obj = existing.pop(det_id)
-                    for k,v in det.items():
-                        if k != 'id':
-                            setattr(obj, k, v)
-                    obj.save()
-                    valid_ids.append(det_id)
-                else:
-                    new_obj = OfferDetail.objects.create(offer=instance, **det)
-                    valid_ids.append(new_obj.id)
-
-            for obj in existing.values():
-                try:
-                    obj.delete()
-                except ProtectedError as e:
-                    raise serializers.ValidationError({
-                        'details': f"Cannot delete detail #{obj.pk}: {str(e)}"
-                    })
-
-        instance.refresh_from_db()
+            if getattr(instance, attr) != val:
+                setattr(instance, attr, val)
+                changed_fields.append(attr)
+
+        with transaction.atomic():
+            details = None
+            if details_data is not None:
+                details = self._sync_details(instance, details_data)
+                changed_fields += instance.set_price_aggregates(details)
+            instance.save(update_fields=changed_fields + ['updated_at'])
+
+        if details is not None:
+            self._attach_details(instance, details)
         return instance
-    
-class OfferCreateResponseSerializer(serializers.ModelSerializer):
+
+    def _sync_details(self, instance, details_data):
+        """
+        Apply the submitted details to the offer with bulk_update,
+        bulk_create and one bulk delete.
+
+        Returns:
+            list: The offer's details after the update.
+        """
+        existing = {d.id: d for d in instance.details.all()}
+        kept, to_update, to_create, update_fields = [], [], [], set()
+
+        for det in details_data:
+            det_id = det.get('id')
+            offer_type = det.get('offer_type')
+
+            if det_id and det_id in existing and existing[det_id].offer_type == offer_type:
+                obj = existing.pop(det_id)
+                changed = [k for k, v in self._detail_values(det).items() if getattr(obj, k) != v]
+                for k in changed:
+                    setattr(obj, k, det[k])
+                if changed:
+                    to_update.append(obj)
+                    update_fields.update(changed)
+                kept.append(obj)
+            else:
+                to_create.append(OfferDetail(offer=instance, **self._detail_values(det)))
+
+        if existing:
+            try:
+                OfferDetail.objects.filter(pk__in=existing).delete(refresh_aggregates=False)
+            except ProtectedError as e:
+                protected = sorted({obj.offer_detail_id for obj in e.protected_objects
+                                    if getattr(obj, 'offer_detail_id', None) in existing})
+                numbers = ', '.join(f'#{pk}' for pk in protected or sorted(existing))
+                raise serializers.ValidationError({
+                    'details': f"Cannot delete detail {numbers}: {str(e)}"
+                })
+        if to_update:
+            OfferDetail.objects.bulk_update(to_update, sorted(update_fields))
+        if to_create:
+            OfferDetail.objects.bulk_create(to_create)
+
+        return kept + to_create
+
+    @staticmethod
+    def _detail_values(det):
+        return {k: v for k, v in det.items() if k != 'id'}
+
+    @staticmethod
+    def _attach_details(offer, details):
+        """
+        Cache the details on the offer the way prefetch_related would,
+        in the model's default order, for the response serializers.
+        """
+        offer._prefetched_objects_cache = getattr(offer, '_prefetched_objects_cache', {})
+        offer._prefetched_objects_cache['details'] = sorted(details, key=lambda d: d.offer_type)
+
+class OfferCreateResponseSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer used to return data on offer creation requests,
     matching the nested input structure.
@@ -115,7 +179,18 @@ class OfferCreateResponseSerializer(serializers.ModelSerializer):
         model = Offer
         fields = ['id', 'title', 'image', 'description', 'details',]
 
-class OfferDetailURLSerializer(serializers.ModelSerializer):
+def offerdetail_url_prefix(request=None):
+    """
+    Return the URL of the OfferDetail endpoint up to (excluding) the pk,
+    e.g. ``http://host/api/offerdetails/``. Absolute if a request is given.
+    """
+    path = reverse('offerdetail-detail', kwargs={'pk': 0})
+    prefix = path[:-len('0/')]
+    if request is not None:
+        prefix = request.build_absolute_uri(prefix)
+    return prefix
+
+class OfferDetailURLSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer that provides URLs for each OfferDetail instance.
     """
@@ -128,13 +203,18 @@ class OfferDetailURLSerializer(serializers.ModelSerializer):
     def get_url(self, obj):
         """
         Build fully-qualified URL for the OfferDetail detail endpoint.
+
+        The URL prefix is resolved once per root serializer and reused for
+        every detail row instead of calling reverse() for each of them.
         """
-        request = self.context.get('request')
-        return request.build_absolute_uri(
-            reverse('offerdetail-detail', kwargs={'pk': obj.pk})
-        )
+        root = self.root
+        prefix = getattr(root, '_offerdetail_url_prefix', None)
+        if prefix is None:
+            prefix = offerdetail_url_prefix(self.context.get('request'))
+            root._offerdetail_url_prefix = prefix
+        return f"{prefix}{obj.pk}/"
 
-class OfferRetrieveSerializer(serializers.ModelSerializer):
+class OfferRetrieveSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for retrieving a single Offer,
     returning detail URLs instead of full nested details.
@@ -154,7 +234,7 @@ class OfferRetrieveSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
   
-class OfferPatchResponseSerializer(serializers.ModelSerializer):
+class OfferPatchResponseSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for patch requests on Offer,
     returning full nested details on response.
@@ -166,10 +246,10 @@ class OfferPatchResponseSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'image', 'description', 'details']
 
     def get_details(self, obj):
-        details = obj.details.all().order_by('offer_type')
+        details = obj.details.all()
         return OfferDetailSerializer(details, many=True).data
 
-class OfferListSerializer(serializers.ModelSerializer):
+class OfferListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for listing Offer instances,
     including user summary fields and detail URLs.
@@ -199,4 +279,32 @@ class OfferListSerializer(serializers.ModelSerializer):
             'first_name': obj.user.first_name,
             'last_name':  obj.user.last_name,
             'username':   obj.user.username,
-        }
\ No newline at end of file
+        }
+
+class OfferListValuesSerializer(ValuesSerializer):
+    """
+    Fast read-only variant of OfferListSerializer built from ``.values()``
+    rows. The detail ids of a page are loaded with one query in prefetch().
+    """
+    serializer_class = OfferListSerializer
+    extra_values = ('user__first_name', 'user__last_name', 'user__username')
+
+    def prefetch(self, rows):
+        self.detail_ids = {}
+        details = (OfferDetail.objects
+                   .filter(offer_id__in=[row['id'] for row in rows])
+                   .values_list('offer_id', 'id'))
+        for offer_id, detail_id in details:
+            self.detail_ids.setdefault(offer_id, []).append(detail_id)
+        self.url_prefix = offerdetail_url_prefix(self.context.get('request'))
+
+    def represent_details(self, row):
+        prefix = self.url_prefix
+        return [{'id': pk, 'url': f"{prefix}{pk}/"} for pk in self.detail_ids.get(row['id'], ())]
+
+    def represent_user_details(self, row):
+        return {
+            'first_name': row['user__first_name'],
+            'last_name':  row['user__last_name'],
+            'username':   row['user__username'],
+        }
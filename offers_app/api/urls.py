@@ -2,11 +2,13 @@ from django.urls import path
 from .views import (
     OfferListCreateView,
     OfferRetrieveUpdateDestroyView,
-    OfferDetailRetrieveView
+    OfferDetailRetrieveView,
+    OfferBulkView
 )
 
 urlpatterns = [
     path('offers/', OfferListCreateView.as_view(), name='offer-list-create'),
+    path('offers/bulk/', OfferBulkView.as_view(), name='offer-bulk'),
     path('offers/<int:pk>/', OfferRetrieveUpdateDestroyView.as_view(), name='offer-detail'),
     path('offerdetails/<int:pk>/', OfferDetailRetrieveView.as_view(), name='offerdetail-detail'),
 ]
\ No newline at end of file
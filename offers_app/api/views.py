@@ -1,38 +1,57 @@
+import json
+
 from rest_framework import generics, filters, status
+from rest_framework.exceptions import ParseError, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Min
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+
+from coderr_core.api.async_views import AsyncRetrieveMixin
+from coderr_core.api.paginations import PaginationModeMixin
+from coderr_core.api.values_serializers import ValuesListMixin
+from coderr_core.db import write_transaction
+from coderr_core.cache import CachedResponseMixin
 
+from ..bulk import export_offers, import_offers, read_ndjson
 from ..models import Offer, OfferDetail
 from .serializers import (
     OfferSerializer, OfferDetailSerializer, OfferCreateResponseSerializer, 
     OfferDetailURLSerializer, OfferRetrieveSerializer, OfferPatchResponseSerializer,
-    OfferListSerializer
+    OfferListSerializer, OfferListValuesSerializer
     )
 from .permissions import IsBusinessUser, IsOwnerOrReadOnly
-from .paginations import OfferPagination
-from .filters import OfferFilter
+from .paginations import OfferPagination, OfferCursorPagination
+from .filters import OfferFilter, OfferSearchFilter
 
-class OfferListCreateView(generics.ListCreateAPIView):
+class OfferListCreateView(CachedResponseMixin, ValuesListMixin, PaginationModeMixin, generics.ListCreateAPIView):
     """
     GET:
       List all offers (with filtering, search, ordering, pagination).
+      Send ?pagination=cursor for keyset pagination without a total count.
+      Responses are cached per query string until offers change.
+      Rows are read with .values() and serialized by OfferListValuesSerializer,
+      from a read replica if one is configured.
     POST:
       Create a new offer; only business users may create.
     """
     queryset = (Offer.objects
-                .prefetch_related('details')
-                .annotate(
-                    min_price=Min('details__price'), 
-                    min_delivery_time=Min('details__delivery_time_in_days')
+                .select_related('user')
+                .prefetch_related(
+                    Prefetch('details', queryset=OfferDetail.objects.only('id', 'offer_id'))
                 )
     )
     permission_classes = [IsBusinessUser]
+    cache_namespaces   = ('offers',)
+    values_serializer_class = OfferListValuesSerializer
+    read_from_replica  = True
     pagination_class   = OfferPagination
+    cursor_pagination_class = OfferCursorPagination
     filter_backends    = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        OfferSearchFilter,
         filters.OrderingFilter,
     ]
     filterset_class = OfferFilter
@@ -44,10 +63,12 @@ class OfferListCreateView(generics.ListCreateAPIView):
             return OfferCreateResponseSerializer
         return OfferListSerializer
 
+    @write_transaction
     def create(self, request, *args, **kwargs):
         """
         Override to use the full OfferSerializer for validation,
         then return the create-response serializer.
+        Runs in one write transaction, retried if the database is locked.
         """
         full_serializer = OfferSerializer(data=request.data, context={'request': request})
         full_serializer.is_valid(raise_exception=True)
@@ -60,46 +81,31 @@ class OfferListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save()
 
-    def filter_queryset(self, queryset):
-        queryset = super().filter_queryset(queryset)
-        min_price = self.request.query_params.get('min_price')
-        max_delivery = self.request.query_params.get('max_delivery_time')
-        
-        if min_price:
-            queryset = queryset.filter(min_price__gte=float(min_price))
-        if max_delivery:
-            queryset = queryset.filter(min_delivery_time__lte=int(max_delivery))
-            
-        return queryset
-
-class OfferRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class OfferRetrieveUpdateDestroyView(CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET:
-      Retrieve a single offer (must be authenticated).
+      Retrieve a single offer (must be authenticated, cached).
     PATCH/PUT:
       Update an offer (owner only).
     DELETE:
       Delete an offer (owner only).
     """
-    queryset = (
-        Offer.objects
-            .prefetch_related('details')
-            .annotate(
-                min_price=Min('details__price'),
-                min_delivery_time=Min('details__delivery_time_in_days')
-            )
-            .all()
-    )
+    queryset = Offer.objects.prefetch_related('details')
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
+    cache_namespaces = ('offers',)
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return OfferRetrieveSerializer
         return OfferSerializer
     
+    @write_transaction
     def update(self, request, *args, **kwargs):
         """
         Override to handle nested details and return a patch-response serializer.
+        The response is built from the updated in-memory instance.
+        Runs in one write transaction (the offer is re-read on every
+        attempt), retried if the database is locked.
         """
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
@@ -113,10 +119,8 @@ class OfferRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         full_serializer.is_valid(raise_exception=True)
         self.perform_update(full_serializer)
 
-        updated_instance = self.get_object()
-
         out_ser = OfferPatchResponseSerializer(
-            updated_instance,
+            full_serializer.instance,
             context={'request': request}
         )
         return Response(out_ser.data, status=status.HTTP_200_OK)
@@ -124,11 +128,69 @@ class OfferRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     def perform_update(self, serializer):
         serializer.save()
 
-class OfferDetailRetrieveView(generics.RetrieveAPIView):
+class OfferDetailRetrieveView(CachedResponseMixin, generics.RetrieveAPIView):
     """
     GET:
-      Retrieve a single OfferDetail by ID. Public endpoint.
+      Retrieve a single OfferDetail by ID (cached, read from a replica
+      when one is configured).
     """
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated]
+    cache_namespaces = ('offers',)
+    read_from_replica = True
+
+class AsyncOfferDetailRetrieveView(AsyncRetrieveMixin, OfferDetailRetrieveView):
+    """
+    OfferDetailRetrieveView for the ASGI mode, using the async ORM.
+    """
+
+class OfferBulkView(APIView):
+    """
+    POST:
+      Import many offers at once; only business users may import.
+      The body is NDJSON (``application/x-ndjson``, one offer per line) or a
+      JSON array of offers, each in the format of POST /offers/. All rows are
+      imported before the response starts; it is an NDJSON report with one
+      line per input row (``{"line", "status", "id"|"errors"}``) followed
+      by a summary line.
+    GET:
+      Export offers as streamed NDJSON in the same format. Exports the
+      requesting user's offers unless ?creator_id= is given.
+    """
+    permission_classes = [IsAuthenticated, IsBusinessUser]
+    ndjson_media_types = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+    def post(self, request):
+        media_type = request.content_type.split(';')[0].strip()
+        if media_type in self.ndjson_media_types:
+            rows = read_ndjson(request.stream or ())
+        else:
+            rows = request.data
+            if not isinstance(rows, list):
+                raise ParseError('Expected NDJSON or a JSON array of offers.')
+
+        serializer = OfferSerializer(context={'request': request})
+        # Import everything now, while the view and the middleware still
+        # wrap the request; only the finished report is streamed.
+        report = list(import_offers(rows, request.user, serializer))
+        return StreamingHttpResponse(self.stream_report(report), content_type='application/x-ndjson')
+
+    @staticmethod
+    def stream_report(report):
+        summary = {'created': 0, 'error': 0}
+        for entry in report:
+            summary[entry['status']] += 1
+            yield json.dumps(entry, ensure_ascii=False).encode('utf-8') + b'\n'
+        yield json.dumps({'summary': summary}).encode('utf-8') + b'\n'
+
+    def get(self, request):
+        creator_id = request.query_params.get('creator_id', request.user.pk)
+        try:
+            creator_id = int(creator_id)
+        except (TypeError, ValueError):
+            raise ValidationError({'creator_id': 'A valid integer is required.'})
+
+        serializer = OfferSerializer(context={'request': request})
+        lines = export_offers(Offer.objects.filter(user_id=creator_id), serializer)
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
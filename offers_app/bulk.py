@@ -0,0 +1,149 @@
+"""
+Bulk import and streaming export of offers as NDJSON.
+
+Import reads offers (each with nested ``details``) from an iterable of
+decoded rows, validates them in batches with one reused OfferSerializer,
+and inserts every batch with two bulk INSERTs inside its own transaction.
+It yields one report dict per input row. The view consumes the whole
+import before responding and streams only the finished report, so all
+writes happen inside the request (middleware, error handling).
+
+Export walks a queryset with ``iterator(chunk_size=...)`` and yields one
+encoded NDJSON line per offer, so memory use is bounded by the chunk size.
+
+Bulk inserts bypass model signals, so each batch explicitly performs the
+side effects the signals would otherwise handle: search indexing, the
+offer counter of PlatformStats and response cache invalidation.
+"""
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+
+from coderr_core.cache import invalidate
+from coderr_core.db import retry_on_db_lock
+from stats_app.models import PlatformStats
+
+from .models import Offer, OfferDetail
+from .search import get_search_backend
+
+
+def get_batch_size():
+    return getattr(settings, 'OFFER_BULK_BATCH_SIZE', 200)
+
+
+def read_ndjson(lines):
+    """
+    Decode NDJSON lines lazily. Blank lines are skipped; undecodable lines
+    are yielded as ValueError instances so they show up in the report.
+    """
+    for raw in lines:
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8', errors='replace')
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            yield json.loads(raw)
+        except ValueError as exc:
+            yield ValueError(f'Invalid JSON: {exc}')
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def import_offers(rows, user, serializer, batch_size=None):
+    """
+    Validate and insert offers, yielding one report entry per row.
+
+    Args:
+        rows (iterable): Decoded rows (dicts); exceptions mark rows that
+            could not be decoded.
+        user (User): Owner of the imported offers.
+        serializer (OfferSerializer): Unbound serializer reused for
+            validating every row.
+        batch_size (int): Rows per validation batch and transaction.
+
+    Yields:
+        dict: ``{'line', 'status': 'created', 'id'}`` or
+        ``{'line', 'status': 'error', 'errors'}``. A database error rolls
+        back and reports the whole batch; earlier batches stay committed.
+    """
+    numbered = enumerate(rows, start=1)
+    for batch in batched(numbered, batch_size or get_batch_size()):
+        valid, report = [], {}
+        for line, row in batch:
+            if isinstance(row, Exception):
+                report[line] = {'line': line, 'status': 'error', 'errors': {'non_field_errors': [str(row)]}}
+                continue
+            try:
+                valid.append((line, serializer.run_validation(row)))
+            except ValidationError as exc:
+                report[line] = {'line': line, 'status': 'error', 'errors': exc.detail}
+
+        try:
+            created = insert_batch(user, [data for _, data in valid])
+        except DatabaseError as exc:
+            for line, _ in valid:
+                report[line] = {'line': line, 'status': 'error', 'errors': {'non_field_errors': [str(exc)]}}
+        else:
+            for (line, _), offer in zip(valid, created):
+                report[line] = {'line': line, 'status': 'created', 'id': offer.pk}
+
+        for line, _ in batch:
+            yield report[line]
+
+
+@retry_on_db_lock
+def insert_batch(user, validated_rows):
+    """
+    Insert validated offers with their details using two bulk INSERTs in
+    one transaction and apply the side effects of the skipped signals.
+    The batch is retried as a whole if the database is locked.
+
+    Returns:
+        list: The created Offer instances, in input order.
+    """
+    if not validated_rows:
+        return []
+    offers, details_per_offer = [], []
+    for data in validated_rows:
+        data = dict(data)
+        details = [
+            OfferDetail(**{k: v for k, v in det.items() if k != 'id'})
+            for det in data.pop('details')
+        ]
+        offer = Offer(user=user, **data)
+        offer.set_price_aggregates(details)
+        offers.append(offer)
+        details_per_offer.append(details)
+
+    with transaction.atomic():
+        Offer.objects.bulk_create(offers)
+        all_details = []
+        for offer, details in zip(offers, details_per_offer):
+            for detail in details:
+                detail.offer = offer
+            all_details.extend(details)
+        OfferDetail.objects.bulk_create(all_details)
+        get_search_backend().index_many(offers)
+        PlatformStats.adjust(offer_count=len(offers))
+        invalidate('offers')
+    return offers
+
+
+def export_offers(queryset, serializer, chunk_size=None):
+    """
+    Yield the offers of ``queryset`` as NDJSON lines (bytes), reading the
+    database in chunks and prefetching details per chunk.
+    """
+    queryset = queryset.prefetch_related('details').order_by('pk')
+    for offer in queryset.iterator(chunk_size=chunk_size or get_batch_size()):
+        data = serializer.to_representation(offer)
+        yield json.dumps(data, cls=JSONEncoder, ensure_ascii=False).encode('utf-8') + b'\n'
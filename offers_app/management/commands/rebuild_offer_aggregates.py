@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Recompute the denormalized min_price and min_delivery_time columns
+    of offers from their details.
+    """
+    help = "Rebuild the min_price / min_delivery_time columns of all offers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--offer-id',
+            type=int,
+            action='append',
+            dest='offer_ids',
+            help="Only rebuild the given offer (may be passed multiple times).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Offer.objects.all()
+        if options['offer_ids']:
+            queryset = queryset.filter(pk__in=options['offer_ids'])
+        updated = queryset.refresh_price_aggregates()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt aggregates for {updated} offer(s)."))
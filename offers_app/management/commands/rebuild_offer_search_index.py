@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the full-text search index of offers from scratch.
+    """
+    help = "Rebuild the offer full-text search index."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt offer search index using {type(backend).__name__}."
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2025-07-02 10:14
+
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+
+
+def backfill_price_aggregates(apps, schema_editor):
+    Offer = apps.get_model('offers_app', 'Offer')
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+    details = (OfferDetail.objects
+               .filter(offer=OuterRef('pk'))
+               .order_by()
+               .values('offer'))
+    Offer.objects.update(
+        min_price=Subquery(details.annotate(m=Min('price')).values('m')),
+        min_delivery_time=Subquery(details.annotate(m=Min('delivery_time_in_days')).values('m')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0002_alter_offerdetail_features'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_price_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.3 on 2025-07-02 11:40
+
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS offers_app_offer_fts "
+    "USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')",
+    "INSERT INTO offers_app_offer_fts (rowid, title, description) "
+    "SELECT id, title, description FROM offers_app_offer",
+]
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS offers_app_offer_fts",
+]
+
+POSTGRES_FORWARD = [
+    "CREATE TABLE IF NOT EXISTS offers_app_offer_search ("
+    "offer_id bigint PRIMARY KEY REFERENCES offers_app_offer (id) ON DELETE CASCADE, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS offers_app_offer_search_document_gin "
+    "ON offers_app_offer_search USING GIN (document)",
+    "INSERT INTO offers_app_offer_search (offer_id, document) "
+    "SELECT id, "
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B') "
+    "FROM offers_app_offer",
+]
+POSTGRES_BACKWARD = [
+    "DROP TABLE IF EXISTS offers_app_offer_search",
+]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return any('FTS5' in row[0] for row in cursor.fetchall())
+
+
+def run_statements(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite' and sqlite_has_fts5(schema_editor.connection):
+        run_statements(schema_editor, SQLITE_FORWARD)
+    elif vendor == 'postgresql':
+        run_statements(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        run_statements(schema_editor, SQLITE_BACKWARD)
+    elif vendor == 'postgresql':
+        run_statements(schema_editor, POSTGRES_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0003_offer_min_price_min_delivery_time'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,9 +1,34 @@
 from django.db import models
-from django.db.models import JSONField
+from django.db.models import JSONField, Min, OuterRef, Subquery
 from django.conf import settings
 
 # Create your models here.
 
+class OfferQuerySet(models.QuerySet):
+    """
+    QuerySet for Offer with helpers to maintain the denormalized
+    price and delivery time aggregates.
+    """
+
+    def refresh_price_aggregates(self):
+        """
+        Recompute min_price and min_delivery_time for all offers in this
+        queryset from their details in a single UPDATE statement.
+
+        Returns:
+            int: Number of updated offers.
+        """
+        details = (OfferDetail.objects
+                   .filter(offer=OuterRef('pk'))
+                   .order_by()
+                   .values('offer'))
+        return self.update(
+            min_price=Subquery(details.annotate(m=Min('price')).values('m')),
+            min_delivery_time=Subquery(
+                details.annotate(m=Min('delivery_time_in_days')).values('m')
+            ),
+        )
+
 class Offer(models.Model):
     """
     Represents a high-level offer created by a business user.
@@ -15,6 +40,9 @@ class Offer(models.Model):
         description (TextField): Detailed description of the offer.
         created_at (DateTimeField): Timestamp when the offer was created.
         updated_at (DateTimeField): Timestamp when the offer was last updated.
+        min_price (FloatField): Lowest price across all details (denormalized).
+        min_delivery_time (PositiveIntegerField): Shortest delivery time in days
+            across all details (denormalized).
     """
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
                              on_delete=models.CASCADE,
@@ -24,6 +52,17 @@ class Offer(models.Model):
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    min_price = models.FloatField(null=True, blank=True, db_index=True, editable=False)
+    min_delivery_time = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Offer list ordered by last update, optionally filtered by creator.
+            models.Index(fields=['updated_at'], name='offer_updated_idx'),
+            models.Index(fields=['user', '-updated_at'], name='offer_user_updated_idx'),
+        ]
 
     def __str__(self):
         """
@@ -32,6 +71,52 @@ class Offer(models.Model):
         """
         return f"{self.title} by {self.user.username}"
 
+    def refresh_price_aggregates(self):
+        """
+        Recompute the denormalized aggregates of this offer from its
+        details and reload them onto the instance.
+        """
+        Offer.objects.filter(pk=self.pk).refresh_price_aggregates()
+        self.refresh_from_db(fields=['min_price', 'min_delivery_time'])
+
+    def set_price_aggregates(self, details):
+        """
+        Set min_price and min_delivery_time from an in-memory collection of
+        this offer's details, without a query.
+
+        Returns:
+            list: Names of the aggregate fields whose value changed.
+        """
+        details = list(details)
+        values = {
+            'min_price': min((d.price for d in details), default=None),
+            'min_delivery_time': min((d.delivery_time_in_days for d in details), default=None),
+        }
+        changed = [name for name, value in values.items() if getattr(self, name) != value]
+        for name in changed:
+            setattr(self, name, values[name])
+        return changed
+
+class OfferDetailQuerySet(models.QuerySet):
+    """
+    QuerySet for OfferDetail whose bulk delete keeps the parent offers'
+    aggregates in sync with one UPDATE instead of one per deleted row.
+    """
+
+    def delete(self, refresh_aggregates=True):
+        """
+        Delete the details and refresh the aggregates of their offers.
+
+        Args:
+            refresh_aggregates (bool): Pass False if the caller updates the
+                offers' aggregates itself.
+        """
+        offer_ids = set(self.values_list('offer_id', flat=True)) if refresh_aggregates else ()
+        result = super().delete()
+        if offer_ids:
+            Offer.objects.filter(pk__in=offer_ids).refresh_price_aggregates()
+        return result
+
 class OfferDetail(models.Model):
     """
     Represents a detailed plan or tier within an Offer,
@@ -66,6 +151,8 @@ class OfferDetail(models.Model):
     features = JSONField(default=list, blank=True)
     offer_type = models.CharField(max_length=10, choices=OFFER_TYPES)
 
+    objects = OfferDetailQuerySet.as_manager()
+
     class Meta:
         ordering = ['offer_type']
 
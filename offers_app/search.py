@@ -0,0 +1,255 @@
+"""
+Pluggable full-text search for offers.
+
+A search backend keeps a separate full-text index of offer titles and
+descriptions and turns a user query into a filtered, ranked queryset.
+The backend is chosen by ``settings.OFFER_SEARCH_BACKEND`` (a dotted path)
+or, when unset, by the database vendor:
+
+    - SQLite:     FTS5 virtual table ``offers_app_offer_fts``.
+    - PostgreSQL: ``tsvector`` table ``offers_app_offer_search`` with a GIN index.
+    - Anything else, or a missing index: plain ``icontains`` lookups.
+
+The index tables are created by migration ``0004_offer_search_index`` and
+kept current by the signals in ``offers_app.signals``.
+"""
+import re
+from functools import reduce
+from operator import and_
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Offer
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(query):
+    """
+    Split a raw search string into lower-cased word tokens.
+
+    Everything that is not a word character is dropped, which also keeps
+    the tokens safe to embed into FTS5 / tsquery syntax.
+    """
+    return TOKEN_RE.findall(query.lower())
+
+
+class BaseOfferSearchBackend:
+    """
+    Interface for offer search backends.
+
+    Subclasses implement index maintenance (index, index_many, remove,
+    rebuild) and search(), which must return the given queryset restricted
+    to matching offers and annotated with a ``search_rank`` (higher is better).
+    Without overrides, nothing is indexed and search() uses ``icontains``.
+    """
+    fields = ('title', 'description')
+
+    def index(self, offer):
+        """Add or refresh a single offer in the index."""
+
+    def index_many(self, offers):
+        """Add or refresh several offers, e.g. after a bulk insert."""
+        for offer in offers:
+            self.index(offer)
+
+    def remove(self, offer_id):
+        """Drop a single offer from the index."""
+
+    def rebuild(self):
+        """Rebuild the whole index from the offers table."""
+
+    def search(self, queryset, query):
+        """
+        Restrict the queryset to offers containing every token of the query
+        in the title or description (case-insensitive), matching the
+        behaviour of DRF's SearchFilter. Results are not ranked.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return queryset
+        conditions = [
+            reduce(lambda a, b: a | b, (Q(**{f'{field}__icontains': term}) for field in self.fields))
+            for term in terms
+        ]
+        return queryset.filter(reduce(and_, conditions)).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+
+class IContainsSearchBackend(BaseOfferSearchBackend):
+    """
+    Fallback backend without an index, using the ``icontains`` search of
+    the base class.
+    """
+
+
+class SQLiteFTS5SearchBackend(BaseOfferSearchBackend):
+    """
+    SQLite backend based on an FTS5 virtual table whose rowid is the offer id.
+
+    Every token is matched as a prefix ("log" finds "logo"), all tokens
+    must match, and results are ranked by bm25 with the title weighted
+    higher than the description.
+    """
+    table = 'offers_app_offer_fts'
+    title_weight = 10.0
+    description_weight = 1.0
+
+    def index(self, offer):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [offer.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, description) VALUES (%s, %s, %s)',
+                [offer.pk, offer.title, offer.description],
+            )
+
+    def index_many(self, offers):
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [[o.pk] for o in offers])
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, title, description) VALUES (%s, %s, %s)',
+                [[o.pk, o.title, o.description] for o in offers],
+            )
+
+    def remove(self, offer_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [offer_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, description) '
+                f'SELECT id, title, description FROM {Offer._meta.db_table}'
+            )
+
+    def build_match(self, terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, query):
+        terms = tokenize(query)
+        if not terms:
+            return queryset
+        match = self.build_match(terms)
+        offer_table = Offer._meta.db_table
+        rank = RawSQL(
+            f'SELECT -bm25({self.table}, %s, %s) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s AND rowid = {offer_table}.id',
+            (self.title_weight, self.description_weight, match),
+            output_field=FloatField(),
+        )
+        matching_ids = RawSQL(f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', (match,))
+        return (queryset
+                .filter(pk__in=matching_ids)
+                .annotate(search_rank=rank)
+                .order_by('-search_rank', '-pk'))
+
+
+class PostgresSearchBackend(BaseOfferSearchBackend):
+    """
+    PostgreSQL backend storing a weighted tsvector per offer in a side
+    table with a GIN index.
+
+    Tokens are combined into a prefix tsquery (``logo:* & design:*``) and
+    results are ranked with ts_rank.
+    """
+    table = 'offers_app_offer_search'
+    config = 'simple'
+
+    def _document_sql(self, title_sql='%s', description_sql='%s'):
+        return (
+            f"setweight(to_tsvector('{self.config}', coalesce({title_sql}, '')), 'A') || "
+            f"setweight(to_tsvector('{self.config}', coalesce({description_sql}, '')), 'B')"
+        )
+
+    def index(self, offer):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.table} (offer_id, document) VALUES (%s, {self._document_sql()}) '
+                f'ON CONFLICT (offer_id) DO UPDATE SET document = EXCLUDED.document',
+                [offer.pk, offer.title, offer.description],
+            )
+
+    def index_many(self, offers):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (offer_id, document) VALUES (%s, {self._document_sql()}) '
+                f'ON CONFLICT (offer_id) DO UPDATE SET document = EXCLUDED.document',
+                [[o.pk, o.title, o.description] for o in offers],
+            )
+
+    def remove(self, offer_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE offer_id = %s', [offer_id])
+
+    def rebuild(self):
+        document = self._document_sql('title', 'description')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (offer_id, document) '
+                f'SELECT id, {document} FROM {Offer._meta.db_table}'
+            )
+
+    def build_tsquery(self, terms):
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def search(self, queryset, query):
+        terms = tokenize(query)
+        if not terms:
+            return queryset
+        tsquery = self.build_tsquery(terms)
+        offer_table = Offer._meta.db_table
+        rank = RawSQL(
+            f"SELECT ts_rank(document, to_tsquery('{self.config}', %s)) FROM {self.table} "
+            f"WHERE offer_id = {offer_table}.id",
+            (tsquery,),
+            output_field=FloatField(),
+        )
+        matching_ids = RawSQL(
+            f"SELECT offer_id FROM {self.table} WHERE document @@ to_tsquery('{self.config}', %s)",
+            (tsquery,),
+        )
+        return (queryset
+                .filter(pk__in=matching_ids)
+                .annotate(search_rank=rank)
+                .order_by('-search_rank', '-pk'))
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTS5SearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+_backend = None
+
+
+def _index_table_exists(backend_class):
+    table = getattr(backend_class, 'table', None)
+    return table is not None and table in connection.introspection.table_names()
+
+
+def get_search_backend():
+    """
+    Return the configured offer search backend instance.
+
+    The lookup is done once per process. Vendor backends whose index
+    table does not exist (e.g. SQLite built without FTS5) fall back to
+    IContainsSearchBackend.
+    """
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'OFFER_SEARCH_BACKEND', None)
+        if path:
+            _backend = import_string(path)()
+        else:
+            backend_class = VENDOR_BACKENDS.get(connection.vendor)
+            if backend_class is None or not _index_table_exists(backend_class):
+                backend_class = IContainsSearchBackend
+            _backend = backend_class()
+    return _backend
@@ -0,0 +1,61 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from coderr_core.cache import invalidate
+
+from .models import Offer, OfferDetail
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=OfferDetail)
+def refresh_aggregates_on_detail_save(sender, instance, **kwargs):
+    """
+    Keep the parent offer's min_price and min_delivery_time in sync
+    whenever a single detail is created or changed.
+    """
+    Offer.objects.filter(pk=instance.offer_id).refresh_price_aggregates()
+
+
+@receiver(post_delete, sender=OfferDetail)
+def refresh_aggregates_on_detail_delete(sender, instance, origin=None, **kwargs):
+    """
+    Keep the parent offer's aggregates in sync when a detail is removed.
+
+    Skipped when the delete cascades from the offer itself, since the
+    offer row is about to disappear anyway, and for OfferDetail queryset
+    deletes, which refresh their offers once (OfferDetailQuerySet.delete).
+    """
+    if isinstance(origin, Offer) or getattr(origin, 'model', None) in (Offer, OfferDetail):
+        return
+    Offer.objects.filter(pk=instance.offer_id).refresh_price_aggregates()
+
+
+@receiver(post_save, sender=Offer)
+def index_offer_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Add or refresh the offer in the full-text search index.
+
+    Skipped for saves restricted to fields that are not indexed.
+    """
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & set(get_search_backend().fields):
+        return
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_from_index(sender, instance, **kwargs):
+    """
+    Drop a deleted offer from the full-text search index.
+    """
+    get_search_backend().remove(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Offer)
+@receiver([post_save, post_delete], sender=OfferDetail)
+def invalidate_offer_responses(sender, **kwargs):
+    """
+    Drop cached offer responses after any offer or detail change.
+    """
+    invalidate('offers')
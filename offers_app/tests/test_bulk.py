@@ -0,0 +1,138 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer
+from profiles_app.models import Profile
+from stats_app.models import PlatformStats
+
+
+def offer_payload(title, prices=(10, 20, 30)):
+    return {
+        "title": title,
+        "description": f"{title} description",
+        "details": [
+            {"title": offer_type.title(), "revisions": 1, "delivery_time_in_days": 7 - i,
+             "price": price, "features": ["x"], "offer_type": offer_type}
+            for i, (offer_type, price) in enumerate(zip(('basic', 'standard', 'premium'), prices))
+        ],
+    }
+
+
+class OfferBulkTests(APITestCase):
+    """
+    Tests for the NDJSON bulk import/export endpoint /api/offers/bulk/.
+    """
+    def setUp(self):
+        self.business_user = User.objects.create_user('biz', 'biz@test.de', 'pw123456')
+        Profile.objects.create(user=self.business_user, type='business')
+        self.customer_user = User.objects.create_user('cust', 'cust@test.de', 'pw123456')
+        Profile.objects.create(user=self.customer_user, type='customer')
+        self.biz_token = Token.objects.create(user=self.business_user)
+        self.cust_token = Token.objects.create(user=self.customer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.biz_token.key}')
+        self.url = reverse('offer-bulk')
+
+    def read_lines(self, response):
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def post_ndjson(self, lines):
+        body = '\n'.join(lines) + '\n'
+        return self.client.generic('POST', self.url, body, content_type='application/x-ndjson')
+
+    def test_ndjson_import_reports_every_row(self):
+        """
+        Valid rows are created; undecodable and invalid rows are reported.
+        """
+        response = self.post_ndjson([
+            json.dumps(offer_payload('Logo')),
+            '{not json',
+            json.dumps({"title": "No details"}),
+            '',
+            json.dumps(offer_payload('Website', prices=(5, 50, 500))),
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = self.read_lines(response)
+
+        self.assertEqual([line.get('status') for line in lines[:4]], ['created', 'error', 'error', 'created'])
+        self.assertEqual([line.get('line') for line in lines[:4]], [1, 2, 3, 4])
+        self.assertIn('details', lines[2]['errors'])
+        self.assertEqual(lines[4], {'summary': {'created': 2, 'error': 2}})
+
+        website = Offer.objects.get(pk=lines[3]['id'])
+        self.assertEqual(website.user, self.business_user)
+        self.assertEqual(website.details.count(), 3)
+        self.assertEqual(website.min_price, 5.0)
+        self.assertEqual(website.min_delivery_time, 5)
+
+    def test_rows_are_imported_before_the_response(self):
+        """
+        The import runs inside the request, not while the report is sent.
+        """
+        response = self.post_ndjson([json.dumps(offer_payload('Logo')), json.dumps(offer_payload('Web'))])
+        self.assertEqual(Offer.objects.filter(user=self.business_user).count(), 2)
+        self.assertEqual(self.read_lines(response)[-1], {'summary': {'created': 2, 'error': 0}})
+
+    def test_side_effects_of_bulk_insert(self):
+        """
+        Imported offers are searchable, counted and visible in cached lists.
+        """
+        list_url = reverse('offer-list-create')
+        self.assertEqual(self.client.get(list_url).data['count'], 0)
+
+        self.post_ndjson([json.dumps(offer_payload('Logo Design'))]).getvalue()
+
+        self.assertEqual(self.client.get(list_url).data['count'], 1)
+        self.assertEqual(self.client.get(list_url, {'search': 'logo'}).data['count'], 1)
+        self.assertEqual(PlatformStats.load().offer_count, 1)
+
+    @override_settings(OFFER_BULK_BATCH_SIZE=2)
+    def test_json_array_import_in_batches(self):
+        """
+        A JSON array is accepted as well and processed batch by batch.
+        """
+        payload = [offer_payload(f'Offer {i}') for i in range(5)]
+        response = self.client.post(self.url, payload, format='json')
+        lines = self.read_lines(response)
+        self.assertEqual(lines[-1], {'summary': {'created': 5, 'error': 0}})
+        self.assertEqual(Offer.objects.filter(user=self.business_user).count(), 5)
+
+    def test_import_requires_business_user(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.cust_token.key}')
+        response = self.client.post(self.url, [offer_payload('Logo')], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_rejects_non_array_json(self):
+        response = self.client.post(self.url, offer_payload('Logo'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(OFFER_BULK_BATCH_SIZE=2)
+    def test_export_round_trip(self):
+        """
+        The export streams one line per offer and can be imported again.
+        """
+        self.client.post(self.url, [offer_payload(f'Offer {i}') for i in range(3)], format='json').getvalue()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.cust_token.key}')
+        response = self.client.get(self.url, {'creator_id': self.business_user.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        exported = self.read_lines(response)
+        self.assertEqual([row['title'] for row in exported], ['Offer 0', 'Offer 1', 'Offer 2'])
+        self.assertEqual(len(exported[0]['details']), 3)
+        self.assertEqual(exported[0]['min_price'], 10.0)
+
+        self.assertEqual(self.read_lines(self.client.get(self.url)), [])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.biz_token.key}')
+        response = self.post_ndjson([json.dumps(row) for row in exported])
+        self.assertEqual(self.read_lines(response)[-1], {'summary': {'created': 3, 'error': 0}})
+
+    def test_export_rejects_invalid_creator(self):
+        response = self.client.get(self.url, {'creator_id': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
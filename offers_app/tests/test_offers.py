@@ -1,4 +1,10 @@
 import pprint
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth.models import User
 from rest_framework import status
@@ -7,6 +13,9 @@ from rest_framework.authtoken.models import Token
 
 from profiles_app.models import Profile
 from offers_app.models import Offer, OfferDetail
+from offers_app.api.paginations import OfferPagination, OfferCursorPagination
+from offers_app.search import get_search_backend
+from orders_app.models import Order
 
 class OffersAPITests(APITestCase):
     """
@@ -175,4 +184,421 @@ class OffersAPITests(APITestCase):
         resp = self.client.get(url)
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertEqual(resp.data['id'], self.detail.id)
-        self.assertEqual(resp.data['offer_type'], 'basic')
\ No newline at end of file
+        self.assertEqual(resp.data['offer_type'], 'basic')
+
+class OfferAggregateTests(APITestCase):
+    """
+    Tests for the denormalized min_price / min_delivery_time columns on Offer.
+    """
+    def setUp(self):
+        """Create a business user with an offer that has two details."""
+        self.business_user = User.objects.create_user(
+            username='biz', email='biz@test.de', password='pw123456'
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        self.biz_token = Token.objects.create(user=self.business_user)
+
+        self.offer = Offer.objects.create(user=self.business_user, title="Cheap")
+        self.basic = self.offer.details.create(
+            title="Basic", revisions=1, delivery_time_in_days=7,
+            price=20.0, features=[], offer_type="basic"
+        )
+        self.premium = self.offer.details.create(
+            title="Premium", revisions=3, delivery_time_in_days=2,
+            price=90.0, features=[], offer_type="premium"
+        )
+
+    def test_aggregates_follow_detail_changes(self):
+        """
+        Creating, updating and deleting details keeps the offer columns in sync.
+        """
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 20.0)
+        self.assertEqual(self.offer.min_delivery_time, 2)
+
+        self.basic.price = 120.0
+        self.basic.save()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 90.0)
+
+        self.premium.delete()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 120.0)
+        self.assertEqual(self.offer.min_delivery_time, 7)
+
+    def test_aggregates_after_patch(self):
+        """
+        PATCH /offers/<pk>/ with new details updates the offer columns.
+        """
+        url = reverse('offer-detail', kwargs={'pk': self.offer.id})
+        payload = {"details": [
+            {"id": self.basic.id, "title": "Basic", "revisions": 1,
+             "delivery_time_in_days": 4, "price": 15, "features": [], "offer_type": "basic"},
+        ]}
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.biz_token.key}')
+        resp = self.client.patch(url, payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 15.0)
+        self.assertEqual(self.offer.min_delivery_time, 4)
+
+    def test_list_filter_and_ordering_use_columns(self):
+        """
+        min_price / max_delivery_time filters and min_price ordering work
+        against the stored columns.
+        """
+        other = Offer.objects.create(user=self.business_user, title="Expensive")
+        other.details.create(
+            title="Basic", revisions=1, delivery_time_in_days=10,
+            price=500.0, features=[], offer_type="basic"
+        )
+        url = reverse('offer-list-create')
+
+        resp = self.client.get(url, {'min_price': 100})
+        self.assertEqual([o['id'] for o in resp.data['results']], [other.id])
+
+        resp = self.client.get(url, {'max_delivery_time': 5})
+        self.assertEqual([o['id'] for o in resp.data['results']], [self.offer.id])
+
+        resp = self.client.get(url, {'ordering': '-min_price'})
+        self.assertEqual([o['id'] for o in resp.data['results']], [other.id, self.offer.id])
+
+    def test_rebuild_command_repairs_drift(self):
+        """
+        The rebuild_offer_aggregates command restores values changed behind its back.
+        """
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=None, min_delivery_time=None)
+        call_command('rebuild_offer_aggregates', stdout=StringIO())
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 20.0)
+        self.assertEqual(self.offer.min_delivery_time, 2)
+
+
+class OfferSearchTests(APITestCase):
+    """
+    Tests for the ?search= parameter backed by the offer search engine.
+    """
+    def setUp(self):
+        """Create offers with distinct titles and descriptions."""
+        self.business_user = User.objects.create_user(
+            username='biz', email='biz@test.de', password='pw123456'
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        self.logo = Offer.objects.create(
+            user=self.business_user, title="Logo Design", description="Vector artwork"
+        )
+        self.web = Offer.objects.create(
+            user=self.business_user, title="Website", description="Responsive design with logo"
+        )
+        self.copy = Offer.objects.create(
+            user=self.business_user, title="Copywriting", description="Texts for your shop"
+        )
+        self.url = reverse('offer-list-create')
+
+    def result_ids(self, **params):
+        resp = self.client.get(self.url, params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [o['id'] for o in resp.data['results']]
+
+    def test_search_matches_title_and_description(self):
+        """
+        Terms are matched in title and description; title hits rank first.
+        """
+        self.assertEqual(self.result_ids(search='logo'), [self.logo.id, self.web.id])
+
+    def test_search_prefix_and_all_terms(self):
+        """
+        Partial words match as prefixes and every term must match.
+        """
+        self.assertEqual(self.result_ids(search='copywr'), [self.copy.id])
+        self.assertEqual(self.result_ids(search='design vector'), [self.logo.id])
+
+    def test_search_follows_updates_and_deletes(self):
+        """
+        The index is refreshed when offers change or disappear.
+        """
+        self.copy.title = "Logo animation"
+        self.copy.save()
+        self.assertIn(self.copy.id, self.result_ids(search='animation'))
+
+        self.logo.delete()
+        self.assertEqual(self.result_ids(search='logo'), [self.copy.id, self.web.id])
+
+    def test_search_respects_explicit_ordering(self):
+        """
+        An explicit ?ordering= overrides relevance ordering.
+        """
+        ids = self.result_ids(search='logo', ordering='-updated_at')
+        self.assertEqual(ids, [self.web.id, self.logo.id])
+
+
+class OfferListQueryBudgetTests(APITestCase):
+    """
+    The offer list must run a fixed number of queries regardless of page size.
+    """
+    def setUp(self):
+        """Create several business users, each with offers that have three details."""
+        for u in range(4):
+            user = User.objects.create_user(username=f'biz{u}', password='pw123456')
+            Profile.objects.create(user=user, type='business')
+            for o in range(2):
+                offer = Offer.objects.create(user=user, title=f"Offer {u}-{o}")
+                for i, offer_type in enumerate(('basic', 'standard', 'premium')):
+                    offer.details.create(
+                        title=offer_type, revisions=1, delivery_time_in_days=i + 1,
+                        price=10.0 * (i + 1), features=[], offer_type=offer_type
+                    )
+
+    def test_list_query_count_is_constant(self):
+        """
+        COUNT, offers joined with users, and one prefetch for all details.
+        """
+        url = reverse('offer-list-create')
+        for page_size in (1, 3, 8):
+            with self.assertNumQueries(3):
+                resp = self.client.get(url, {'page_size': page_size})
+            self.assertEqual(len(resp.data['results']), page_size)
+
+    def test_detail_urls_and_user_details(self):
+        """
+        Detail URLs are absolute and user_details reflect the creating user.
+        """
+        resp = self.client.get(reverse('offer-list-create'), {'ordering': 'updated_at'})
+        first = resp.data['results'][0]
+        offer = Offer.objects.get(pk=first['id'])
+        self.assertEqual(first['user_details']['username'], offer.user.username)
+        expected = [
+            'http://testserver' + reverse('offerdetail-detail', kwargs={'pk': d.pk})
+            for d in offer.details.all()
+        ]
+        self.assertEqual([d['url'] for d in first['details']], expected)
+
+
+class OfferCursorPaginationTests(APITestCase):
+    """
+    Tests for the opt-in keyset pagination mode of the offer list.
+    """
+    def setUp(self):
+        """Create offers with duplicate prices and one offer without details."""
+        user = User.objects.create_user(username='biz', password='pw123456')
+        Profile.objects.create(user=user, type='business')
+        for i, price in enumerate([30, 10, 20, 10, 30, 10, 50]):
+            offer = Offer.objects.create(user=user, title=f"Offer {i}")
+            offer.details.create(
+                title="Basic", revisions=1, delivery_time_in_days=i % 3 + 1,
+                price=price, features=[], offer_type="basic"
+            )
+        Offer.objects.create(user=user, title="Without details")
+        self.url = reverse('offer-list-create')
+
+    def walk(self, **params):
+        """Follow next links from the first page and collect all ids."""
+        resp = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 3, **params})
+        ids, pages = [], []
+        while True:
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', resp.data)
+            ids += [o['id'] for o in resp.data['results']]
+            pages.append(resp)
+            if not resp.data['next']:
+                return ids, pages
+            resp = self.client.get(resp.data['next'])
+
+    def test_walk_matches_full_ordering(self):
+        """
+        Walking all pages yields every offer exactly once, in list order,
+        with ties broken by id and offers without details last.
+        """
+        offers = list(Offer.objects.all())
+        expected = {
+            'min_price': sorted(offers, key=lambda o: (o.min_price is None, o.min_price or 0, o.id)),
+            '-min_price': sorted(offers, key=lambda o: (o.min_price is None, -(o.min_price or 0), -o.id)),
+            'min_delivery_time': sorted(
+                offers, key=lambda o: (o.min_delivery_time is None, o.min_delivery_time or 0, o.id)
+            ),
+            '-updated_at': sorted(offers, key=lambda o: (o.updated_at, o.id), reverse=True),
+        }
+        for ordering, ordered in expected.items():
+            ids, _ = self.walk(ordering=ordering)
+            self.assertEqual(ids, [o.id for o in ordered], ordering)
+
+    def test_previous_links(self):
+        """
+        Following previous links returns the same pages in reverse.
+        """
+        _, pages = self.walk(ordering='min_price')
+        resp = pages[-1]
+        for page in reversed(pages[:-1]):
+            resp = self.client.get(resp.data['previous'])
+            self.assertEqual(resp.data['results'], page.data['results'])
+        self.assertIsNone(resp.data['previous'])
+
+    def test_no_count_query(self):
+        """
+        Cursor pages skip the COUNT(*) query.
+        """
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {'pagination': 'cursor'})
+
+    def test_page_size_upper_bound(self):
+        """
+        page_size is capped in both pagination modes.
+        """
+        with patch.object(OfferPagination, 'max_page_size', 2), \
+                patch.object(OfferCursorPagination, 'max_page_size', 2):
+            resp = self.client.get(self.url, {'page_size': 1000})
+            self.assertEqual(len(resp.data['results']), 2)
+            resp = self.client.get(self.url, {'page_size': 1000, 'pagination': 'cursor'})
+            self.assertEqual(len(resp.data['results']), 2)
+
+    def test_invalid_cursor(self):
+        """
+        Tampered cursors are rejected with 404.
+        """
+        resp = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+class OfferWriteQueryBudgetTests(APITestCase):
+    """
+    Tests for the bulk nested write path of OfferSerializer.
+    """
+    def setUp(self):
+        """Create a business user; warm up the token cache and search backend."""
+        self.business_user = User.objects.create_user(
+            username='biz', email='biz@test.de', password='pw123456'
+        )
+        Profile.objects.create(user=self.business_user, type='business')
+        token = Token.objects.create(user=self.business_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client.get(reverse('offer-list-create'))
+        get_search_backend()
+
+    def detail_payload(self, offer_type, price=10, days=3):
+        return {"title": offer_type.title(), "revisions": 1, "delivery_time_in_days": days,
+                "price": price, "features": ["x"], "offer_type": offer_type}
+
+    def create_offer(self, types):
+        payload = {"title": "Logo", "description": "Design",
+                   "details": [self.detail_payload(t) for t in types]}
+        return self.client.post(reverse('offer-list-create'), payload, format='json')
+
+    def count_queries(self, func, *args):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = func(*args)
+        return resp, len(ctx.captured_queries)
+
+    def test_create_query_count_is_constant(self):
+        """
+        Creating an offer costs the same queries for one or three tiers.
+        """
+        one, one_queries = self.count_queries(self.create_offer, ['basic'])
+        three, three_queries = self.count_queries(self.create_offer, ['basic', 'standard', 'premium'])
+        self.assertEqual(one.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(three.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(one_queries, three_queries)
+
+        offer = Offer.objects.get(pk=three.data['id'])
+        self.assertEqual(offer.min_price, 10.0)
+        self.assertEqual(offer.min_delivery_time, 3)
+        self.assertEqual(
+            [d['id'] for d in three.data['details']],
+            list(offer.details.values_list('id', flat=True)),
+        )
+
+    def test_patch_query_count_is_constant(self):
+        """
+        Updating, adding and removing tiers costs the same queries for
+        one or three tiers per kind of change.
+        """
+        def patch_offer(types, remove):
+            offer_id = self.create_offer(types + remove).data['id']
+            details = {d.offer_type: d for d in OfferDetail.objects.filter(offer_id=offer_id)}
+            payload = {"details": [
+                dict(self.detail_payload(t, price=5), id=details[t].id) for t in types
+            ]}
+            url = reverse('offer-detail', kwargs={'pk': offer_id})
+            return self.client.patch(url, payload, format='json')
+
+        one, one_queries = self.count_queries(patch_offer, ['basic'], ['premium'])
+        many, many_queries = self.count_queries(patch_offer, ['basic', 'standard'], ['premium'])
+        self.assertEqual(one.status_code, status.HTTP_200_OK)
+        self.assertEqual(many.status_code, status.HTTP_200_OK)
+        self.assertEqual(one_queries, many_queries)
+
+    def test_patch_updates_in_place_and_only_changed_fields(self):
+        """
+        Details addressed by id keep their id; only changed columns are written,
+        and the response reflects the new state without a re-query.
+        """
+        created = self.create_offer(['basic', 'premium']).data
+        basic_id = created['details'][0]['id']
+        url = reverse('offer-detail', kwargs={'pk': created['id']})
+        payload = {"details": [dict(self.detail_payload('basic', price=7), id=basic_id)]}
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.patch(url, payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['details'], [
+            {'id': basic_id, 'title': 'Basic', 'revisions': 1, 'delivery_time_in_days': 3,
+             'price': 7.0, 'features': ['x'], 'offer_type': 'basic'},
+        ])
+        detail_updates = [q['sql'] for q in ctx.captured_queries
+                          if q['sql'].startswith('UPDATE "offers_app_offerdetail"')]
+        self.assertEqual(len(detail_updates), 1)
+        self.assertIn('"price"', detail_updates[0])
+        self.assertNotIn('"title"', detail_updates[0])
+
+        offer = Offer.objects.get(pk=created['id'])
+        self.assertEqual(offer.min_price, 7.0)
+        self.assertEqual(list(offer.details.values_list('id', flat=True)), [basic_id])
+
+    def test_removing_ordered_detail_is_rejected(self):
+        """
+        A detail referenced by an order cannot be removed; nothing is changed.
+        """
+        created = self.create_offer(['basic', 'premium']).data
+        basic_id, premium_id = (d['id'] for d in created['details'])
+        customer = User.objects.create_user(username='cust', password='pw123456')
+        Order.objects.create(customer_user=customer, business_user=self.business_user,
+                             offer_detail_id=premium_id)
+        url = reverse('offer-detail', kwargs={'pk': created['id']})
+        payload = {"title": "Changed",
+                   "details": [dict(self.detail_payload('basic', price=1), id=basic_id)]}
+        resp = self.client.patch(url, payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        offer = Offer.objects.get(pk=created['id'])
+        self.assertEqual(offer.title, 'Logo')
+        self.assertEqual(offer.details.count(), 2)
+
+    def test_rejection_names_the_ordered_detail(self):
+        created = self.create_offer(['basic', 'standard', 'premium']).data
+        basic_id, standard_id, premium_id = (d['id'] for d in created['details'])
+        customer = User.objects.create_user(username='cust', password='pw123456')
+        Order.objects.create(customer_user=customer, business_user=self.business_user,
+                             offer_detail_id=premium_id)
+        url = reverse('offer-detail', kwargs={'pk': created['id']})
+        payload = {"details": [dict(self.detail_payload('basic'), id=basic_id)]}
+        resp = self.client.patch(url, payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        message = str(resp.data['details'])
+        self.assertIn(f'Cannot delete detail #{premium_id}:', message)
+        self.assertNotIn(f'#{standard_id}', message)
+
+    def test_detail_id_of_other_offer_is_ignored(self):
+        """
+        An id of another offer's detail does not touch that detail; a new
+        detail is created instead.
+        """
+        other = self.create_offer(['basic']).data
+        other_id = other['details'][0]['id']
+        created = self.create_offer(['basic']).data
+        url = reverse('offer-detail', kwargs={'pk': created['id']})
+        payload = {"details": [dict(self.detail_payload('basic', price=99), id=other_id)]}
+        resp = self.client.patch(url, payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        new_id = resp.data['details'][0]['id']
+        self.assertNotIn(new_id, (other_id, created['details'][0]['id']))
+        self.assertEqual(OfferDetail.objects.get(pk=new_id).offer_id, created['id'])
+        untouched = OfferDetail.objects.get(pk=other_id)
+        self.assertEqual((untouched.offer_id, untouched.price), (other['id'], 10.0))
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Order
+from .models import Order, OrderStatusCount
 
 # Register your models here.
 
@@ -20,4 +20,11 @@ class OrderAdmin(admin.ModelAdmin):
         'business_user__username',
         'offer_detail__title',
     )
-    readonly_fields = ('created_at', 'updated_at')
\ No newline at end of file
+    readonly_fields = ('created_at', 'updated_at')
+
+@admin.register(OrderStatusCount)
+class OrderStatusCountAdmin(admin.ModelAdmin):
+    list_display = ('business_user', 'status', 'count')
+    list_filter = ('status',)
+    search_fields = ('business_user__username',)
+    readonly_fields = ('business_user', 'status', 'count')
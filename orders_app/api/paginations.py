@@ -0,0 +1,8 @@
+from coderr_core.api.paginations import StandardCursorPagination
+
+class OrderCursorPagination(StandardCursorPagination):
+    """
+    Keyset pagination for order listings, newest orders first by default.
+    """
+    ordering_fields = ('created_at', 'updated_at')
+    default_ordering = '-created_at'
@@ -1,7 +1,10 @@
+from django.db import transaction
 from rest_framework import serializers
+from coderr_core.profiling import TimedSerializerMixin
+from coderr_core.api.values_serializers import ValuesSerializer
 from ..models import Order
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Order objects.
 
@@ -12,7 +15,7 @@ class OrderSerializer(serializers.ModelSerializer):
     business_user = serializers.PrimaryKeyRelatedField(read_only=True)
 
     offer_detail_id = serializers.PrimaryKeyRelatedField(
-        queryset=Order._meta.get_field('offer_detail').remote_field.model.objects.all(),
+        queryset=Order._meta.get_field('offer_detail').remote_field.model.objects.select_related('offer'),
         source='offer_detail',
         write_only=True
     )
@@ -48,20 +51,31 @@ class OrderSerializer(serializers.ModelSerializer):
         Create a new Order instance.
 
         - Automatically assigns the requesting user as the customer_user.
-        - Determines business_user from the offer_detail's related Offer.
+        - Determines business_user from the offer_detail's related Offer
+          (loaded together with the detail, so no extra query is needed).
+        - Inserts the order and bumps the business user's status counter
+          in one transaction.
         """
         user = self.context['request'].user
         detail = validated_data.pop('offer_detail')
         
         validated_data['customer_user'] = user
-        validated_data['business_user'] = detail.offer.user
-        order = Order.objects.create(offer_detail=detail, **validated_data)
+        validated_data['business_user_id'] = detail.offer.user_id
+        with transaction.atomic():
+            order = Order.objects.create(offer_detail=detail, **validated_data)
         return order
 
-class OrderStatusSerializer(serializers.ModelSerializer):
+class OrderStatusSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for updating only the status field of an Order.
     """
     class Meta:
         model = Order
-        fields = ['status']
\ No newline at end of file
+        fields = ['status']
+
+class OrderValuesSerializer(ValuesSerializer):
+    """
+    Fast read-only variant of OrderSerializer for the order list, built
+    from ``.values()`` rows (the offer detail columns are joined in).
+    """
+    serializer_class = OrderSerializer
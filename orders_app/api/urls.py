@@ -3,7 +3,8 @@ from .views import (
     OrderListCreateView,
     OrderRetrieveUpdateDestroyView,
     OrderCountView,
-    CompletedOrderCountView
+    CompletedOrderCountView,
+    OrderStatusCountsView
 )
 
 urlpatterns = [
@@ -11,4 +12,5 @@ urlpatterns = [
     path('orders/<int:pk>/', OrderRetrieveUpdateDestroyView.as_view(), name='order-detail'),
     path('order-count/<int:business_user_id>/', OrderCountView.as_view(), name='order-count'),
     path('completed-order-count/<int:business_user_id>/', CompletedOrderCountView.as_view(), name='completed-order-count'),
+    path('order-counts/', OrderStatusCountsView.as_view(), name='order-counts'),
 ]
\ No newline at end of file
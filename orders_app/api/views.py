@@ -1,38 +1,60 @@
-from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.shortcuts import aget_object_or_404, get_object_or_404
 from django.db.models import Q
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth.models import User
 
-from ..models import Order
-from .serializers import OrderSerializer, OrderStatusSerializer
-from profiles_app.models import Profile
+from ..models import Order, OrderStatusCount
+from .serializers import OrderSerializer, OrderStatusSerializer, OrderValuesSerializer
+from .paginations import OrderCursorPagination
+from coderr_core.api.async_views import AsyncViewMixin
+from coderr_core.api.paginations import PaginationModeMixin, StandardPagination
+from coderr_core.api.streaming import StreamingListMixin
+from coderr_core.api.values_serializers import ValuesListMixin
+from coderr_core.db import write_transaction
 
-class OrderListCreateView(generics.ListCreateAPIView):
+class OrderListCreateView(StreamingListMixin, ValuesListMixin, PaginationModeMixin, generics.ListCreateAPIView):
     """
     GET: List all orders where the current user is either customer or business.
+         Paginated with ?page= / ?page_size=, or ?pagination=cursor.
+         Unpaginated lists longer than one chunk are streamed row by row.
+         Rows are read with .values() and serialized by OrderValuesSerializer.
     POST: Create a new order (only allowed for users with customer profile).
     """
     serializer_class = OrderSerializer
+    values_serializer_class = OrderValuesSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = StandardPagination
+    cursor_pagination_class = OrderCursorPagination
 
     def get_queryset(self):
         """
         Restrict the list to orders involving the current user.
+        The offer detail is joined in, since every row is serialized with it.
         """
         user = self.request.user
         return Order.objects.filter(
             Q(customer_user=user) | Q(business_user=user)
-        )
+        ).select_related('offer_detail')
+
+    @write_transaction
+    def create(self, request, *args, **kwargs):
+        """
+        Create the order in one write transaction, retried if the database is locked.
+        """
+        return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         """
         Ensure only customers can create orders.
         """
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = getattr(self.request.user, 'profile', None)  # attached by CachedTokenAuthentication
+        if profile is None:
+            raise Http404('No Profile matches the given query.')
         if profile.type != 'customer':
             raise PermissionDenied("Only customers may create orders.")
         serializer.save()
@@ -69,9 +91,12 @@ class OrderRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
                 raise PermissionDenied()
         return super().check_object_permissions(request, obj)
 
+    @write_transaction
     def patch(self, request, *args, **kwargs):
         """
         Handle PATCH to change status, then return full serialized order.
+        The status change and the per-business counters are updated in one
+        transaction, retried if the database is locked.
         """
         instance = self.get_object()
         status_serializer = self.get_serializer(
@@ -83,7 +108,35 @@ class OrderRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             instance, context={'request': request}
         )
         return Response(full_serializer.data, status=status.HTTP_200_OK)
-    
+
+
+def get_status_count(business_user_id, order_status):
+    """
+    Read one materialized order counter, returning 404 for unknown users.
+    """
+    count = (OrderStatusCount.objects
+             .filter(business_user_id=business_user_id, status=order_status)
+             .values_list('count', flat=True)
+             .first())
+    if count is None:
+        get_object_or_404(User, pk=business_user_id)
+        count = 0
+    return count
+
+
+async def aget_status_count(business_user_id, order_status):
+    """
+    Async ``get_status_count()``.
+    """
+    count = await (OrderStatusCount.objects
+                   .filter(business_user_id=business_user_id, status=order_status)
+                   .values_list('count', flat=True)
+                   .afirst())
+    if count is None:
+        await aget_object_or_404(User, pk=business_user_id)
+        count = 0
+    return count
+
 class OrderCountView(APIView):
     """
     GET: Return the number of in-progress orders for the given business user.
@@ -91,13 +144,18 @@ class OrderCountView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, business_user_id):
-        biz = get_object_or_404(User, pk=business_user_id)
-        count = Order.objects.filter(
-            business_user=biz,
-            status='in_progress'
-        ).count()
+        count = get_status_count(business_user_id, 'in_progress')
+        return Response({'order_count': count})
+
+class AsyncOrderCountView(AsyncViewMixin, OrderCountView):
+    """
+    OrderCountView for the ASGI mode, using the async ORM.
+    """
+
+    async def get(self, request, business_user_id):
+        count = await aget_status_count(business_user_id, 'in_progress')
         return Response({'order_count': count})
-    
+
 class CompletedOrderCountView(APIView):
     """
     GET: Return the number of completed orders for the given business user.
@@ -105,9 +163,61 @@ class CompletedOrderCountView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, business_user_id):
-        biz = get_object_or_404(User, pk=business_user_id)
-        count = Order.objects.filter(
-            business_user=biz,
-            status='completed'
-        ).count()
-        return Response({'completed_order_count': count})
\ No newline at end of file
+        count = get_status_count(business_user_id, 'completed')
+        return Response({'completed_order_count': count})
+
+class AsyncCompletedOrderCountView(AsyncViewMixin, CompletedOrderCountView):
+    """
+    CompletedOrderCountView for the ASGI mode, using the async ORM.
+    """
+
+    async def get(self, request, business_user_id):
+        count = await aget_status_count(business_user_id, 'completed')
+        return Response({'completed_order_count': count})
+
+class OrderStatusCountsView(APIView):
+    """
+    GET: Return all order status counts for one or many business users.
+
+    Query parameters:
+        business_user_id: One or more user IDs, repeated or comma-separated
+            (at most MAX_USERS).
+
+    Example response for ?business_user_id=3,7:
+        {"3": {"in_progress": 2, "completed": 5, "cancelled": 0},
+         "7": {"in_progress": 0, "completed": 0, "cancelled": 0}}
+    """
+    permission_classes = [IsAuthenticated]
+    MAX_USERS = 100
+
+    def get(self, request):
+        ids = self.get_user_ids(request)
+        counts = OrderStatusCount.counts_for(ids)
+        return Response({str(user_id): counts[user_id] for user_id in ids})
+
+    def get_user_ids(self, request):
+        raw_ids = [
+            part
+            for value in request.query_params.getlist('business_user_id')
+            for part in value.split(',')
+            if part.strip()
+        ]
+        try:
+            ids = list(dict.fromkeys(int(part) for part in raw_ids))
+        except ValueError:
+            raise ValidationError({'business_user_id': 'Expected integer user IDs.'})
+        if not ids:
+            raise ValidationError({'business_user_id': 'At least one user ID is required.'})
+        if len(ids) > self.MAX_USERS:
+            raise ValidationError({'business_user_id': f'At most {self.MAX_USERS} user IDs are allowed.'})
+        return ids
+
+class AsyncOrderStatusCountsView(AsyncViewMixin, OrderStatusCountsView):
+    """
+    OrderStatusCountsView for the ASGI mode, using the async ORM.
+    """
+
+    async def get(self, request):
+        ids = self.get_user_ids(request)
+        counts = await OrderStatusCount.acounts_for(ids)
+        return Response({str(user_id): counts[user_id] for user_id in ids})
\ No newline at end of file
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from orders_app.models import OrderStatusCount
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the per-business order status counters from the orders table.
+    """
+    help = "Rebuild the materialized order counts per business user and status."
+
+    def handle(self, *args, **options):
+        written = OrderStatusCount.reconcile()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} order status counter(s)."))
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import connection, models, router, transaction
+from django.db.models import Count, F
 from django.contrib.auth.models import User
 
 # Create your models here.
@@ -43,8 +44,139 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Order counts per business user and status.
+            models.Index(fields=['business_user', 'status'], name='order_biz_status_idx'),
+            # Order lists of one customer / business, newest first.
+            models.Index(fields=['customer_user', '-created_at'], name='order_cust_created_idx'),
+            models.Index(fields=['business_user', '-created_at'], name='order_biz_created_idx'),
+        ]
+
     def __str__(self):
         """
         Return a human-readable representation of the order.
         """
-        return f"Order #{self.id} - {self.offer_detail.title} ({self.status})"
\ No newline at end of file
+        return f"Order #{self.id} - {self.offer_detail.title} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        """
+        Save in a transaction, so the status counters updated by the
+        signals (which lock the order row first) change together with it.
+        """
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+class OrderStatusCount(models.Model):
+    """
+    Materialized number of orders per business user and status.
+
+    Maintained incrementally by the signals in ``orders_app.signals`` so
+    the order-count endpoints never have to run COUNT(*) over orders.
+
+    Attributes:
+        business_user (ForeignKey): The business user the orders belong to.
+        status (CharField): Order status being counted.
+        count (IntegerField): Number of orders in that status.
+    """
+    business_user = models.ForeignKey(
+        User,
+        related_name='order_status_counts',
+        on_delete=models.CASCADE
+    )
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['business_user', 'status'],
+                name='unique_order_status_count',
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Return a human-readable representation of the counter.
+        """
+        return f"{self.business_user_id} {self.status}: {self.count}"
+
+    @classmethod
+    def increment(cls, business_user_id, status, delta=1):
+        """
+        Add ``delta`` to a counter, creating it if needed, in one atomic upsert.
+        """
+        table = cls._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (business_user_id, status, count) VALUES (%s, %s, %s) "
+                f"ON CONFLICT (business_user_id, status) DO UPDATE SET count = {table}.count + excluded.count",
+                [business_user_id, status, delta],
+            )
+
+    @classmethod
+    def decrement(cls, business_user_id, status, delta=1):
+        """
+        Subtract ``delta`` from an existing counter. Missing counters are left
+        alone so no rows are created for users that are being deleted.
+        """
+        cls.objects.filter(business_user_id=business_user_id, status=status).update(
+            count=F('count') - delta
+        )
+
+    @classmethod
+    def counts_for(cls, business_user_ids):
+        """
+        Return all status counts for the given business users in one query.
+
+        Returns:
+            dict: business user id -> {status: count}, with every status present.
+        """
+        return cls.collect_counts(business_user_ids, cls.counts_queryset(business_user_ids))
+
+    @classmethod
+    async def acounts_for(cls, business_user_ids):
+        """
+        Async ``counts_for()``.
+        """
+        rows = [row async for row in cls.counts_queryset(business_user_ids)]
+        return cls.collect_counts(business_user_ids, rows)
+
+    @classmethod
+    def counts_queryset(cls, business_user_ids):
+        return cls.objects.filter(business_user_id__in=business_user_ids).values_list(
+            'business_user_id', 'status', 'count'
+        )
+
+    @staticmethod
+    def collect_counts(business_user_ids, rows):
+        result = {
+            user_id: {status: 0 for status, _ in Order.STATUS_CHOICES}
+            for user_id in business_user_ids
+        }
+        for user_id, status, count in rows:
+            result[user_id][status] = count
+        return result
+
+    @classmethod
+    def reconcile(cls):
+        """
+        Rebuild all counters from the orders table in one transaction, so
+        readers never see the counters missing.
+
+        Returns:
+            int: Number of counter rows written.
+        """
+        rows = (Order.objects
+                .order_by()
+                .values('business_user_id', 'status')
+                .annotate(n=Count('id')))
+        with transaction.atomic():
+            counters = [
+                cls(business_user_id=row['business_user_id'], status=row['status'], count=row['n'])
+                for row in rows
+            ]
+            cls.objects.all().delete()
+            cls.objects.bulk_create(counters)
+        return len(counters)
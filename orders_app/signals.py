@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from coderr_core.metrics import ORDERS_CREATED
+from .models import Order, OrderStatusCount
+
+
+@receiver(pre_save, sender=Order)
+def remember_previous_status(sender, instance, update_fields=None, **kwargs):
+    """
+    Remember the persisted status of an existing order so a status
+    transition can be moved between counters after saving.
+
+    The row is locked until Order.save() commits, so concurrent status
+    changes of the same order are counted one after the other.
+    """
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and 'status' not in update_fields:
+        # The status is not written; forget one remembered by an earlier save.
+        instance._previous_status = None
+        return
+    instance._previous_status = (Order.objects
+                                 .select_for_update()
+                                 .filter(pk=instance.pk)
+                                 .values_list('status', flat=True)
+                                 .first())
+
+
+@receiver(post_save, sender=Order)
+def count_order_on_save(sender, instance, created, **kwargs):
+    """
+    Count new orders and move orders between counters on status changes.
+    """
+    if created:
+        OrderStatusCount.increment(instance.business_user_id, instance.status)
+        status = instance.status
+        transaction.on_commit(lambda: ORDERS_CREATED.inc(status=status))
+        return
+    previous = getattr(instance, '_previous_status', None)
+    if previous is not None and previous != instance.status:
+        OrderStatusCount.decrement(instance.business_user_id, previous)
+        OrderStatusCount.increment(instance.business_user_id, instance.status)
+    instance._previous_status = instance.status
+
+
+@receiver(post_delete, sender=Order)
+def count_order_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    Uncount deleted orders, unless the business user itself is being
+    deleted and its counters go with it.
+    """
+    if isinstance(origin, User) and origin.pk == instance.business_user_id:
+        return
+    OrderStatusCount.decrement(instance.business_user_id, instance.status)
@@ -1,3 +1,6 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.urls import reverse
 from django.contrib.auth.models import User
 from rest_framework import status
@@ -6,7 +9,7 @@ from rest_framework.authtoken.models import Token
 
 from profiles_app.models import Profile
 from offers_app.models import Offer, OfferDetail
-from orders_app.models import Order
+from orders_app.models import Order, OrderStatusCount
 
 class OrdersAPITests(APITestCase):
     """
@@ -175,4 +178,152 @@ class OrdersAPITests(APITestCase):
         url2 = reverse('completed-order-count', kwargs={'business_user_id': self.biz.id})
         resp2 = self.client.get(url2)
         self.assertEqual(resp2.status_code, status.HTTP_200_OK)
-        self.assertEqual(resp2.data['completed_order_count'], 1)
\ No newline at end of file
+        self.assertEqual(resp2.data['completed_order_count'], 1)
+
+class OrderQueryCountTests(APITestCase):
+    """
+    Query-count regression tests for the order list and create paths.
+    """
+    def setUp(self):
+        """
+        Create a business with one offer detail and a customer with several orders.
+        """
+        self.biz = User.objects.create_user('biz', 'biz@test.de', 'pw123')
+        Profile.objects.create(user=self.biz, type='business')
+        self.cust = User.objects.create_user('cust', 'cust@test.de', 'pw123')
+        Profile.objects.create(user=self.cust, type='customer')
+        self.cust_token = Token.objects.create(user=self.cust)
+
+        offer = Offer.objects.create(user=self.biz, title='Logo Design')
+        self.detail = OfferDetail.objects.create(
+            offer=offer, title='Basic', revisions=3, delivery_time_in_days=5,
+            price=150, features=['Logo Design'], offer_type='basic'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.cust_token.key}')
+
+    def create_orders(self, n):
+        for _ in range(n):
+            Order.objects.create(customer_user=self.cust, business_user=self.biz, offer_detail=self.detail)
+
+    def test_list_query_count_is_constant(self):
+        """
+        One joined SELECT, however many orders there are; the token is
+        served from the authentication cache after the first request.
+        """
+        self.client.get(reverse('order-list'))
+        for n in (1, 5):
+            self.create_orders(n)
+            with self.assertNumQueries(1):
+                resp = self.client.get(reverse('order-list'))
+            self.assertEqual(resp.data[0]['title'], 'Basic')
+
+    def test_create_query_count(self):
+        """
+        Token lookup (joined with user and profile), then the view's write
+        transaction (a savepoint inside the test case): the offer detail
+        with its offer, and the INSERT and the status counter upsert in the
+        serializer's nested savepoint.
+        """
+        with self.assertNumQueries(8):
+            resp = self.client.post(reverse('order-list'), {'offer_detail_id': self.detail.id}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data['business_user'], self.biz.id)
+        self.assertEqual(resp.data['price'], '150.00')
+
+
+class OrderStatusCounterTests(APITestCase):
+    """
+    Tests for the materialized per-business order status counters.
+    """
+    def setUp(self):
+        """
+        Create a business user with one offer detail and a customer.
+        """
+        self.biz = User.objects.create_user('biz', 'biz@test.de', 'pw123')
+        Profile.objects.create(user=self.biz, type='business')
+        self.biz_token = Token.objects.create(user=self.biz)
+        self.cust = User.objects.create_user('cust', 'cust@test.de', 'pw123')
+        Profile.objects.create(user=self.cust, type='customer')
+        self.cust_token = Token.objects.create(user=self.cust)
+        offer = Offer.objects.create(user=self.biz, title='Logo Design')
+        self.detail = OfferDetail.objects.create(
+            offer=offer, title='Basic', revisions=3, delivery_time_in_days=5,
+            price=150, features=[], offer_type='basic'
+        )
+
+    def counts(self):
+        return OrderStatusCount.counts_for([self.biz.id])[self.biz.id]
+
+    def test_counters_follow_create_patch_and_delete(self):
+        """
+        Counters move with order creation, status transitions and deletion.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.cust_token.key}')
+        resp = self.client.post(reverse('order-list'), {'offer_detail_id': self.detail.id}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        order_id = resp.data['id']
+        self.assertEqual(self.counts(), {'in_progress': 1, 'completed': 0, 'cancelled': 0})
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.biz_token.key}')
+        self.client.patch(reverse('order-detail', kwargs={'pk': order_id}), {'status': 'completed'}, format='json')
+        self.assertEqual(self.counts(), {'in_progress': 0, 'completed': 1, 'cancelled': 0})
+
+        Order.objects.get(pk=order_id).delete()
+        self.assertEqual(self.counts(), {'in_progress': 0, 'completed': 0, 'cancelled': 0})
+
+    def test_save_without_status_field_keeps_counters(self):
+        """
+        A save whose update_fields leave out status does not move counters,
+        even after an earlier status change of the same instance.
+        """
+        order = Order.objects.create(customer_user=self.cust, business_user=self.biz, offer_detail=self.detail)
+        order.status = 'completed'
+        order.save()
+        order.status = 'cancelled'
+        order.save(update_fields=['updated_at'])
+        self.assertEqual(self.counts(), {'in_progress': 0, 'completed': 1, 'cancelled': 0})
+        self.assertEqual(Order.objects.get(pk=order.pk).status, 'completed')
+
+    def test_count_views_read_counters(self):
+        """
+        The single-status count endpoints read one counter row.
+        """
+        for order_status in ('in_progress', 'in_progress', 'completed'):
+            Order.objects.create(
+                customer_user=self.cust, business_user=self.biz,
+                offer_detail=self.detail, status=order_status
+            )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.cust_token.key}')
+        with self.assertNumQueries(2):
+            resp = self.client.get(reverse('order-count', kwargs={'business_user_id': self.biz.id}))
+        self.assertEqual(resp.data['order_count'], 2)
+        resp = self.client.get(reverse('completed-order-count', kwargs={'business_user_id': self.biz.id}))
+        self.assertEqual(resp.data['completed_order_count'], 1)
+
+        resp = self.client.get(reverse('order-count', kwargs={'business_user_id': 9999}))
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_combined_counts_endpoint(self):
+        """
+        /api/order-counts/ returns every status for several users in one query.
+        """
+        Order.objects.create(customer_user=self.cust, business_user=self.biz, offer_detail=self.detail)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.cust_token.key}')
+        url = reverse('order-counts')
+        with self.assertNumQueries(2):
+            resp = self.client.get(url, {'business_user_id': f'{self.biz.id},{self.cust.id}'})
+        self.assertEqual(resp.data, {
+            str(self.biz.id): {'in_progress': 1, 'completed': 0, 'cancelled': 0},
+            str(self.cust.id): {'in_progress': 0, 'completed': 0, 'cancelled': 0},
+        })
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'business_user_id': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reconcile_command(self):
+        """
+        reconcile_order_counts rebuilds counters that drifted.
+        """
+        Order.objects.create(customer_user=self.cust, business_user=self.biz, offer_detail=self.detail)
+        OrderStatusCount.objects.update(count=42)
+        call_command('reconcile_order_counts', stdout=StringIO())
+        self.assertEqual(self.counts()['in_progress'], 1)
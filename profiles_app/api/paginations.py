@@ -0,0 +1,8 @@
+from coderr_core.api.paginations import StandardCursorPagination
+
+class ProfileCursorPagination(StandardCursorPagination):
+    """
+    Keyset pagination for business and customer profile listings.
+    """
+    ordering_fields = ('created_at',)
+    default_ordering = 'id'
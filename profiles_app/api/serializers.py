@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from coderr_core.profiling import TimedSerializerMixin
+from coderr_core.api.values_serializers import ValuesSerializer
 from ..models import Profile
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for full Profile details, supporting retrieve and update.
 
@@ -37,7 +39,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         return instance
 
 
-class BusinessProfileListSerializer(serializers.ModelSerializer):
+class BusinessProfileListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for listing business profiles with limited fields.
     """
@@ -51,7 +53,7 @@ class BusinessProfileListSerializer(serializers.ModelSerializer):
         ]
 
 
-class CustomerProfileListSerializer(serializers.ModelSerializer):
+class CustomerProfileListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for listing customer profiles with minimal fields.
     """
@@ -64,3 +66,19 @@ class CustomerProfileListSerializer(serializers.ModelSerializer):
             'file', 'type'
             # 'uploaded_at',
         ]
+
+
+class BusinessProfileListValuesSerializer(ValuesSerializer):
+    """
+    Fast read-only variant of BusinessProfileListSerializer, built from
+    ``.values()`` rows.
+    """
+    serializer_class = BusinessProfileListSerializer
+
+
+class CustomerProfileListValuesSerializer(ValuesSerializer):
+    """
+    Fast read-only variant of CustomerProfileListSerializer, built from
+    ``.values()`` rows.
+    """
+    serializer_class = CustomerProfileListSerializer
@@ -6,9 +6,17 @@ from ..models import Profile
 from .serializers import (
     ProfileSerializer,
     BusinessProfileListSerializer,
-    CustomerProfileListSerializer
+    BusinessProfileListValuesSerializer,
+    CustomerProfileListSerializer,
+    CustomerProfileListValuesSerializer,
     )
 from .permissions import IsOwnerOrReadOnly
+from .paginations import ProfileCursorPagination
+from coderr_core.api.async_views import AsyncListMixin
+from coderr_core.api.paginations import PaginationModeMixin, StandardPagination
+from coderr_core.api.streaming import StreamingListMixin
+from coderr_core.api.values_serializers import ValuesListMixin
+from coderr_core.cache import CachedResponseMixin
 
 class ProfileDetailView(generics.RetrieveUpdateAPIView):
     """
@@ -26,24 +34,54 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
         self.check_object_permissions(self.request, profile)
         return profile
 
-class BusinessProfileListView(generics.ListAPIView):
+class BusinessProfileListView(CachedResponseMixin, StreamingListMixin, ValuesListMixin, PaginationModeMixin, generics.ListAPIView):
     """
     List all business profiles.
+    Paginated with ?page= / ?page_size=, or ?pagination=cursor.
+    Responses are cached until a profile changes; unpaginated lists
+    longer than one chunk are streamed (and not cached) instead.
+    Rows are read with .values() by the values serializer, from a read
+    replica if one is configured.
 
     Permissions:
       - Must be authenticated.
     """
     queryset = Profile.objects.filter(type='business')
     serializer_class = BusinessProfileListSerializer
+    values_serializer_class = BusinessProfileListValuesSerializer
+    read_from_replica = True
     permission_classes = [IsAuthenticated]
+    cache_namespaces = ('profiles',)
+    pagination_class = StandardPagination
+    cursor_pagination_class = ProfileCursorPagination
 
-class CustomerProfileListView(generics.ListAPIView):
+class CustomerProfileListView(CachedResponseMixin, StreamingListMixin, ValuesListMixin, PaginationModeMixin, generics.ListAPIView):
     """
     List all customer profiles.
+    Paginated with ?page= / ?page_size=, or ?pagination=cursor.
+    Responses are cached until a profile changes; unpaginated lists
+    longer than one chunk are streamed (and not cached) instead.
+    Rows are read with .values() by the values serializer, from a read
+    replica if one is configured.
 
     Permissions:
       - Must be authenticated.
     """
     queryset = Profile.objects.filter(type='customer')
     serializer_class = CustomerProfileListSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    values_serializer_class = CustomerProfileListValuesSerializer
+    read_from_replica = True
+    permission_classes = [IsAuthenticated]
+    cache_namespaces = ('profiles',)
+    pagination_class = StandardPagination
+    cursor_pagination_class = ProfileCursorPagination
+
+class AsyncBusinessProfileListView(AsyncListMixin, BusinessProfileListView):
+    """
+    BusinessProfileListView for the ASGI mode, using the async ORM.
+    """
+
+class AsyncCustomerProfileListView(AsyncListMixin, CustomerProfileListView):
+    """
+    CustomerProfileListView for the ASGI mode, using the async ORM.
+    """
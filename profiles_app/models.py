@@ -39,6 +39,12 @@ class Profile(models.Model):
     email = models.EmailField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Business / customer profile lists and the business profile count.
+            models.Index(fields=['type'], name='profile_type_idx'),
+        ]
+
     def __str__(self):
         """
         String representation of the Profile.
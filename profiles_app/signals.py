@@ -0,0 +1,26 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from coderr_core.cache import invalidate
+
+from .models import Profile
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def invalidate_profile_responses(sender, **kwargs):
+    """
+    Drop cached profile lists after any profile change.
+    """
+    invalidate('profiles')
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_responses(sender, update_fields=None, **kwargs):
+    """
+    Profile lists and offer lists embed user names, so user changes drop
+    both. Pure last_login updates are ignored.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate('profiles', 'offers')
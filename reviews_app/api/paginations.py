@@ -0,0 +1,11 @@
+from coderr_core.api.paginations import StandardCursorPagination
+
+class ReviewCursorPagination(StandardCursorPagination):
+    """
+    Keyset pagination for review listings.
+
+    Honours the same ``ordering`` values as the list view and defaults to
+    the most recently updated reviews first.
+    """
+    ordering_fields = ('updated_at', 'rating')
+    default_ordering = '-updated_at'
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from coderr_core.profiling import TimedSerializerMixin
+from coderr_core.api.values_serializers import ValuesSerializer
 from ..models import Review
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Review model.
 
@@ -33,4 +35,11 @@ class ReviewSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['id', 'reviewer', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'reviewer', 'created_at', 'updated_at']
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """
+    Fast read-only variant of ReviewSerializer for the review list,
+    built from ``.values()`` rows.
+    """
+    serializer_class = ReviewSerializer
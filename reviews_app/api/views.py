@@ -1,4 +1,4 @@
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied, ValidationError
@@ -6,19 +6,31 @@ from rest_framework.response import Response
 from django.contrib.auth.models import User
 
 from ..models import Review
-from .serializers import ReviewSerializer
-from profiles_app.models import Profile
+from .serializers import ReviewSerializer, ReviewValuesSerializer
+from .paginations import ReviewCursorPagination
+from coderr_core.api.paginations import PaginationModeMixin, StandardPagination
+from coderr_core.api.streaming import StreamingListMixin
+from coderr_core.api.values_serializers import ValuesListMixin
+from coderr_core.db import write_transaction
 
-class ReviewListCreateView(generics.ListCreateAPIView):
+class ReviewListCreateView(StreamingListMixin, ValuesListMixin, PaginationModeMixin, generics.ListCreateAPIView):
     """
     GET: List all reviews, optionally filtered by business_user_id or reviewer_id,
          and optionally ordered by 'rating' or 'updated_at'.
+         Paginated with ?page= / ?page_size=, or ?pagination=cursor.
+         Unpaginated lists longer than one chunk are streamed row by row.
+         Rows are read with .values() and serialized by ReviewValuesSerializer,
+         from a read replica if one is configured.
     POST: Create a new review. Only users with a customer profile may create reviews,
           and duplicate reviews (same customer reviewing same business) are forbidden.
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
+    read_from_replica = True
     permission_classes = [IsAuthenticated]
+    pagination_class = StandardPagination
+    cursor_pagination_class = ReviewCursorPagination
 
     def get_queryset(self):
         """
@@ -36,6 +48,15 @@ class ReviewListCreateView(generics.ListCreateAPIView):
             qs = qs.order_by(ord)
         return qs
 
+    @write_transaction
+    def create(self, request, *args, **kwargs):
+        """
+        Create the review in one write transaction (so the duplicate check
+        and the insert cannot interleave with another writer), retried if
+        the database is locked.
+        """
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """
         Validate that the requesting user has a 'customer' profile
@@ -43,7 +64,9 @@ class ReviewListCreateView(generics.ListCreateAPIView):
         """
         user = self.request.user
 
-        profile = get_object_or_404(Profile, user=user)
+        profile = getattr(user, 'profile', None)  # attached by CachedTokenAuthentication
+        if profile is None:
+            raise Http404('No Profile matches the given query.')
         if profile.type != 'customer':
             raise PermissionDenied("Only customers are able to create reviews.")
         bu = serializer.validated_data['business_user']
@@ -70,9 +93,11 @@ class ReviewRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             raise PermissionDenied("You do not have permission to perform this action.")
         return super().check_object_permissions(request, obj)
 
+    @write_transaction
     def patch(self, request, *args, **kwargs):
         """
-        Handle partial updates to the review instance.
+        Handle partial updates to the review instance in one write
+        transaction, retried if the database is locked.
         """
         return super().partial_update(request, *args, **kwargs)
 
@@ -36,6 +36,13 @@ class Review(models.Model):
     class Meta:
         unique_together = ('business_user', 'reviewer')
         ordering = ['-updated_at']
+        indexes = [
+            # Review lists filtered by business user or reviewer, newest first.
+            models.Index(fields=['business_user', '-updated_at'], name='review_biz_updated_idx'),
+            models.Index(fields=['reviewer', '-updated_at'], name='review_reviewer_updated_idx'),
+            # Unfiltered review list in default ordering.
+            models.Index(fields=['-updated_at'], name='review_updated_idx'),
+        ]
 
     def __str__(self):
         """
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from coderr_core.cache import invalidate
+
+from .models import Review
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_review_responses(sender, **kwargs):
+    """
+    Drop cached responses derived from reviews (e.g. base-info).
+    """
+    invalidate('reviews')
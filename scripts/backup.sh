@@ -1,7 +1,9 @@
 echo "Database Backup started"
 SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
 BACKUP_NAME="db-backup__`date "+%F__%H:%M"`.db"
-cp $SCRIPT_DIR/../db.db $BACKUP_NAME
+# The database runs in WAL mode, so copy it with the online backup API
+# (a plain cp could miss changes still in db.sqlite3-wal).
+sqlite3 $SCRIPT_DIR/../db.sqlite3 ".backup '$BACKUP_NAME'"
 echo "Uploading file:  $BACKUP_NAME"
 
 echo "
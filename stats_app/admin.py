@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import PlatformStats
+
+# Register your models here.
+
+@admin.register(PlatformStats)
+class PlatformStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'review_count',
+        'rating_sum',
+        'business_profile_count',
+        'offer_count',
+        'updated_at',
+    )
+    readonly_fields = list_display
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class StatsAppConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'stats_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from stats_app.models import PlatformStats
+
+
+class Command(BaseCommand):
+    """
+    Recompute the platform statistics row from the source tables,
+    repairing any drift of the incrementally maintained counters.
+    """
+    help = "Recompute the platform statistics shown by /api/base-info/."
+
+    def handle(self, *args, **options):
+        before = PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_PK).values().first()
+        stats = PlatformStats.reconcile()
+        for name in PlatformStats.COUNTERS:
+            old = before[name] if before else None
+            new = getattr(stats, name)
+            if old != new:
+                self.stdout.write(f"{name}: {old} -> {new}")
+        self.stdout.write(self.style.SUCCESS("Platform stats reconciled."))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.3 on 2025-07-04 08:25
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def create_stats_row(apps, schema_editor):
+    PlatformStats = apps.get_model('stats_app', 'PlatformStats')
+    Offer = apps.get_model('offers_app', 'Offer')
+    Profile = apps.get_model('profiles_app', 'Profile')
+    Review = apps.get_model('reviews_app', 'Review')
+
+    reviews = Review.objects.aggregate(count=Count('id'), total=Sum('rating'))
+    PlatformStats.objects.update_or_create(pk=1, defaults={
+        'review_count': reviews['count'],
+        'rating_sum': reviews['total'] or 0,
+        'business_profile_count': Profile.objects.filter(type='business').count(),
+        'offer_count': Offer.objects.count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('offers_app', '0005_offer_indexes'),
+        ('profiles_app', '0002_profile_indexes'),
+        ('reviews_app', '0002_review_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('business_profile_count', models.IntegerField(default=0)),
+                ('offer_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'platform stats',
+            },
+        ),
+        migrations.RunPython(create_stats_row, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,137 @@
+import asyncio
+
+from django.db import models, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+# Create your models here.
+
+class PlatformStats(models.Model):
+    """
+    Single-row table holding the platform-wide counters shown on the landing page.
+
+    The counters are maintained incrementally by the signals in
+    ``stats_app.signals`` and can be recomputed from scratch with the
+    ``reconcile_platform_stats`` management command.
+
+    Attributes:
+        review_count (IntegerField): Total number of reviews.
+        rating_sum (IntegerField): Sum of all review ratings.
+        business_profile_count (IntegerField): Number of business profiles.
+        offer_count (IntegerField): Total number of offers.
+        updated_at (DateTimeField): Timestamp of the last counter change.
+    """
+    SINGLETON_PK = 1
+    COUNTERS = ('review_count', 'rating_sum', 'business_profile_count', 'offer_count')
+
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    business_profile_count = models.IntegerField(default=0)
+    offer_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'platform stats'
+
+    def __str__(self):
+        """
+        Return a short summary of the counters.
+        """
+        return (f"{self.review_count} reviews, {self.business_profile_count} businesses, "
+                f"{self.offer_count} offers")
+
+    @property
+    def average_rating(self):
+        """
+        Average review rating rounded to one decimal place, 0 without reviews.
+        """
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
+
+    @classmethod
+    def load(cls):
+        """
+        Return the stats row, creating it from the current data if missing.
+        """
+        try:
+            return cls.objects.get(pk=cls.SINGLETON_PK)
+        except cls.DoesNotExist:
+            return cls.reconcile()
+
+    @classmethod
+    async def aload(cls):
+        """
+        Async ``load()``; a missing row is rebuilt from ``acompute()``.
+        """
+        try:
+            return await cls.objects.aget(pk=cls.SINGLETON_PK)
+        except cls.DoesNotExist:
+            stats, _ = await cls.objects.aupdate_or_create(pk=cls.SINGLETON_PK, defaults=await cls.acompute())
+            return stats
+
+    @classmethod
+    def compute(cls):
+        """
+        Compute all counters from the source tables.
+
+        Returns:
+            dict: Counter name -> value.
+        """
+        from offers_app.models import Offer
+        from profiles_app.models import Profile
+        from reviews_app.models import Review
+
+        reviews = Review.objects.aggregate(count=models.Count('id'), total=Sum('rating'))
+        return {
+            'review_count': reviews['count'],
+            'rating_sum': reviews['total'] or 0,
+            'business_profile_count': Profile.objects.filter(type='business').count(),
+            'offer_count': Offer.objects.count(),
+        }
+
+    @classmethod
+    async def acompute(cls):
+        """
+        Async ``compute()``, awaiting the aggregate queries concurrently.
+        """
+        from offers_app.models import Offer
+        from profiles_app.models import Profile
+        from reviews_app.models import Review
+
+        reviews, business_profile_count, offer_count = await asyncio.gather(
+            Review.objects.aaggregate(count=models.Count('id'), total=Sum('rating')),
+            Profile.objects.filter(type='business').acount(),
+            Offer.objects.acount(),
+        )
+        return {
+            'review_count': reviews['count'],
+            'rating_sum': reviews['total'] or 0,
+            'business_profile_count': business_profile_count,
+            'offer_count': offer_count,
+        }
+
+    @classmethod
+    def reconcile(cls):
+        """
+        Overwrite the stats row with freshly computed counters.
+        """
+        stats, _ = cls.objects.update_or_create(pk=cls.SINGLETON_PK, defaults=cls.compute())
+        return stats
+
+    @classmethod
+    def adjust(cls, **deltas):
+        """
+        Atomically add the given deltas to the counters, e.g.
+        ``PlatformStats.adjust(review_count=1, rating_sum=4)``.
+
+        If the row does not exist yet it is created by reconciling, which
+        already includes the change being recorded.
+        """
+        changes = {name: F(name) + delta for name, delta in deltas.items() if delta}
+        if not changes:
+            return
+        changes['updated_at'] = timezone.now()
+        with transaction.atomic():
+            if not cls.objects.filter(pk=cls.SINGLETON_PK).update(**changes):
+                cls.reconcile()
@@ -0,0 +1,83 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from offers_app.models import Offer
+from profiles_app.models import Profile
+from reviews_app.models import Review
+from .models import PlatformStats
+
+
+def remember_previous(sender, instance, field):
+    """
+    Store the currently persisted value of ``field`` on the instance so the
+    post_save handler can compute a delta. Costs one query for updates only.
+    """
+    previous = None
+    if instance.pk is not None and not instance._state.adding:
+        previous = (sender.objects
+                    .filter(pk=instance.pk)
+                    .values_list(field, flat=True)
+                    .first())
+    setattr(instance, f'_stats_previous_{field}', previous)
+
+
+@receiver(pre_save, sender=Review)
+def review_pre_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'rating' in update_fields:
+        remember_previous(sender, instance, 'rating')
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """
+    Count new reviews and track rating changes in the rating sum.
+    """
+    if created:
+        PlatformStats.adjust(review_count=1, rating_sum=instance.rating)
+        return
+    previous = getattr(instance, '_stats_previous_rating', None)
+    if previous is not None:
+        PlatformStats.adjust(rating_sum=instance.rating - previous)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    PlatformStats.adjust(review_count=-1, rating_sum=-instance.rating)
+
+
+@receiver(pre_save, sender=Profile)
+def profile_pre_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'type' in update_fields:
+        remember_previous(sender, instance, 'type')
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, created, **kwargs):
+    """
+    Count new business profiles and profiles switching to or from business.
+    """
+    if created:
+        previous = None
+    elif hasattr(instance, '_stats_previous_type'):
+        previous = instance._stats_previous_type
+    else:
+        return
+    delta = (instance.type == 'business') - (previous == 'business')
+    PlatformStats.adjust(business_profile_count=delta)
+
+
+@receiver(post_delete, sender=Profile)
+def profile_deleted(sender, instance, **kwargs):
+    if instance.type == 'business':
+        PlatformStats.adjust(business_profile_count=-1)
+
+
+@receiver(post_save, sender=Offer)
+def offer_saved(sender, instance, created, **kwargs):
+    if created:
+        PlatformStats.adjust(offer_count=1)
+
+
+@receiver(post_delete, sender=Offer)
+def offer_deleted(sender, instance, **kwargs):
+    PlatformStats.adjust(offer_count=-1)
@@ -0,0 +1,87 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer
+from profiles_app.models import Profile
+from reviews_app.models import Review
+from stats_app.models import PlatformStats
+
+
+class PlatformStatsTests(APITestCase):
+    """
+    Tests for the incrementally maintained platform statistics.
+    """
+    def setUp(self):
+        """
+        Create a business and a customer, one offer and one review.
+        """
+        self.biz = User.objects.create_user('biz', 'biz@test.de', 'pw123456')
+        self.biz_profile = Profile.objects.create(user=self.biz, type='business')
+        self.cust = User.objects.create_user('cust', 'cust@test.de', 'pw123456')
+        self.cust_profile = Profile.objects.create(user=self.cust, type='customer')
+        self.offer = Offer.objects.create(user=self.biz, title='Logo')
+        self.review = Review.objects.create(
+            business_user=self.biz, reviewer=self.cust, rating=4, description='Good'
+        )
+
+    def assertCounters(self, **expected):
+        stats = PlatformStats.objects.get(pk=PlatformStats.SINGLETON_PK)
+        self.assertEqual({name: getattr(stats, name) for name in expected}, expected)
+        self.assertEqual(PlatformStats.compute(), {name: getattr(stats, name) for name in PlatformStats.COUNTERS})
+
+    def test_counters_follow_creates(self):
+        self.assertCounters(review_count=1, rating_sum=4, business_profile_count=1, offer_count=1)
+
+    def test_review_rating_change_and_delete(self):
+        self.review.rating = 2
+        self.review.save()
+        self.assertCounters(review_count=1, rating_sum=2)
+
+        self.review.delete()
+        self.assertCounters(review_count=0, rating_sum=0)
+
+    def test_profile_type_change(self):
+        self.cust_profile.type = 'business'
+        self.cust_profile.save()
+        self.assertCounters(business_profile_count=2)
+
+        self.biz_profile.type = 'customer'
+        self.biz_profile.save()
+        self.assertCounters(business_profile_count=1)
+
+    def test_cascading_user_delete(self):
+        self.biz.delete()
+        self.assertCounters(review_count=0, rating_sum=0, business_profile_count=0, offer_count=0)
+
+    def test_reconcile_command_fixes_drift(self):
+        PlatformStats.objects.update(review_count=99, offer_count=-3)
+        out = StringIO()
+        call_command('reconcile_platform_stats', stdout=out)
+        self.assertIn('review_count: 99 -> 1', out.getvalue())
+        self.assertCounters(review_count=1, offer_count=1)
+
+    def test_base_info_single_query_and_caching_headers(self):
+        """
+        /api/base-info/ is one primary-key read with ETag and Cache-Control headers,
+        and answers 304 when the ETag still matches.
+        """
+        url = reverse('base-info')
+        with self.assertNumQueries(1):
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()['average_rating'], 4.0)
+        self.assertIn('public', resp['Cache-Control'])
+        self.assertIn('max-age=', resp['Cache-Control'])
+
+        resp2 = self.client.get(url, HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(resp2.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Offer.objects.create(user=self.biz, title='Another')
+        resp3 = self.client.get(url, HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(resp3.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp3.json()['offer_count'], 2)
@@ -2,9 +2,10 @@ from django.contrib.auth.models import User
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
+from coderr_core.profiling import TimedSerializerMixin
 from profiles_app.models import Profile
 
-class RegistrationSerializer(serializers.ModelSerializer):
+class RegistrationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for registering a new user.
     Ensures unique username and email, matches passwords, and creates a Profile.
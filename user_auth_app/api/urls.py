@@ -1,8 +1,9 @@
 from django.urls import path
 
-from .views import RegistrationView, CustomLoginView
+from .views import RegistrationView, CustomLoginView, LogoutView
 
 urlpatterns = [
     path('registration/', RegistrationView.as_view(), name='registration'),
     path('login/', CustomLoginView.as_view(), name='login'),
+    path('logout/', LogoutView.as_view(), name='logout'),
 ]
\ No newline at end of file
@@ -1,10 +1,11 @@
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.response import Response
 from rest_framework import status
 
+from coderr_core.metrics import LOGIN_FAILURES
 from .serializers import RegistrationSerializer, LoginSerializer
 
 class RegistrationView(APIView):
@@ -54,4 +55,19 @@ class CustomLoginView(ObtainAuthToken):
             }
             return Response(data, status=status.HTTP_200_OK)
         
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        # Field errors mean a malformed request, non-field errors wrong credentials.
+        reason = 'invalid_credentials' if set(serializer.errors) == {'non_field_errors'} else 'invalid_request'
+        LOGIN_FAILURES.inc(reason=reason)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class LogoutView(APIView):
+    """
+    API endpoint for user logout.
+    Deletes the token used for the request, which also drops it from the
+    authentication cache. Returns 204 No Content.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        Token.objects.filter(key=request.auth.key).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,197 @@
+"""
+Token authentication backed by an in-process cache.
+
+DRF's TokenAuthentication loads the token and its user on every request,
+and most views then load the user's profile as well. CachedTokenAuthentication
+keeps the user's columns and profile type per token key in a small TTL/LRU
+cache, so a warm request is authenticated without touching the database.
+
+The cache lives in process memory. Writes that revoke or change tokens
+(logout, token rotation, password or user changes, profile changes) store
+the time of the change per user in the shared API cache
+(``user_auth_app.signals``), and a cache hit is only trusted if its entry
+was loaded after that time, so every worker process stops accepting a
+revoked token right away. With several workers but a per-process API
+cache, these marks would not reach the other workers, so tokens are then
+not cached at all. Entries expire after ``TOKEN_AUTH_CACHE['TTL']``
+seconds in any case.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from coderr_core.cache import get_cache, reaches_all_workers
+from profiles_app.models import Profile
+
+USER_FIELDS = [field.attname for field in User._meta.concrete_fields]
+PROFILE_FIELDS = ['id', 'user_id', 'type']
+
+
+def get_token_cache_setting(name):
+    defaults = {'TTL': 60, 'MAX_SIZE': 10000}
+    return getattr(settings, 'TOKEN_AUTH_CACHE', {}).get(name, defaults[name])
+
+
+def _revoked_key(user_id):
+    return f'token-auth:revoked:{user_id}'
+
+
+def revoke_cached_tokens(user_id):
+    """
+    Make every process reload the user's tokens, and drop them from this
+    process right away.
+
+    The time is stored immediately and again once the surrounding
+    transaction commits, so an entry loaded from not yet committed data
+    cannot outlive the commit. Entries older than the mark expire within
+    the TTL, and so does the mark.
+    """
+    def mark():
+        get_cache().set(_revoked_key(user_id), time.time(), get_token_cache_setting('TTL') + 1)
+        token_cache.discard_user(user_id)
+
+    mark()
+    transaction.on_commit(mark)
+
+
+def is_revoked(user_id, loaded_at):
+    revoked_at = get_cache().get(_revoked_key(user_id))
+    return revoked_at is not None and revoked_at >= loaded_at
+
+
+class TokenCache:
+    """
+    Thread-safe TTL/LRU mapping of token key -> (user values, profile
+    values, wall-clock time from before they were loaded).
+
+    Attributes:
+        entries (OrderedDict): Token key -> (expires_at, user_values,
+            profile_values, loaded_at), least recently used first.
+        keys_by_user (dict): User id -> set of cached token keys, used to
+            drop every token of a user at once.
+    """
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.keys_by_user = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._discard(key)
+                return None
+            self.entries.move_to_end(key)
+            return entry[1:]
+
+    def set(self, key, user_values, profile_values, loaded_at):
+        ttl = get_token_cache_setting('TTL')
+        if ttl <= 0:
+            return
+        user_id = user_values[USER_FIELDS.index('id')]
+        with self.lock:
+            self._discard(key)
+            self.entries[key] = (time.monotonic() + ttl, user_values, profile_values, loaded_at)
+            self.keys_by_user.setdefault(user_id, set()).add(key)
+            max_size = get_token_cache_setting('MAX_SIZE')
+            while len(self.entries) > max_size:
+                self._discard(next(iter(self.entries)))
+
+    def discard(self, key):
+        with self.lock:
+            self._discard(key)
+
+    def discard_user(self, user_id):
+        with self.lock:
+            for key in list(self.keys_by_user.get(user_id, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.keys_by_user.clear()
+
+    def _discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1][USER_FIELDS.index('id')]
+        keys = self.keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_user[user_id]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+token_cache = TokenCache()
+
+
+def build_user(user_values, profile_values):
+    """
+    Rebuild a fresh User (and a partial Profile holding only id, user and
+    type) from cached values. Every request gets its own instances, and
+    other profile fields are loaded lazily if a view accesses them.
+    """
+    user = User.from_db(None, USER_FIELDS, list(user_values))
+    profile = None
+    if profile_values is not None:
+        profile = Profile.from_db(None, PROFILE_FIELDS, list(profile_values))
+        Profile.user.field.set_cached_value(profile, user)
+    User.profile.related.set_cached_value(user, profile)
+    return user
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication using ``token_cache``.
+
+    The authenticated user comes with ``user.profile`` already attached
+    (id, user and type), so profile-type checks cost no extra query.
+    Falls back to a single joined query for unknown, expired or revoked
+    keys.
+    """
+
+    def authenticate_credentials(self, key):
+        use_cache = reaches_all_workers()
+        cached = token_cache.get(key) if use_cache else None
+        if cached is not None and is_revoked(cached[0][USER_FIELDS.index('id')], cached[2]):
+            token_cache.discard(key)
+            cached = None
+        if cached is None:
+            model = self.get_model()
+            # Taken before the query: a revocation committed after the
+            # query still marks this entry as outdated.
+            loaded_at = time.time()
+            try:
+                # Always the primary: a token created moments ago may not
+                # have reached a read replica yet.
+                token = model.objects.using(DEFAULT_DB_ALIAS).select_related('user__profile').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed('Invalid token.')
+
+            user = token.user
+            profile = getattr(user, 'profile', None)
+            cached = (
+                tuple(getattr(user, name) for name in USER_FIELDS),
+                tuple(getattr(profile, name) for name in PROFILE_FIELDS) if profile else None,
+            )
+            if use_cache:
+                token_cache.set(key, *cached, loaded_at)
+
+        user = build_user(*cached[:2])
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        token = self.get_model().from_db(None, ['key', 'user_id'], [key, user.pk])
+        token.user = user
+        return (user, token)
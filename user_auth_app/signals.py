@@ -0,0 +1,35 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from profiles_app.models import Profile
+from .authentication import revoke_cached_tokens
+
+
+@receiver([post_save, post_delete], sender=Token)
+def drop_cached_token(sender, instance, **kwargs):
+    """
+    Forget a token on logout (delete) and rotation (delete + create), in
+    every worker process.
+    """
+    revoke_cached_tokens(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=User)
+def drop_cached_user_tokens(sender, instance, update_fields=None, **kwargs):
+    """
+    Forget all tokens of a user after password changes, deactivation or
+    any other change to the user row. Pure last_login updates are ignored.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    revoke_cached_tokens(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def drop_cached_profile_tokens(sender, instance, **kwargs):
+    """
+    Forget all tokens of a user whose profile (e.g. its type) changed.
+    """
+    revoke_cached_tokens(instance.user_id)
@@ -0,0 +1,141 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from profiles_app.models import Profile
+from user_auth_app.authentication import token_cache
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """
+    Test cases for the cached token authentication and its invalidation.
+    """
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user('cust', 'cust@example.com', 'strongpass123')
+        self.profile = Profile.objects.create(user=self.user, type='customer')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('order-list')
+
+    def count_queries(self, method='get', url=None, data=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url or self.url, data, format='json')
+        return response, len(ctx.captured_queries)
+
+    def test_warm_request_skips_token_query(self):
+        """
+        The first request loads token, user and profile in one query;
+        later requests are authenticated from the cache.
+        """
+        cold, cold_queries = self.count_queries()
+        warm, warm_queries = self.count_queries()
+        self.assertEqual(cold.status_code, status.HTTP_200_OK)
+        self.assertEqual(warm.status_code, status.HTTP_200_OK)
+        self.assertEqual(warm_queries, cold_queries - 1)
+
+    def test_profile_type_check_uses_cached_profile(self):
+        """
+        Profile-type permission checks do not query the profile table.
+        """
+        self.count_queries()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('offer-list-create'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_invalidates_token(self):
+        """
+        POST /api/logout/ deletes the token; it is rejected right away.
+        """
+        self.count_queries()
+        response = self.client.post(reverse('logout'))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_rotation_invalidates_old_key(self):
+        self.count_queries()
+        self.token.delete()
+        Token.objects.create(user=self.user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_reaches_other_processes(self):
+        """
+        A worker that did not handle the logout still holds the entry, but
+        rejects it because of the revocation mark in the shared cache.
+        """
+        self.count_queries()
+        with patch.object(token_cache, 'discard_user'):
+            self.token.delete()
+        self.assertEqual(len(token_cache), 1)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(len(token_cache), 0)
+
+    @override_settings(WEB_CONCURRENCY=4)
+    def test_not_cached_without_shared_cache(self):
+        """
+        Several workers with the per-process cache would miss revocations.
+        """
+        _, first = self.count_queries()
+        _, second = self.count_queries()
+        self.assertEqual(first, second)
+        self.assertEqual(len(token_cache), 0)
+
+    def test_password_change_and_deactivation_drop_entries(self):
+        self.count_queries()
+        self.user.set_password('anotherpass456')
+        self.user.save()
+        self.assertEqual(len(token_cache), 0)
+
+        self.count_queries()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_type_change_is_picked_up(self):
+        """
+        After switching to a business profile, creating offers is allowed
+        on the next request (no stale cached type).
+        """
+        self.count_queries()
+        self.profile.type = 'business'
+        self.profile.save()
+        payload = {
+            'title': 'Logo',
+            'description': 'Design',
+            'details': [
+                {'title': t, 'revisions': 1, 'delivery_time_in_days': 3, 'price': 10,
+                 'features': ['x'], 'offer_type': t}
+                for t in ('basic', 'standard', 'premium')
+            ],
+        }
+        response = self.client.post(reverse('offer-list-create'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(TOKEN_AUTH_CACHE={'TTL': 0})
+    def test_zero_ttl_disables_cache(self):
+        _, first = self.count_queries()
+        _, second = self.count_queries()
+        self.assertEqual(first, second)
+        self.assertEqual(len(token_cache), 0)
+
+    @override_settings(TOKEN_AUTH_CACHE={'TTL': 60, 'MAX_SIZE': 1})
+    def test_lru_bound(self):
+        other = User.objects.create_user('other', 'other@example.com', 'strongpass123')
+        other_token = Token.objects.create(user=other)
+        self.count_queries()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + other_token.key)
+        self.count_queries()
+        self.assertEqual(len(token_cache), 1)
+        self.assertIsNotNone(token_cache.get(other_token.key))